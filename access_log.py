@@ -0,0 +1,402 @@
+"""Derive traffic inputs for the estimator from web server access logs.
+
+Reads nginx/Apache combined (or common) format logs, plain or gzip-compressed,
+in one streaming pass and reports what the "Beban Aplikasi" section needs:
+unique users per hour, the distribution of session lengths, the measured
+peak concurrency and, from those, ``users_per_hour`` and ``session_seconds``.
+
+Only two fields are read from each line: the client and the timestamp. They
+are found by byte offsets (the first space, the ``[...]`` block and the last
+quoted field) instead of a regular expression, and the timestamp is parsed
+once per minute (``_minute_epoch`` is cached) and once per second by the
+loop itself, since consecutive lines nearly always share it.
+
+A client is the IP plus the user agent (``--client ip`` uses the IP alone).
+A session ends after ``idle_timeout`` seconds without a request. Memory is
+bounded by the traffic of the last idle window, not by the size of the log:
+
+* sessions idle for longer than the timeout are closed in periodic sweeps;
+* unique clients are kept as hashes for the current and previous hour only,
+  older hours are reduced to a count;
+* concurrency is tracked as +1/-1 per minute and folded into a running peak
+  once no open session can still change those minutes.
+
+Session lengths are kept as a count per whole second, so percentiles are
+exact. A line that arrives after its hour was reduced to a count (more than
+an hour out of order) still extends its session but is not counted as a
+unique user of that hour.
+
+Usage::
+
+    python access_log.py /var/log/nginx/access.log.2.gz /var/log/nginx/access.log.1 access.log
+"""
+import argparse
+import io
+import json
+import os
+import sys
+from calendar import timegm
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+
+from pricing import get_concurrent_users, recommend_from_concurrency
+
+DEFAULT_IDLE_TIMEOUT = 30 * 60
+CLIENT_KEYS = ("ip+ua", "ip")
+READ_BUFFER = 1 << 20
+GZIP_MAGIC = b"\x1f\x8b"
+SECONDS_PER_HOUR = 3600
+SESSION_PERCENTILES = (50, 90, 95, 99)
+# Upper bounds (seconds) of the session-length histogram; the last bucket is open.
+SESSION_BUCKETS = (0, 10, 30, 60, 300, 900, 1800, 3600)
+_MONTHS = {
+    name: number
+    for number, name in enumerate(
+        (b"Jan", b"Feb", b"Mar", b"Apr", b"May", b"Jun", b"Jul", b"Aug", b"Sep", b"Oct", b"Nov", b"Dec"), 1
+    )
+}
+# "[10/Oct/2000:13:55:36 -0700]": the timestamp is 26 bytes between the brackets.
+_STAMP_LENGTH = 26
+
+
+@lru_cache(maxsize=4096)
+def _minute_epoch(minute: bytes) -> int:
+    """Unix time of ``b"10/Oct/2000:13:55 -0700"`` (a timestamp without its seconds)."""
+    offset = int(minute[19:21]) * 3600 + int(minute[21:23]) * 60
+    if minute[18:19] == b"-":
+        offset = -offset
+    local = timegm((int(minute[7:11]), _MONTHS[minute[3:6]], int(minute[0:2]), int(minute[12:14]), int(minute[15:17]), 0))
+    return local - offset
+
+
+def _utc_offset(stamp: bytes) -> int:
+    offset = int(stamp[22:24]) * 3600 + int(stamp[24:26]) * 60
+    return -offset if stamp[21:22] == b"-" else offset
+
+
+def open_log(source):
+    """A buffered binary stream over ``source``, decompressed when it starts with the gzip magic.
+
+    ``source`` is a path, ``-`` for stdin, or a binary file object (an
+    upload); file objects are read from their current position and never
+    closed here.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        raw = sys.stdin.buffer if source == "-" else open(source, "rb", buffering=READ_BUFFER)
+    else:
+        raw = source
+    if hasattr(raw, "peek"):
+        magic = raw.peek(2)[:2]
+    else:
+        magic = raw.read(2)
+        raw.seek(-len(magic), io.SEEK_CUR)
+    if magic == GZIP_MAGIC:
+        import gzip
+
+        return io.BufferedReader(gzip.GzipFile(fileobj=raw, mode="rb"), READ_BUFFER)
+    return raw
+
+
+def _percentile(counts: Counter, total: int, percent: int) -> int:
+    """Nearest-rank percentile of values given as ``{value: count}``."""
+    rank = -(-percent * total // 100)
+    seen = 0
+    for value in sorted(counts):
+        seen += counts[value]
+        if seen >= rank:
+            return value
+    return 0
+
+
+class Sessionizer:
+    """Streaming sessionization of access-log lines; feed one or more logs, then ``summary()``."""
+
+    def __init__(self, idle_timeout: int = DEFAULT_IDLE_TIMEOUT, client_key: str = "ip+ua"):
+        if idle_timeout < 1:
+            raise ValueError("Batas idle sesi minimal 1 detik.")
+        if client_key not in CLIENT_KEYS:
+            raise ValueError(f"Kunci klien harus salah satu dari {', '.join(CLIENT_KEYS)}.")
+        self.idle_timeout = int(idle_timeout)
+        self.by_agent = client_key == "ip+ua"
+        self.lines = 0
+        self.skipped = 0
+        self.sessions = 0
+        self.first_seen = None
+        self.last_seen = None
+        self.utc_offset = None
+        self.session_lengths = Counter()
+        self.hourly_users: dict[int, int] = {}
+        self.peak_concurrency = 0
+        self.peak_minute = None
+        self._open: dict[int, list[int]] = {}  # client hash -> [session start, last request]
+        self._hour_clients: dict[int, set[int]] = {}
+        self._current_hour = None
+        self._minute_deltas: Counter = Counter()
+        self._folded_minute = None  # minutes before this one are final
+        self._active = 0
+        self._next_sweep = None
+
+    # ----------------------------
+    # Ingestion
+    # ----------------------------
+    def feed(self, stream):
+        """Consume every line of a binary ``stream`` (see ``open_log``)."""
+        idle = self.idle_timeout
+        by_agent = self.by_agent
+        sessions = self._open
+        close = self._close
+        hour_clients = self._hour_clients
+        current_hour = self._current_hour
+        current_clients = hour_clients.get(current_hour)
+        next_sweep = self._next_sweep
+        minute_epoch = _minute_epoch
+        stamp_length = _STAMP_LENGTH
+        last_stamp = None
+        epoch = 0
+        lines = skipped = 0
+        first = self.first_seen
+        last = self.last_seen
+
+        for line in stream:
+            lines += 1
+            space = line.find(b" ")
+            bracket = line.find(b"[", space)
+            if space <= 0 or bracket < 0 or line[bracket + stamp_length + 1:bracket + stamp_length + 2] != b"]":
+                skipped += 1
+                continue
+            stamp = line[bracket + 1:bracket + stamp_length + 1]
+            if stamp != last_stamp:
+                try:
+                    epoch = minute_epoch(stamp[:17] + stamp[20:]) + int(stamp[18:20])
+                except (KeyError, ValueError):
+                    skipped += 1
+                    continue
+                last_stamp = stamp
+                if first is None:
+                    first = last = epoch
+                    self.utc_offset = _utc_offset(stamp)
+                    next_sweep = epoch + idle
+                elif epoch > last:
+                    last = epoch
+                elif epoch < first:
+                    first = epoch
+
+            if by_agent:
+                end = line.rfind(b'"')
+                start = line.rfind(b'"', 0, end)
+                # Combined format: '"referer" "agent"'; anything else is keyed by IP alone.
+                if line[start - 2:start] == b'" ':
+                    client = hash((line[:space], line[start + 1:end]))
+                else:
+                    client = hash(line[:space])
+            else:
+                client = hash(line[:space])
+
+            hour = epoch // SECONDS_PER_HOUR
+            if hour == current_hour:
+                current_clients.add(client)
+            elif current_hour is None or hour > current_hour:
+                self._roll_hours(hour)
+                current_hour = hour
+                current_clients = hour_clients[hour]
+                current_clients.add(client)
+            elif hour not in self.hourly_users:
+                hour_clients.setdefault(hour, set()).add(client)
+
+            state = sessions.get(client)
+            if state is None:
+                sessions[client] = [epoch, epoch]
+            elif epoch - state[1] > idle:
+                close(state)
+                state[0] = state[1] = epoch
+            elif epoch > state[1]:
+                state[1] = epoch
+
+            if epoch >= next_sweep:
+                self._sweep(epoch)
+                next_sweep = epoch + idle
+
+        self.lines += lines
+        self.skipped += skipped
+        self.first_seen = first
+        self.last_seen = last
+        self._current_hour = current_hour
+        self._next_sweep = next_sweep
+
+    def _close(self, state: list[int]):
+        start, end = state
+        self.sessions += 1
+        self.session_lengths[end - start] += 1
+        start_minute = start // 60
+        end_minute = end // 60 + 1
+        folded = self._folded_minute
+        if folded is not None:
+            # An out-of-order line opened this session inside minutes already folded.
+            start_minute = max(start_minute, folded)
+            end_minute = max(end_minute, folded)
+        self._minute_deltas[start_minute] += 1
+        self._minute_deltas[end_minute] -= 1
+
+    def _roll_hours(self, hour: int):
+        """Open ``hour`` and reduce every hour before the previous one to its count."""
+        for old in [old for old in self._hour_clients if old < hour - 1]:
+            self.hourly_users[old] = len(self._hour_clients.pop(old))
+        self._hour_clients[hour] = set()
+
+    def _sweep(self, now: int):
+        """Close sessions idle for longer than the timeout and fold the minutes they can no longer change."""
+        cutoff = now - self.idle_timeout
+        sessions = self._open
+        expired = [client for client, state in sessions.items() if state[1] < cutoff]
+        for client in expired:
+            self._close(sessions.pop(client))
+        open_start = min((state[0] for state in sessions.values()), default=now)
+        self._fold(min(open_start, now) // 60)
+
+    def _fold(self, before_minute: int | None):
+        """Add the +1/-1 of every minute before ``before_minute`` (all when None) to the running peak."""
+        deltas = self._minute_deltas
+        minutes = sorted(deltas if before_minute is None else (m for m in deltas if m < before_minute))
+        active = self._active
+        for minute in minutes:
+            active += deltas.pop(minute)
+            if active > self.peak_concurrency:
+                self.peak_concurrency = active
+                self.peak_minute = minute
+        self._active = active
+        if before_minute is not None:
+            self._folded_minute = max(before_minute, self._folded_minute or before_minute)
+
+    def finish(self):
+        """Close every open session and hour; call once after the last ``feed``."""
+        for state in self._open.values():
+            self._close(state)
+        self._open.clear()
+        for hour, clients in self._hour_clients.items():
+            self.hourly_users[hour] = len(clients)
+        self._hour_clients.clear()
+        self._current_hour = None
+        self._fold(None)
+
+    # ----------------------------
+    # Results
+    # ----------------------------
+    def _timestamp(self, epoch: int) -> str:
+        return datetime.fromtimestamp(epoch, timezone(timedelta(seconds=self.utc_offset))).isoformat()
+
+    def hourly_profile(self) -> list[int]:
+        """Mean unique users for each hour of the day (log local time) over the whole span."""
+        if self.first_seen is None:
+            return [0] * 24
+        totals = [0] * 24
+        hours = [0] * 24
+        for hour in range(self.first_seen // SECONDS_PER_HOUR, self.last_seen // SECONDS_PER_HOUR + 1):
+            local = (hour * SECONDS_PER_HOUR + self.utc_offset) // SECONDS_PER_HOUR % 24
+            totals[local] += self.hourly_users.get(hour, 0)
+            hours[local] += 1
+        return [round(total / count) if count else 0 for total, count in zip(totals, hours)]
+
+    def session_histogram(self) -> list[dict]:
+        labels = []
+        low = 0
+        for high in SESSION_BUCKETS:
+            labels.append((high, f"{low}-{high} dtk" if low != high else f"{high} dtk"))
+            low = high + 1
+        counts = [0] * (len(SESSION_BUCKETS) + 1)
+        for length, count in self.session_lengths.items():
+            index = next((i for i, (high, _) in enumerate(labels) if length <= high), len(labels))
+            counts[index] += count
+        names = [label for _, label in labels] + [f"> {SESSION_BUCKETS[-1]} dtk"]
+        return [{"Durasi sesi": name, "Sesi": count} for name, count in zip(names, counts)]
+
+    def summary(self) -> dict:
+        """Everything measured, plus the estimator inputs and the recommendation they give.
+
+        ``users_per_hour`` is the busiest hour's unique users and
+        ``session_seconds`` the mean session length (at least one second), so
+        ``estimated_concurrency`` is what the page computes from them.
+        ``recommendation`` is sized for the measured ``peak_concurrency``.
+        """
+        sessions = self.sessions
+        lengths = self.session_lengths
+        mean_session = sum(length * count for length, count in lengths.items()) / sessions if sessions else 0.0
+        hourly = sorted(self.hourly_users.items())
+        peak_hour, peak_hour_users = max(hourly, key=lambda item: item[1], default=(None, 0))
+        users_per_hour = peak_hour_users
+        session_seconds = max(1, round(mean_session))
+        return {
+            "lines": self.lines,
+            "skipped": self.skipped,
+            "first_seen": self._timestamp(self.first_seen) if self.first_seen is not None else None,
+            "last_seen": self._timestamp(self.last_seen) if self.last_seen is not None else None,
+            "idle_timeout": self.idle_timeout,
+            "sessions": sessions,
+            "session_mean_seconds": round(mean_session, 1),
+            "session_percentiles": {
+                f"p{percent}": _percentile(lengths, sessions, percent) for percent in SESSION_PERCENTILES
+            },
+            "session_max_seconds": max(lengths, default=0),
+            "session_histogram": self.session_histogram(),
+            "hourly_unique_users": [
+                {"hour": self._timestamp(hour * SECONDS_PER_HOUR), "users": users} for hour, users in hourly
+            ],
+            "peak_hour": self._timestamp(peak_hour * SECONDS_PER_HOUR) if peak_hour is not None else None,
+            "peak_hour_users": peak_hour_users,
+            "hourly_profile": self.hourly_profile(),
+            "peak_concurrency": self.peak_concurrency,
+            "peak_concurrency_at": self._timestamp(self.peak_minute * 60) if self.peak_minute is not None else None,
+            "users_per_hour": users_per_hour,
+            "session_seconds": session_seconds,
+            "estimated_concurrency": get_concurrent_users(users_per_hour, session_seconds),
+            "recommendation": recommend_from_concurrency(self.peak_concurrency),
+        }
+
+
+def summarize_access_logs(sources, idle_timeout: int = DEFAULT_IDLE_TIMEOUT, client_key: str = "ip+ua") -> dict:
+    """``Sessionizer.summary`` of one or more logs read in order (e.g. rotated files, oldest first)."""
+    if isinstance(sources, (str, os.PathLike)) or hasattr(sources, "read"):
+        sources = [sources]
+    sessionizer = Sessionizer(idle_timeout, client_key)
+    for source in sources:
+        stream = open_log(source)
+        try:
+            sessionizer.feed(stream)
+        finally:
+            if isinstance(source, (str, os.PathLike)) and source != "-":
+                stream.close()
+    sessionizer.finish()
+    return sessionizer.summary()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Derive users per hour and session length from access logs.")
+    parser.add_argument("logs", nargs="+", help="Access logs (plain or .gz), oldest first, or - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="JSON output file, or - for stdout")
+    parser.add_argument(
+        "--idle-timeout", type=int, default=DEFAULT_IDLE_TIMEOUT,
+        help=f"Seconds without a request that end a session (default: {DEFAULT_IDLE_TIMEOUT})",
+    )
+    parser.add_argument("--client", choices=CLIENT_KEYS, default="ip+ua", help="What identifies one user")
+    args = parser.parse_args(argv)
+
+    summary = summarize_access_logs(args.logs, args.idle_timeout, args.client)
+    target = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        json.dump(summary, target, ensure_ascii=False, indent=2)
+        target.write("\n")
+    finally:
+        if target is not sys.stdout:
+            target.close()
+
+    print(
+        f"{summary['lines']:,} baris dibaca, {summary['skipped']:,} dilewati, {summary['sessions']:,} sesi. "
+        f"User per jam {summary['users_per_hour']:,}, durasi sesi {summary['session_seconds']:,} detik, "
+        f"concurrent puncak {summary['peak_concurrency']:,}: {summary['recommendation']}.",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
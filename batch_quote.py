@@ -0,0 +1,343 @@
+"""Price quote requests from CSV or JSONL without starting Streamlit.
+
+Each input row is one estimate with the estimator page's fields (``cpu``,
+``ram``, ``storage``, ``object_storage_gb``, ``variant``, ``duration_months``,
+``domains`` and the buffer/security-scan toggles). Rows are read and written
+in fixed-size windows, so memory stays bounded however large the input is,
+and ``--workers N`` spreads each window over a process pool.
+
+Usage::
+
+    python batch_quote.py quotes.csv -o priced.csv --workers 4
+    python batch_quote.py quotes.jsonl -o - --output-format jsonl
+
+In CSV input, ``domains`` is a ``;``-separated list of ``name`` or
+``name:Action`` items, e.g. ``datalab.co.id:Renewal;contoh.com``.
+
+Rows are checked against the same limits as the estimator page's inputs
+(``INPUT_LIMITS``). A row that is out of range, malformed, or not a JSON
+object comes back as an output row with ``error`` set; the run goes on.
+"""
+import argparse
+import csv
+import json
+import sys
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+from multiprocessing import Pool
+
+from catalog import get_cloud_vps_coefficients
+from cost_graph import CostGraph
+from limits import CPU_LIMITS, DURATION_LIMITS, OBJECT_STORAGE_LIMITS, RAM_LIMITS, STORAGE_LIMITS
+from pricing import (
+    SECURITY_SCAN_PER_PROJECT_MONTH,
+    get_concurrent_users,
+    quote,
+    recommend_from_concurrency,
+)
+
+FIELD_ALIASES = {
+    "object_storage": "object_storage_gb",
+    "duration": "duration_months",
+}
+# (field, limits, label) of the estimator page's inputs, checked for every row.
+INPUT_LIMITS = (
+    ("cpu", CPU_LIMITS, "CPU"),
+    ("ram", RAM_LIMITS, "RAM (GB)"),
+    ("storage", STORAGE_LIMITS, "Storage (GB)"),
+    ("object_storage_gb", OBJECT_STORAGE_LIMITS, "Object Storage (GB)"),
+    ("duration_months", DURATION_LIMITS, "Durasi (bulan)"),
+)
+# Raw fields behind the costliest cost-graph nodes (VPS price, domains).
+SIMILARITY_FIELDS = ("variant", "cpu", "ram", "storage", "domains", "duration_months")
+TRUE_VALUES = {"1", "true", "yes", "y", "ya", "on"}
+FALSE_VALUES = {"0", "false", "no", "n", "tidak", "off", ""}
+OUTPUT_FIELDS = [
+    "id",
+    "variant",
+    "cpu",
+    "ram",
+    "storage",
+    "object_storage_gb",
+    "duration_months",
+    "domain_count",
+    "concurrent_users",
+    "recommendation",
+    "monthly_base_price",
+    "base_price",
+    "vps_buffer_price",
+    "object_storage_price",
+    "domain_price",
+    "pre_tax_subtotal",
+    "monitoring_fee",
+    "tax_fee",
+    "security_scan_price",
+    "total_price",
+    "error",
+]
+WINDOW_ROWS_PER_WORKER = 2000
+
+
+# ----------------------------
+# Input parsing
+# ----------------------------
+def parse_bool(value, default: bool) -> bool:
+    if value is None:
+        return default
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in TRUE_VALUES:
+        return True
+    if text in FALSE_VALUES:
+        return default if text == "" else False
+    raise ValueError(f"Nilai boolean tidak dikenal: {value!r}")
+
+
+def parse_domains(value) -> list:
+    """Domains of a row: a JSON list of names or ``{"name", "action"}`` objects, or CSV text."""
+    if not value:
+        return []
+    if isinstance(value, list):
+        domains = []
+        for position, entry in enumerate(value, 1):
+            if isinstance(entry, str):
+                entry = {"name": entry}
+            if not isinstance(entry, dict) or not isinstance(entry.get("name"), str):
+                raise ValueError(f"Domain ke-{position} harus berupa nama atau objek dengan \"name\" berupa teks.")
+            domains.append(entry)
+        return domains
+    if not isinstance(value, str):
+        raise ValueError("domains harus berupa list atau teks.")
+    domains = []
+    for item in str(value).split(";"):
+        name, _, action = item.strip().partition(":")
+        if name:
+            domains.append({"name": name, "action": action.strip() or "Register"})
+    return domains
+
+
+def parse_int(value, label: str) -> int:
+    """Whole number from a CSV cell or JSON value.
+
+    ``2``, ``2.0`` and ``"2.0"`` are accepted; ``2.5``, ``"2.5"`` and text
+    that is not a number are rejected with a message naming ``label``.
+    """
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            pass
+        try:
+            number = Decimal(value.strip())
+        except InvalidOperation:
+            number = None
+        if number is None or not number.is_finite() or number != number.to_integral_value():
+            raise ValueError(f"{label} harus berupa bilangan bulat: {value!r}")
+        return int(number)
+    if isinstance(value, float) and not value.is_integer():
+        raise ValueError(f"{label} harus berupa bilangan bulat: {value!r}")
+    return int(value)
+
+
+def _field(row: dict, key: str, default):
+    # Blank CSV cells and JSON nulls take the default; an explicit 0 stays 0.
+    value = row.get(key)
+    return default if value is None or value == "" else value
+
+
+def build_inputs(row: dict) -> dict:
+    """Quote inputs of one row, in the estimator page's ranges (``INPUT_LIMITS``)."""
+    row = {FIELD_ALIASES.get(key, key): value for key, value in row.items()}
+    inputs = {
+        "variant": row["variant"],
+        "cpu": parse_int(row["cpu"], "CPU"),
+        "ram": parse_int(row["ram"], "RAM (GB)"),
+        "storage": parse_int(row["storage"], "Storage (GB)"),
+        "object_storage_gb": float(_field(row, "object_storage_gb", 0)),
+        "duration_months": parse_int(_field(row, "duration_months", 12), "Durasi (bulan)"),
+        "domains": parse_domains(row.get("domains")),
+        "include_vps_buffer": parse_bool(row.get("include_vps_buffer"), True),
+        "include_security_scan": parse_bool(row.get("include_security_scan"), True),
+        "security_scan_monthly_price": parse_int(
+            _field(row, "security_scan_monthly_price", SECURITY_SCAN_PER_PROJECT_MONTH), "Biaya security scan"
+        ),
+        "users_per_hour": row.get("users_per_hour"),
+        "session_seconds": row.get("session_seconds"),
+    }
+    for field, (low, high), label in INPUT_LIMITS:
+        if not low <= inputs[field] <= high:
+            raise ValueError(f"{label} harus di antara {low} dan {high}.")
+    if inputs["security_scan_monthly_price"] < 0:
+        raise ValueError("Biaya security scan tidak boleh negatif.")
+    return inputs
+
+
+def read_rows(stream, input_format: str):
+    """CSV rows as dicts; JSONL lines as raw text, decoded per row by ``parse_row``."""
+    if input_format == "csv":
+        yield from csv.DictReader(stream)
+        return
+    for line in stream:
+        line = line.strip()
+        if line:
+            yield line
+
+
+def parse_row(row) -> dict:
+    """One input row as a dict, decoding a JSONL line; raises for anything else."""
+    if isinstance(row, str):
+        row = json.loads(row)
+    if not isinstance(row, dict):
+        raise TypeError(f"Quote harus berupa objek JSON, bukan {type(row).__name__}.")
+    return row
+
+
+# ----------------------------
+# Pricing
+# ----------------------------
+def price_row(row: dict | str, coefficients: dict | None = None, graph: CostGraph | None = None) -> dict:
+    """Price one input row (a dict or a JSONL line); failures come back as a row with ``error`` set.
+
+    With a ``graph``, nodes the row shares with the previous one (same
+    variant and specs, same domains, ...) are reused instead of recomputed.
+    """
+    if coefficients is None:
+        coefficients = get_cloud_vps_coefficients()
+    result = {"id": ""}
+    try:
+        row = parse_row(row)
+        result["id"] = row.get("id", "")
+        inputs = build_inputs(row)
+        breakdown = graph.update(inputs) if graph is not None else quote(inputs, coefficients)
+        concurrent = None
+        if inputs["users_per_hour"] not in (None, "") and inputs["session_seconds"] not in (None, ""):
+            concurrent = get_concurrent_users(
+                parse_int(inputs["users_per_hour"], "User per jam"),
+                parse_int(inputs["session_seconds"], "Durasi sesi"),
+            )
+    except (KeyError, ValueError, TypeError) as exc:
+        result["error"] = f"{type(exc).__name__}: {exc}"
+        return result
+
+    result.update({key: inputs[key] for key in ("variant", "cpu", "ram", "storage", "object_storage_gb")})
+    result.update(breakdown)
+    result["domain_count"] = len(breakdown["domain_cost_items"])
+    if concurrent is not None:
+        result["concurrent_users"] = concurrent
+        result["recommendation"] = recommend_from_concurrency(concurrent)
+    result["error"] = ""
+    return result
+
+
+def _similarity_key(row) -> tuple:
+    if not isinstance(row, dict):
+        return ()  # reported by ``price_row``
+    return tuple(str(row.get(field, "")) for field in SIMILARITY_FIELDS)
+
+
+def _decoded(row):
+    try:
+        return parse_row(row)
+    except (ValueError, TypeError):
+        return row
+
+
+def price_rows(rows: list[dict]) -> list[dict]:
+    """Price one chunk through a single cost graph (one per worker task).
+
+    Rows are priced with similar configurations next to each other, so the
+    graph reuses the nodes they share, and returned in input order.
+    """
+    coefficients = get_cloud_vps_coefficients()
+    graph = CostGraph(coefficients)
+    rows = [_decoded(row) for row in rows]
+    priced = [None] * len(rows)
+    for index in sorted(range(len(rows)), key=lambda index: _similarity_key(rows[index])):
+        priced[index] = price_row(rows[index], coefficients, graph)
+    return priced
+
+
+def _chunks(rows: list, size: int):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def iter_priced(rows, workers: int = 1, chunk_size: int = 500):
+    """Yield priced rows in input order, holding at most one window in memory."""
+    rows = iter(rows)
+    if workers <= 1:
+        while chunk := list(islice(rows, chunk_size)):
+            yield from price_rows(chunk)
+        return
+
+    window_size = WINDOW_ROWS_PER_WORKER * workers
+    with Pool(workers) as pool:
+        while window := list(islice(rows, window_size)):
+            for priced in pool.imap(price_rows, _chunks(window, chunk_size)):
+                yield from priced
+
+
+# ----------------------------
+# Output
+# ----------------------------
+class CsvQuoteWriter:
+    def __init__(self, stream):
+        self._writer = csv.DictWriter(stream, fieldnames=OUTPUT_FIELDS, extrasaction="ignore")
+        self._writer.writeheader()
+
+    def write(self, result: dict):
+        self._writer.writerow(result)
+
+
+class JsonlQuoteWriter:
+    def __init__(self, stream):
+        self._stream = stream
+
+    def write(self, result: dict):
+        self._stream.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+
+WRITERS = {"csv": CsvQuoteWriter, "jsonl": JsonlQuoteWriter}
+
+
+def detect_format(path: str, explicit: str | None) -> str:
+    if explicit:
+        return explicit
+    return "jsonl" if path.endswith((".jsonl", ".ndjson", ".json")) else "csv"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Price quote requests from CSV or JSONL.")
+    parser.add_argument("input", help="CSV/JSONL file with quote requests, or - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="Output file, or - for stdout")
+    parser.add_argument("--input-format", choices=sorted(WRITERS))
+    parser.add_argument("--output-format", choices=sorted(WRITERS))
+    parser.add_argument("--workers", type=int, default=1, help="Process pool size (default: 1, no pool)")
+    parser.add_argument("--chunk-size", type=int, default=500, help="Rows per task sent to a worker")
+    args = parser.parse_args(argv)
+
+    input_format = detect_format(args.input, args.input_format)
+    output_format = detect_format(args.output, args.output_format)
+    source = sys.stdin if args.input == "-" else open(args.input, newline="", encoding="utf-8-sig")
+    target = sys.stdout if args.output == "-" else open(args.output, "w", newline="", encoding="utf-8")
+
+    total = errors = 0
+    try:
+        writer = WRITERS[output_format](target)
+        for result in iter_priced(read_rows(source, input_format), args.workers, args.chunk_size):
+            writer.write(result)
+            total += 1
+            errors += bool(result.get("error"))
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+
+    print(f"{total:,} quote diproses, {errors:,} gagal.", file=sys.stderr)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
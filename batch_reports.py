@@ -0,0 +1,200 @@
+"""Render many estimate PDFs at once.
+
+Input is JSON or JSONL of quote dicts in the ``report.build_pdf_report``
+schema. Output modes:
+
+* ``files``: one PDF per quote in a directory. Workers write straight to
+  disk, so no PDF bytes cross the process boundary.
+* ``zip``: the same PDFs streamed into one zip as workers finish them.
+* ``combined``: one multi-page document. A PDF cannot be assembled from
+  separately rendered files without a merging library, so this mode draws
+  every page onto a single canvas in this process.
+
+Quotes are read and dispatched in fixed windows, so memory stays bounded;
+a JSON list is decoded one item at a time, like JSONL. File names come from
+``file_name`` or ``id``; a name already used in the run gets the quote's
+position as a prefix, so no PDF overwrites another.
+
+Usage::
+
+    python batch_reports.py quotes.jsonl --mode zip --output estimates.zip --workers 4
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import zipfile
+from datetime import datetime
+from itertools import islice
+from multiprocessing import Pool
+from pathlib import Path
+
+from report import build_pdf_report, draw_estimate_page, new_canvas
+
+WINDOW_SIZE_PER_WORKER = 64
+READ_CHUNK_CHARS = 1 << 16
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^A-Za-z0-9._-]+")
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+def _iter_json_list(stream):
+    """Yield the items of a JSON list whose ``[`` was already read, one at a time."""
+    decoder = json.JSONDecoder()
+    buffer, pos, eof, expect_item = "", 0, False, True
+
+    def read_more() -> tuple[str, bool]:
+        # Drop what was consumed; grow geometrically so an item spanning many
+        # chunks is re-parsed only a few times.
+        rest = buffer[pos:]
+        chunk = stream.read(max(READ_CHUNK_CHARS, len(rest)))
+        return rest + chunk, not chunk
+
+    while True:
+        pos = _WHITESPACE.match(buffer, pos).end()
+        if pos == len(buffer):
+            if eof:
+                raise ValueError("JSON list tidak ditutup dengan ']'.")
+            (buffer, eof), pos = read_more(), 0
+            continue
+        if buffer[pos] == "]":
+            return
+        if not expect_item:
+            if buffer[pos] != ",":
+                raise ValueError(f"JSON list tidak valid di dekat: {buffer[pos:pos + 40]!r}")
+            pos, expect_item = pos + 1, True
+            continue
+        try:
+            item, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            (buffer, eof), pos = read_more(), 0
+            continue
+        if end == len(buffer) and not eof:
+            # A number at the end of the buffer may continue in the next chunk.
+            (buffer, eof), pos = read_more(), 0
+            continue
+        yield item
+        pos, expect_item = end, False
+
+
+def read_quotes(path: str):
+    """Yield quote dicts from a JSON list or JSONL file (``-`` for stdin), one at a time."""
+    stream = sys.stdin if path == "-" else open(path, encoding="utf-8-sig")
+    try:
+        first = stream.read(1)
+        while first.isspace():
+            first = stream.read(1)
+        if first == "[":
+            yield from _iter_json_list(stream)
+            return
+        pending = first
+        for line in stream:
+            line = (pending + line).strip()
+            pending = ""
+            if line:
+                yield json.loads(line)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def report_filename(data: dict, position: int) -> str:
+    identifier = data.get("id")
+    if identifier is None or identifier == "":
+        identifier = position
+    name = data.get("file_name") or f"DLI_Estimasi_{str(identifier):0>5}"
+    name = _UNSAFE_FILENAME_CHARS.sub("_", str(name)).strip("_") or f"DLI_Estimasi_{position:05d}"
+    return name if name.lower().endswith(".pdf") else f"{name}.pdf"
+
+
+def _with_defaults(data: dict, exported_at_str: str) -> dict:
+    return {"exported_at_str": exported_at_str, **data}
+
+
+def _render_bytes(job: tuple) -> tuple[str, bytes]:
+    filename, data = job
+    return filename, build_pdf_report(data)
+
+
+def _render_file(job: tuple) -> str:
+    path, data = job
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(build_pdf_report(data))
+    os.replace(tmp_path, path)
+    return path
+
+
+def _jobs(quotes, exported_at_str: str, output_dir: Path | None = None):
+    used_names = set()
+    for position, data in enumerate(quotes, start=1):
+        filename = report_filename(data, position)
+        # Case-insensitive, since the files may land on a case-insensitive filesystem.
+        while filename.lower() in used_names:
+            filename = f"{position:05d}_{filename}"
+        used_names.add(filename.lower())
+        target = str(output_dir / filename) if output_dir is not None else filename
+        yield target, _with_defaults(data, exported_at_str)
+
+
+def _run_windowed(worker, jobs, workers: int):
+    """Yield ``worker(job)`` results in order, dispatching bounded windows to a pool."""
+    if workers <= 1:
+        yield from map(worker, jobs)
+        return
+    window_size = WINDOW_SIZE_PER_WORKER * workers
+    with Pool(workers) as pool:
+        while window := list(islice(jobs, window_size)):
+            yield from pool.imap(worker, window, chunksize=4)
+
+
+def render_files(quotes, output_dir, workers: int = 1, exported_at_str: str | None = None) -> int:
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    exported_at_str = exported_at_str or datetime.now().strftime("%d-%m-%Y %H:%M:%S")
+    return sum(1 for _ in _run_windowed(_render_file, _jobs(quotes, exported_at_str, output_dir), workers))
+
+
+def render_zip(quotes, output_path, workers: int = 1, exported_at_str: str | None = None) -> int:
+    exported_at_str = exported_at_str or datetime.now().strftime("%d-%m-%Y %H:%M:%S")
+    count = 0
+    with zipfile.ZipFile(output_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for filename, pdf_bytes in _run_windowed(_render_bytes, _jobs(quotes, exported_at_str), workers):
+            archive.writestr(filename, pdf_bytes)
+            count += 1
+    return count
+
+
+def render_combined(quotes, output_path, exported_at_str: str | None = None) -> int:
+    exported_at_str = exported_at_str or datetime.now().strftime("%d-%m-%Y %H:%M:%S")
+    c = new_canvas(str(output_path))
+    count = 0
+    for data in quotes:
+        draw_estimate_page(c, _with_defaults(data, exported_at_str))
+        count += 1
+    c.save()
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render estimate PDFs for many quotes.")
+    parser.add_argument("input", help="JSON list or JSONL of quote dicts, or - for stdin")
+    parser.add_argument("--mode", choices=["files", "zip", "combined"], default="files")
+    parser.add_argument("-o", "--output", required=True, help="Directory (files) or file path (zip/combined)")
+    parser.add_argument("--workers", type=int, default=1, help="Process pool size for files/zip modes")
+    args = parser.parse_args(argv)
+
+    quotes = read_quotes(args.input)
+    if args.mode == "files":
+        count = render_files(quotes, args.output, args.workers)
+    elif args.mode == "zip":
+        count = render_zip(quotes, args.output, args.workers)
+    else:
+        count = render_combined(quotes, args.output)
+    print(f"{count:,} PDF dibuat di {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
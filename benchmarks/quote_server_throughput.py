@@ -0,0 +1,130 @@
+"""Keep-alive throughput benchmark for quote_server.py.
+
+Starts the service in-process on a free localhost port (or targets
+``--host/--port`` with ``--external``), opens ``--connections`` keep-alive
+sockets and sends ``--requests`` quotes over each, then reports requests per
+second and latency percentiles.
+
+Usage::
+
+    python benchmarks/quote_server_throughput.py --connections 32 --requests 500
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from quote_server import start_server  # noqa: E402
+
+SAMPLE_QUOTE = {
+    "variant": "Basic Standard — Dev/mock-up server API and website",
+    "cpu": 2,
+    "ram": 4,
+    "storage": 60,
+    "object_storage_gb": 100,
+    "duration_months": 12,
+    "domains": [{"name": "datalab.co.id", "action": "Renewal"}],
+    "users_per_hour": 3600,
+    "session_seconds": 60,
+}
+
+
+def build_request(host: str, path: str, payload: dict) -> bytes:
+    body = json.dumps(payload).encode("utf-8")
+    head = (
+        f"POST {path} HTTP/1.1\r\n"
+        f"Host: {host}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        "\r\n"
+    )
+    return head.encode("ascii") + body
+
+
+async def read_response(reader: asyncio.StreamReader) -> int:
+    status_line = await reader.readline()
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return int(status_line.split()[1])
+
+
+async def client(host: str, port: int, request: bytes, count: int, latencies: list) -> int:
+    reader, writer = await asyncio.open_connection(host, port)
+    failures = 0
+    try:
+        for _ in range(count):
+            started = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            status = await read_response(reader)
+            latencies.append(time.perf_counter() - started)
+            failures += status != 200
+    finally:
+        writer.close()
+    return failures
+
+
+async def run(args) -> dict:
+    server = None
+    host, port = args.host, args.port
+    if not args.external:
+        server = await start_server(host, 0)
+        port = server.sockets[0].getsockname()[1]
+
+    path = "/quote/batch" if args.batch > 1 else "/quote"
+    payload = {"quotes": [SAMPLE_QUOTE] * args.batch} if args.batch > 1 else SAMPLE_QUOTE
+    request = build_request(host, path, payload)
+    latencies: list[float] = []
+    try:
+        started = time.perf_counter()
+        failures = sum(await asyncio.gather(*(
+            client(host, port, request, args.requests, latencies)
+            for _ in range(args.connections)
+        )))
+        elapsed = time.perf_counter() - started
+    finally:
+        if server is not None:
+            server.close()
+            await server.wait_closed()
+
+    latencies.sort()
+    total = len(latencies)
+    return {
+        "requests": total,
+        "quotes": total * args.batch,
+        "failures": failures,
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(total / elapsed, 1),
+        "quotes_per_second": round(total * args.batch / elapsed, 1),
+        "latency_ms_p50": round(statistics.median(latencies) * 1000, 3),
+        "latency_ms_p95": round(latencies[int(total * 0.95) - 1] * 1000, 3),
+        "latency_ms_max": round(latencies[-1] * 1000, 3),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the quote service over keep-alive connections.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--external", action="store_true", help="Use an already running server")
+    parser.add_argument("--connections", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=200, help="Requests per connection")
+    parser.add_argument("--batch", type=int, default=1, help="Quotes per request (uses /quote/batch when > 1)")
+    args = parser.parse_args(argv)
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
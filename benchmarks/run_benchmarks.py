@@ -0,0 +1,336 @@
+"""Reproducible benchmark suite with stored baselines.
+
+Micro-benchmarks cover ``calculate_cloud_vps``, ``get_domain_extension``,
+``normalize_domain_entry`` and ``build_pdf_report`` (domain lists of 1, 100
+and 5000 entries). End-to-end cases measure rerun latency of the estimator
+script, ``paket_server.render_server_vps`` and
+``extreme_custom.render_cloud_vps`` through Streamlit's headless AppTest.
+
+Each case reports the median seconds per operation over several rounds and
+is compared with ``benchmarks/baseline.json``; a case slower than
+``baseline * threshold`` is a regression and makes the run exit with 1.
+
+Every round is preceded by a fixed pure-Python reference loop, and each
+case is also recorded in units of that loop (``calibrated`` in the
+baseline): the median over rounds of round time / loop time. The gate
+compares those units, so a slower machine, or one that speeds up and slows
+down during the run, does not show up as a regression. The raw seconds are
+kept for reading, with the reference loop's median time as
+``calibration_seconds`` ("host factor" compares it with the baseline's).
+Re-record the baseline in any commit that changes what a case costs.
+
+Usage::
+
+    python benchmarks/run_benchmarks.py                    # compare with baseline
+    python benchmarks/run_benchmarks.py --update-baseline  # record new baseline
+    python benchmarks/run_benchmarks.py -k domain --rounds 3
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+DEFAULT_THRESHOLD = 1.25
+DOMAIN_LIST_SIZES = (1, 100, 5000)
+DOMAIN_SUFFIXES = (".co.id", ".com", ".my.id", ".ac.id", ".io", ".net", ".example")
+CALIBRATION_LOOPS = 50_000
+
+
+def sample_domains(count: int) -> list[dict]:
+    actions = ("Register", "Renewal", "Transfer")
+    return [
+        {"name": f"client{i}{DOMAIN_SUFFIXES[i % len(DOMAIN_SUFFIXES)]}", "action": actions[i % 3]}
+        for i in range(count)
+    ]
+
+
+def sample_report_data(domain_count: int) -> dict:
+    from pricing import quote
+
+    inputs = {
+        "variant": "Basic Standard — Dev/mock-up server API and website",
+        "cpu": 2,
+        "ram": 4,
+        "storage": 60,
+        "object_storage_gb": 100,
+        "duration_months": 12,
+        "domains": sample_domains(domain_count),
+    }
+    breakdown = quote(inputs)
+    return {
+        **inputs,
+        **breakdown,
+        "exported_at_str": "01-01-2026 00:00:00",
+        "preset_label": "Custom (manual sliders)",
+        "users_per_hour": 3600,
+        "session_seconds": 60,
+        "concurrent_users": 60,
+        "cpu_type": inputs["variant"],
+    }
+
+
+# ----------------------------
+# Cases
+# ----------------------------
+# Each factory returns (operation, operations per call). The setup inside the
+# factory is not timed.
+def case_calculate_cloud_vps():
+    from catalog import get_cloud_vps_coefficients
+    from pricing import calculate_cloud_vps
+
+    coef = next(iter(get_cloud_vps_coefficients().values()))
+    configs = [(cpu, ram, storage) for cpu in (1, 2, 4, 8) for ram in (1, 4, 16, 64) for storage in (20, 80, 500)]
+
+    def run():
+        for cpu, ram, storage in configs:
+            calculate_cloud_vps(cpu, ram, storage, coef)
+
+    return run, len(configs)
+
+
+def make_domain_extension_case(size: int):
+    def factory():
+        from pricing import get_domain_extension
+
+        names = [domain["name"] for domain in sample_domains(size)]
+
+        def run():
+            for name in names:
+                get_domain_extension(name)
+
+        return run, 1
+
+    return factory
+
+
+def make_normalize_case(size: int):
+    def factory():
+        from pricing import normalize_domain_entry
+
+        domains = sample_domains(size)
+
+        def run():
+            for domain in domains:
+                normalize_domain_entry(domain)
+
+        return run, 1
+
+    return factory
+
+
+def make_pdf_case(size: int):
+    def factory():
+        from report import build_pdf_report
+
+        data = sample_report_data(size)
+        return (lambda: build_pdf_report(data)), 1
+
+    return factory
+
+
+def _app_test_rerun(app_test):
+    app_test.run()
+    if app_test.exception:
+        raise RuntimeError(app_test.exception)
+
+    def run():
+        app_test.run()
+
+    return run, 1
+
+
+def case_rerun_estimator():
+    from streamlit.testing.v1 import AppTest
+
+    return _app_test_rerun(AppTest.from_file(str(ROOT / "idcloudhost-calculator.py"), default_timeout=60))
+
+
+def case_rerun_estimator_domains():
+    from streamlit.testing.v1 import AppTest
+
+    from pricing import DomainList
+
+    app_test = AppTest.from_file(str(ROOT / "idcloudhost-calculator.py"), default_timeout=60)
+    app_test.run()  # first run initializes session state
+    app_test.session_state["domains"] = DomainList(sample_domains(500))
+    return _app_test_rerun(app_test)
+
+
+def _render_server_vps():
+    import paket_server
+
+    paket_server.render_server_vps()
+
+
+def _render_cloud_vps():
+    import extreme_custom
+
+    extreme_custom.render_cloud_vps()
+
+
+def case_rerun_paket_server():
+    from streamlit.testing.v1 import AppTest
+
+    return _app_test_rerun(AppTest.from_function(_render_server_vps, default_timeout=60))
+
+
+def case_rerun_extreme_custom():
+    from streamlit.testing.v1 import AppTest
+
+    return _app_test_rerun(AppTest.from_function(_render_cloud_vps, default_timeout=60))
+
+
+CASES = {
+    "pricing.calculate_cloud_vps": (case_calculate_cloud_vps, 2000),
+    **{
+        f"domain.get_domain_extension[{size}]": (make_domain_extension_case(size), max(1, 20000 // size))
+        for size in DOMAIN_LIST_SIZES
+    },
+    **{
+        f"domain.normalize_domain_entry[{size}]": (make_normalize_case(size), max(1, 20000 // size))
+        for size in DOMAIN_LIST_SIZES
+    },
+    **{f"report.build_pdf_report[{size}]": (make_pdf_case(size), 3 if size > 1000 else 20) for size in DOMAIN_LIST_SIZES},
+    "rerun.idcloudhost_calculator": (case_rerun_estimator, 5),
+    "rerun.idcloudhost_calculator[500 domains]": (case_rerun_estimator_domains, 3),
+    "rerun.paket_server": (case_rerun_paket_server, 5),
+    "rerun.extreme_custom": (case_rerun_extreme_custom, 5),
+}
+
+
+# ----------------------------
+# Runner
+# ----------------------------
+def calibrate() -> float:
+    """Seconds for one pass of the reference loop on this host, right now."""
+    # Integer math, dict stores and str formatting: the mix the pricing cases run.
+    started = time.perf_counter()
+    total = 0
+    table = {}
+    for i in range(CALIBRATION_LOOPS):
+        total += (i * 7919) % 1013
+        table[i & 1023] = str(total)
+    return time.perf_counter() - started
+
+
+def measure(factory, iterations: int, rounds: int) -> tuple[float, float, float]:
+    """Median seconds per operation, the same in reference-loop units, and the loop's median seconds.
+
+    The reference loop runs right before every round, so each round is
+    calibrated against the host speed at that moment.
+    """
+    run, operations = factory()
+    run()  # warm-up
+    samples, calibrated, references = [], [], []
+    for _ in range(rounds):
+        reference = calibrate()
+        started = time.perf_counter()
+        for _ in range(iterations):
+            run()
+        seconds = (time.perf_counter() - started) / (iterations * operations)
+        samples.append(seconds)
+        calibrated.append(seconds / reference)
+        references.append(reference)
+    return statistics.median(samples), statistics.median(calibrated), statistics.median(references)
+
+
+def load_baseline(path: Path) -> dict:
+    if not path.exists():
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(path: Path, results: dict, calibrated: dict, calibration_seconds: float):
+    payload = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "calibration_seconds": calibration_seconds,
+        "results": results,
+        "calibrated": calibrated,
+    }
+    with open(path, "w") as f:
+        json.dump(payload, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def format_seconds(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3f} {unit}"
+    return f"{seconds / 1e-9:.1f} ns"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run the estimator benchmark suite.")
+    parser.add_argument("-k", "--filter", default="", help="Only run cases whose name contains this text")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Fail when a case is slower than baseline * threshold")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    os.chdir(ROOT)
+    baseline = load_baseline(args.baseline)
+    baseline_results = baseline.get("results", {})
+    baseline_calibrated = baseline.get("calibrated", {})
+    results, calibrated, references = {}, {}, []
+    regressions = []
+    for name, (factory, iterations) in CASES.items():
+        if args.filter not in name:
+            continue
+        seconds, units, reference_seconds = measure(factory, iterations, args.rounds)
+        results[name] = seconds
+        calibrated[name] = units
+        references.append(reference_seconds)
+        # Compared in reference-loop units; a baseline recorded without them falls back to seconds.
+        if name in baseline_calibrated:
+            ratio = units / baseline_calibrated[name]
+        else:
+            reference = baseline_results.get(name)
+            ratio = seconds / reference if reference else None
+        if ratio is not None and ratio > args.threshold and not args.update_baseline:
+            regressions.append(name)
+        if not args.json:
+            status = "REGRESSION" if name in regressions else ""
+            compared = f"{ratio:6.2f}x" if ratio is not None else "   new"
+            print(f"{name:48s} {format_seconds(seconds):>12s}  {compared}  {status}")
+
+    calibration = statistics.median(references) if references else baseline.get("calibration_seconds")
+    baseline_calibration = baseline.get("calibration_seconds")
+    # > 1 when this host (or its load during the run) is slower than the baseline's.
+    host_factor = calibration / baseline_calibration if calibration and baseline_calibration else None
+    if args.json:
+        print(json.dumps(
+            {"results": results, "calibrated": calibrated, "host_factor": host_factor, "regressions": regressions},
+            indent=2,
+        ))
+    elif host_factor is not None:
+        print(f"{'host factor (reference loop)':48s} {format_seconds(calibration):>12s}  {host_factor:6.2f}x")
+    if args.update_baseline:
+        save_baseline(
+            args.baseline,
+            {**baseline_results, **results},
+            {**baseline_calibrated, **calibrated},
+            calibration,
+        )
+        print(f"Baseline written to {args.baseline}", file=sys.stderr)
+        return 0
+    if regressions:
+        print(f"{len(regressions)} regression(s) above {args.threshold:.2f}x baseline.", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
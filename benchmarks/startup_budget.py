@@ -0,0 +1,117 @@
+"""Cold-start import budget check.
+
+Imports the modules the Streamlit pages load at startup in a fresh
+interpreter under ``python -X importtime`` and fails when the cold import
+takes longer than the budget, or when a dependency that should load lazily
+(reportlab, pandas, numpy) is pulled in at import time.
+
+Streamlit itself is imported first and reported separately, so the app
+budget only covers this repository's modules and what they drag in. The
+median of ``--runs`` fresh interpreters is used because single runs are
+noisy.
+
+Usage::
+
+    python benchmarks/startup_budget.py
+    python benchmarks/startup_budget.py --app-budget-ms 30 --total-budget-ms 800 --top 15
+"""
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+FRAMEWORK_MODULES = ("streamlit",)
+APP_MODULES = ("pricing", "catalog", "report", "optimizer", "profiling", "cost_graph", "paket_server", "extreme_custom")
+DEFERRED_MODULES = ("reportlab", "pandas", "numpy")
+DEFAULT_APP_BUDGET_MS = 25.0
+DEFAULT_TOTAL_BUDGET_MS = 1000.0
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int, int]]:
+    """``(module, depth, self_us, cumulative_us)`` rows from ``-X importtime`` output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # header line
+        name_field = fields[2]
+        name = name_field.strip()
+        depth = (len(name_field) - len(name_field.lstrip()) - 1) // 2
+        rows.append((name, depth, int(fields[0]), int(fields[1])))
+    return rows
+
+
+def measure_once(modules) -> list[tuple[str, int, int, int]]:
+    statement = "; ".join(f"import {module}" for module in modules)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+def summarize(rows, framework=FRAMEWORK_MODULES, app=APP_MODULES) -> dict:
+    """Cumulative milliseconds for the framework and app top-level imports."""
+    top_level = {name: cumulative for name, depth, _, cumulative in rows if depth == 0}
+    loaded = {name.split(".")[0] for name, *_ in rows}
+    return {
+        "framework_ms": sum(top_level.get(name, 0) for name in framework) / 1000,
+        "app_ms": sum(top_level.get(name, 0) for name in app) / 1000,
+        "per_module_ms": {name: top_level.get(name, 0) / 1000 for name in app},
+        "eager_deferred": sorted(loaded & set(DEFERRED_MODULES)),
+    }
+
+
+def slowest_imports(rows, count: int) -> list[tuple[str, float]]:
+    return [(name, self_us / 1000) for name, _, self_us, _ in sorted(rows, key=lambda row: -row[2])[:count]]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Fail when cold import time exceeds the startup budget.")
+    parser.add_argument("--app-budget-ms", type=float, default=DEFAULT_APP_BUDGET_MS,
+                        help="Budget for the app modules on top of an already imported Streamlit")
+    parser.add_argument("--total-budget-ms", type=float, default=DEFAULT_TOTAL_BUDGET_MS,
+                        help="Budget for Streamlit plus the app modules")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10, help="Show the N imports with the highest self time")
+    args = parser.parse_args(argv)
+
+    samples = []
+    for _ in range(args.runs):
+        rows = measure_once(FRAMEWORK_MODULES + APP_MODULES)
+        samples.append((summarize(rows), rows))
+    samples.sort(key=lambda sample: sample[0]["framework_ms"] + sample[0]["app_ms"])
+    summary, rows = samples[len(samples) // 2]
+    total_ms = summary["framework_ms"] + summary["app_ms"]
+
+    print(f"{'streamlit':24s} {summary['framework_ms']:9.1f} ms")
+    for name, ms in summary["per_module_ms"].items():
+        print(f"  {name:22s} {ms:9.1f} ms")
+    print(f"{'app modules':24s} {summary['app_ms']:9.1f} ms  (budget {args.app_budget_ms:.0f} ms)")
+    print(f"{'total':24s} {total_ms:9.1f} ms  (budget {args.total_budget_ms:.0f} ms)")
+    if args.top:
+        print("\nSlowest imports by self time (median run):")
+        for name, ms in slowest_imports(rows, args.top):
+            print(f"  {name:40s} {ms:8.2f} ms")
+
+    failures = []
+    if summary["eager_deferred"]:
+        failures.append(f"imported at startup but should load lazily: {', '.join(summary['eager_deferred'])}")
+    if summary["app_ms"] > args.app_budget_ms:
+        failures.append(f"app modules took {summary['app_ms']:.1f} ms > {args.app_budget_ms:.0f} ms")
+    if total_ms > args.total_budget_ms:
+        failures.append(f"cold import took {total_ms:.1f} ms > {args.total_budget_ms:.0f} ms")
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
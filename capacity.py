@@ -0,0 +1,167 @@
+"""Table-driven capacity model and hourly traffic profiles.
+
+``data/capacity_tiers.csv`` maps concurrent users to the smallest (CPU, RAM)
+tier that serves them; the last tier has no upper bound. The rows of
+``data/spec_load_rules.csv`` give the typical traffic (users per hour and
+session seconds) of each spec, with CPU and RAM both non-decreasing down the
+table. Both files are parsed once per version (see ``catalog``) into sorted
+threshold tuples, so a lookup in either direction is one ``bisect``; the
+``*_batch`` variants do the same over arrays (``fleet`` rates its nodes with
+``load_for_batch``).
+
+A traffic profile is the users of each hour of a day (24 values) or a week
+(168 values). ``profile_stats`` turns one profile, or a ``(profiles, hours)``
+matrix of them, into per-hour concurrency plus its peak, 95th percentile and
+mean in one vectorized pass; ``size_profiles`` adds the tier for the peak.
+NumPy is imported on first use, since the page only needs it when a profile
+is entered.
+"""
+import csv
+from bisect import bisect_left, bisect_right
+from io import StringIO
+
+SECONDS_PER_HOUR = 3600
+PROFILE_HOURS = (24, 168)
+PROFILE_PERCENTILE = 95
+_PROFILE_SEPARATORS = str.maketrans({",": " ", ";": " "})
+
+
+class CapacityTiers:
+    """Concurrency thresholds and the (CPU, RAM) tier each one maps to."""
+
+    __slots__ = ("thresholds", "specs")
+
+    def __init__(self, tiers: list[tuple[int | None, int, int]]):
+        if not tiers or tiers[-1][0] is not None or any(limit is None for limit, _, _ in tiers[:-1]):
+            raise ValueError("Capacity tiers need bounded rows followed by one open-ended last row.")
+        thresholds = tuple(limit for limit, _, _ in tiers[:-1])
+        if any(low >= high for low, high in zip(thresholds, thresholds[1:])):
+            raise ValueError("Capacity tier limits must be strictly increasing.")
+        self.thresholds = thresholds
+        self.specs = tuple((cpu, ram) for _, cpu, ram in tiers)
+
+    @classmethod
+    def from_csv(cls, raw: bytes) -> "CapacityTiers":
+        reader = csv.DictReader(StringIO(raw.decode("utf-8-sig")))
+        return cls([
+            (
+                int(row["Max Concurrent"]) if row["Max Concurrent"].strip() else None,
+                int(row["CPU"]),
+                int(row["RAM (GB)"]),
+            )
+            for row in reader
+        ])
+
+    def specs_for(self, concurrent: int) -> tuple[int, int]:
+        """Smallest (CPU, RAM) whose tier limit is at least ``concurrent``."""
+        return self.specs[bisect_left(self.thresholds, concurrent)]
+
+    def in_top_tier(self, concurrent: int) -> bool:
+        """True above the last bounded limit, where the top tier is only a floor."""
+        return bisect_left(self.thresholds, concurrent) == len(self.thresholds)
+
+    def specs_for_batch(self, concurrent):
+        """``specs_for`` over an array: (cpu, ram) int64 arrays shaped like ``concurrent``."""
+        import numpy as np
+
+        index = np.searchsorted(np.asarray(self.thresholds, dtype=np.int64), np.asarray(concurrent), side="left")
+        specs = np.asarray(self.specs, dtype=np.int64)
+        return specs[index, 0], specs[index, 1]
+
+
+class SpecLoadRules:
+    """Typical traffic per spec, looked up from the largest rule the spec covers."""
+
+    __slots__ = ("cpus", "rams", "loads")
+
+    def __init__(self, rules: list[tuple[int, int, int, int]]):
+        if not rules:
+            raise ValueError("At least one spec load rule is required.")
+        cpus = tuple(cpu for cpu, _, _, _ in rules)
+        rams = tuple(ram for _, ram, _, _ in rules)
+        if list(cpus) != sorted(cpus) or list(rams) != sorted(rams):
+            raise ValueError("Spec load rules must be ordered with CPU and RAM both non-decreasing.")
+        self.cpus = cpus
+        self.rams = rams
+        self.loads = tuple((users_per_hour, session_seconds) for _, _, users_per_hour, session_seconds in rules)
+
+    @classmethod
+    def from_csv(cls, raw: bytes) -> "SpecLoadRules":
+        reader = csv.DictReader(StringIO(raw.decode("utf-8-sig")))
+        return cls([
+            (int(row["CPU"]), int(row["RAM (GB)"]), int(row["Users per Hour"]), int(row["Session Seconds"]))
+            for row in reader
+        ])
+
+    def load_for(self, cpu: int, ram: int) -> tuple[int, int]:
+        """(users per hour, session seconds) of the last rule with CPU and RAM both covered.
+
+        Both columns are sorted, so the covered rules are a prefix of the
+        table and its end is the shorter of the two bisections. Specs below
+        the first rule get the first rule.
+        """
+        covered = min(bisect_right(self.cpus, cpu), bisect_right(self.rams, ram))
+        return self.loads[max(covered - 1, 0)]
+
+    def load_for_batch(self, cpu, ram):
+        """``load_for`` over arrays: (users per hour, session seconds) int64 arrays."""
+        import numpy as np
+
+        covered = np.minimum(
+            np.searchsorted(np.asarray(self.cpus, dtype=np.int64), np.asarray(cpu), side="right"),
+            np.searchsorted(np.asarray(self.rams, dtype=np.int64), np.asarray(ram), side="right"),
+        )
+        loads = np.asarray(self.loads, dtype=np.int64)
+        index = np.maximum(covered - 1, 0)
+        return loads[index, 0], loads[index, 1]
+
+
+# ----------------------------
+# Traffic profiles
+# ----------------------------
+def parse_hourly_profile(text: str) -> list[int]:
+    """Users per hour from text separated by commas, semicolons or whitespace."""
+    items = text.translate(_PROFILE_SEPARATORS).split()
+    try:
+        values = [int(item) for item in items]
+    except ValueError:
+        raise ValueError("Profil trafik hanya boleh berisi bilangan bulat.") from None
+    if len(values) not in PROFILE_HOURS:
+        raise ValueError(
+            f"Profil trafik harus berisi {' atau '.join(map(str, PROFILE_HOURS))} angka, bukan {len(values)}."
+        )
+    if min(values) < 0:
+        raise ValueError("User per jam tidak boleh negatif.")
+    return values
+
+
+def profile_stats(hourly_users, session_seconds) -> dict:
+    """Per-hour concurrency of one profile or a ``(profiles, hours)`` matrix, plus its summary.
+
+    Each hour is rounded up like ``get_concurrent_users``. ``p95`` is the
+    nearest-rank percentile over the hours, so it is always one of the hourly
+    values. ``session_seconds`` is a scalar or one value per profile.
+    """
+    import numpy as np
+
+    users = np.asarray(hourly_users, dtype=np.int64)
+    if users.shape[-1] not in PROFILE_HOURS:
+        raise ValueError(f"A traffic profile has {' or '.join(map(str, PROFILE_HOURS))} hours, not {users.shape[-1]}.")
+    seconds = np.asarray(session_seconds, dtype=np.int64)[..., np.newaxis]
+    concurrency = (users * seconds + SECONDS_PER_HOUR - 1) // SECONDS_PER_HOUR
+
+    hours = concurrency.shape[-1]
+    rank = -(-PROFILE_PERCENTILE * hours // 100)  # nearest rank, 1-based
+    return {
+        "concurrency": concurrency,
+        "peak": concurrency.max(axis=-1),
+        "p95": np.partition(concurrency, rank - 1, axis=-1)[..., rank - 1],
+        "mean": concurrency.mean(axis=-1),
+    }
+
+
+def size_profiles(hourly_users, session_seconds, tiers: CapacityTiers) -> dict:
+    """``profile_stats`` plus the (CPU, RAM) tier sized for each profile's peak hour."""
+    stats = profile_stats(hourly_users, session_seconds)
+    stats["cpu"], stats["ram"] = tiers.specs_for_batch(stats["peak"])
+    return stats
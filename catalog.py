@@ -0,0 +1,150 @@
+"""Process-wide cache for the files under ``data/``.
+
+Each data file is parsed once per process and the parsed object is shared by
+every Streamlit session. A cheap ``os.stat`` on each access notices edits:
+when the mtime or size moves, the file is re-hashed and only re-parsed if its
+content actually changed. Treat returned objects as read-only.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from capacity import CapacityTiers, SpecLoadRules
+from plans import PlanCatalog
+
+DATA_DIR = Path(__file__).resolve().parent / "data"
+CLOUD_VPS_COEFF_PATH = DATA_DIR / "cloud_vps_coeff.json"
+SERVER_VPS_PLANS_PATH = DATA_DIR / "server_vps_plans.csv"
+CAPACITY_TIERS_PATH = DATA_DIR / "capacity_tiers.csv"
+SPEC_LOAD_RULES_PATH = DATA_DIR / "spec_load_rules.csv"
+# (lower tier, upper tier) Cloud VPS coefficient pairs; see ``check_cloud_vps_tiers``.
+CLOUD_VPS_TIERS = (("cpuram1", "cpuram2"), ("storage1", "storage2"))
+
+
+class _CatalogEntry:
+    __slots__ = (
+        "path", "parse", "value", "mtime_ns", "size", "digest",
+        "loads", "hits", "revalidations", "last_load_seconds", "total_load_seconds",
+    )
+
+    def __init__(self, path: Path, parse):
+        self.path = path
+        self.parse = parse
+        self.value = None
+        self.mtime_ns = None
+        self.size = None
+        self.digest = None
+        self.loads = 0
+        self.hits = 0
+        self.revalidations = 0
+        self.last_load_seconds = 0.0
+        self.total_load_seconds = 0.0
+
+
+_entries: dict = {}
+_lock = threading.Lock()
+
+
+def load(path, parse):
+    """Return ``parse(raw_bytes)`` for ``path``, re-parsing only when the file changed."""
+    stat = os.stat(path)
+    with _lock:
+        entry = _entries.get(path)
+        if entry is None:
+            entry = _entries[path] = _CatalogEntry(Path(path).resolve(), parse)
+        if entry.mtime_ns == stat.st_mtime_ns and entry.size == stat.st_size:
+            entry.hits += 1
+            return entry.value
+
+        started = time.perf_counter()
+        with open(path, "rb") as f:
+            raw = f.read()
+        digest = hashlib.sha256(raw).hexdigest()
+        if digest == entry.digest:
+            # Touched but unchanged: keep the parsed value.
+            entry.revalidations += 1
+        else:
+            entry.value = parse(raw)
+            entry.digest = digest
+            entry.loads += 1
+        entry.mtime_ns = stat.st_mtime_ns
+        entry.size = stat.st_size
+        entry.last_load_seconds = time.perf_counter() - started
+        entry.total_load_seconds += entry.last_load_seconds
+        return entry.value
+
+
+def catalog_stats() -> list[dict]:
+    """Load counts and timings for every cached data file."""
+    with _lock:
+        return [
+            {
+                "file": entry.path.name,
+                "digest": entry.digest[:12] if entry.digest else None,
+                "loads": entry.loads,
+                "hits": entry.hits,
+                "revalidations": entry.revalidations,
+                "last_load_ms": round(entry.last_load_seconds * 1000, 3),
+                "total_load_ms": round(entry.total_load_seconds * 1000, 3),
+            }
+            for entry in _entries.values()
+        ]
+
+
+def clear():
+    with _lock:
+        _entries.clear()
+
+
+# ----------------------------
+# Data files
+# ----------------------------
+def check_cloud_vps_tiers(coefficients: dict) -> dict:
+    """Reject coefficients whose upper tier is cheaper per unit than the lower one.
+
+    With ``0 < lower <= upper`` the Cloud VPS price never drops as CPU, RAM or
+    storage grow, which ``optimizer.cheapest_options`` relies on.
+    """
+    for variant, coef in coefficients.items():
+        for lower, upper in CLOUD_VPS_TIERS:
+            if not 0 < coef[lower] <= coef[upper]:
+                raise ValueError(
+                    f"Cloud VPS variant {variant!r}: {lower} ({coef[lower]}) must be positive "
+                    f"and not above {upper} ({coef[upper]})."
+                )
+    return coefficients
+
+
+def _parse_cloud_vps_coefficients(raw: bytes) -> dict:
+    return check_cloud_vps_tiers(json.loads(raw))
+
+
+def _parse_plan_catalog(raw: bytes) -> PlanCatalog:
+    return PlanCatalog.from_csv(raw)
+
+
+def _parse_capacity_tiers(raw: bytes) -> CapacityTiers:
+    return CapacityTiers.from_csv(raw)
+
+
+def _parse_spec_load_rules(raw: bytes) -> SpecLoadRules:
+    return SpecLoadRules.from_csv(raw)
+
+
+def get_cloud_vps_coefficients() -> dict:
+    return load(CLOUD_VPS_COEFF_PATH, _parse_cloud_vps_coefficients)
+
+
+def get_server_vps_plans() -> PlanCatalog:
+    return load(SERVER_VPS_PLANS_PATH, _parse_plan_catalog)
+
+
+def get_capacity_tiers() -> CapacityTiers:
+    return load(CAPACITY_TIERS_PATH, _parse_capacity_tiers)
+
+
+def get_spec_load_rules() -> SpecLoadRules:
+    return load(SPEC_LOAD_RULES_PATH, _parse_spec_load_rules)
@@ -0,0 +1,265 @@
+"""Incremental cost pipeline: the quote breakdown as a graph of cached nodes.
+
+Each ``CostNode`` names the inputs or upstream nodes it reads and the
+``pricing`` step that computes it. ``CostGraph.update(inputs)`` compares the
+new inputs with the previous ones, marks only the nodes downstream of a
+changed input as dirty and recomputes those, in dependency order. Changing
+one domain action therefore reprices the domains, the subtotal, monitoring,
+PPN and the total, but not the VPS base price, buffer or object storage.
+
+``trace`` lists the nodes the last evaluation recomputed and how long each
+took; ``trace_rows`` formats it for the profiling panel. The
+breakdown is the same dict ``pricing.quote`` returns, value for value.
+
+A ``DomainList`` is priced from its per-price counts and an in-place
+mutation is detected through its ``version``. A plain list of domains is
+compared with a copy of the previous one and only normalized again when it
+differs.
+"""
+import operator
+import time
+from operator import itemgetter
+
+from catalog import get_cloud_vps_coefficients
+from price_table import cloud_vps_price
+from pricing import (
+    SECURITY_SCAN_PER_PROJECT_MONTH,
+    DomainList,
+    format_duration_months,
+    get_buffer_months,
+    get_domain_period_price,
+    get_monitoring_fee,
+    get_object_storage_price,
+    get_tax_fee,
+    get_vps_buffer_price,
+    normalized_domains,
+)
+
+GRAPH_INPUTS = (
+    "cpu",
+    "ram",
+    "storage",
+    "coef",
+    "duration_months",
+    "object_storage_gb",
+    "domains",
+    "include_vps_buffer",
+    "include_security_scan",
+    "security_scan_monthly_price",
+)
+# The keys of ``pricing.price_breakdown``, in its order.
+BREAKDOWN_KEYS = (
+    "monthly_base_price",
+    "duration_months",
+    "buffer_months",
+    "buffer_duration_label",
+    "unit_label",
+    "include_vps_buffer",
+    "include_security_scan",
+    "base_price",
+    "vps_buffer_price",
+    "object_storage_price",
+    "security_scan_monthly_price",
+    "security_scan_price",
+    "domain_cost_items",
+    "domain_price",
+    "pre_tax_subtotal",
+    "monitoring_fee",
+    "tax_fee",
+    "total_price",
+)
+_breakdown_values = itemgetter(*BREAKDOWN_KEYS)
+_MISSING = object()
+
+
+def _single(name: str):
+    return lambda values: (values[name],)
+
+
+class CostNode:
+    __slots__ = ("name", "deps", "compute")
+
+    def __init__(self, name: str, deps: tuple[str, ...], compute):
+        self.name = name
+        self.deps = deps
+        self.compute = compute
+
+    def __repr__(self):
+        return f"CostNode({self.name!r}, deps={self.deps})"
+
+
+def _sum(*amounts) -> int:
+    return sum(amounts)
+
+
+def _domain_cost_items(domains, duration_months: int) -> list[dict]:
+    if isinstance(domains, DomainList):
+        return domains.cost_items(duration_months)
+    return [{**domain, "period_price": get_domain_period_price(domain, duration_months)} for domain in domains]
+
+
+def _domain_price(domains, domain_cost_items: list[dict], duration_months: int) -> int:
+    if isinstance(domains, DomainList):
+        return domains.period_total(duration_months)
+    return sum(domain["period_price"] for domain in domain_cost_items)
+
+
+# In dependency order: every node comes after the nodes it reads.
+COST_NODES = (
+    CostNode("monthly_base_price", ("cpu", "ram", "storage", "coef"), cloud_vps_price),
+    CostNode("buffer_months", ("duration_months",), get_buffer_months),
+    CostNode("buffer_duration_label", ("buffer_months",), format_duration_months),
+    CostNode("unit_label", ("duration_months",), lambda months: f" ({months} bulan)"),
+    CostNode("base_price", ("monthly_base_price", "duration_months"), operator.mul),
+    CostNode(
+        "vps_buffer_price",
+        ("base_price", "include_vps_buffer"),
+        lambda base_price, include: get_vps_buffer_price(base_price) if include else 0,
+    ),
+    CostNode("object_storage_price", ("object_storage_gb", "duration_months"), get_object_storage_price),
+    CostNode("domain_cost_items", ("domains", "duration_months"), _domain_cost_items),
+    CostNode("domain_price", ("domains", "domain_cost_items", "duration_months"), _domain_price),
+    CostNode("security_scan_price", ("security_scan_monthly_price", "duration_months"), operator.mul),
+    CostNode("pre_tax_subtotal", ("base_price", "vps_buffer_price", "object_storage_price", "domain_price"), _sum),
+    CostNode("monitoring_fee", ("pre_tax_subtotal",), get_monitoring_fee),
+    CostNode(
+        "tax_fee",
+        ("pre_tax_subtotal", "monitoring_fee"),
+        lambda subtotal, monitoring_fee: get_tax_fee(subtotal + monitoring_fee),
+    ),
+    CostNode("total_price", ("pre_tax_subtotal", "monitoring_fee", "tax_fee", "security_scan_price"), _sum),
+)
+
+
+class CostGraph:
+    """Cached cost nodes for one stream of estimates (a session, a batch worker)."""
+
+    __slots__ = (
+        "nodes", "coefficients", "values", "trace",
+        "_plan", "_dirty", "_downstream", "_domains_source", "_domains_version",
+    )
+
+    def __init__(self, coefficients: dict | None = None, nodes: tuple[CostNode, ...] = COST_NODES):
+        self.nodes = nodes
+        self.coefficients = coefficients
+        self.values = {}
+        self.trace: list[tuple[str, float]] = []
+        self._dirty = {node.name for node in nodes}
+        self._domains_source = None
+        self._domains_version = None
+
+        # Every node reachable from each input or node, for invalidation.
+        known = set(GRAPH_INPUTS)
+        direct: dict[str, list[str]] = {}
+        for node in nodes:
+            missing = [dep for dep in node.deps if dep not in known]
+            if missing:
+                raise ValueError(f"Node {node.name!r} reads {missing} before they are defined.")
+            known.add(node.name)
+            for dep in node.deps:
+                direct.setdefault(dep, []).append(node.name)
+        self._downstream = {}
+        for name in reversed([*GRAPH_INPUTS, *(node.name for node in nodes)]):
+            reached = set()
+            for child in direct.get(name, ()):
+                reached.add(child)
+                reached |= self._downstream[child]
+            self._downstream[name] = frozenset(reached)
+        # (name, getter returning the argument tuple, compute) per node.
+        self._plan = [
+            (node.name, itemgetter(*node.deps) if len(node.deps) > 1 else _single(node.deps[0]), node.compute)
+            for node in nodes
+        ]
+
+    def _set_domains(self, domains) -> bool:
+        if isinstance(domains, DomainList):
+            if self.values.get("domains") is domains and self._domains_version == domains.version:
+                return False
+            self._domains_source = None
+        else:
+            # Copy the raw dicts so an entry edited in place still compares as changed.
+            snapshot = [dict(domain) if isinstance(domain, dict) else domain for domain in domains or ()]
+            if self._domains_source is not None and self._domains_source == snapshot:
+                return False
+            self._domains_source = snapshot
+            domains = normalized_domains(snapshot)
+        self._domains_version = getattr(domains, "version", None)
+        self.values["domains"] = domains
+        self._dirty |= self._downstream["domains"]
+        return True
+
+    def set_inputs(self, inputs: dict) -> list[str]:
+        """Store ``pricing.quote``-style inputs; returns the names of the inputs that changed."""
+        coef = inputs.get("coef")
+        if coef is None:
+            coefficients = self.coefficients if self.coefficients is not None else get_cloud_vps_coefficients()
+            coef = coefficients[inputs["variant"]]
+        include_security_scan = bool(inputs.get("include_security_scan", True))
+        values = {
+            "cpu": int(inputs["cpu"]),
+            "ram": int(inputs["ram"]),
+            "storage": int(inputs["storage"]),
+            "coef": coef,
+            "duration_months": int(inputs.get("duration_months", 12)),
+            "object_storage_gb": inputs.get("object_storage_gb", 0),
+            "include_vps_buffer": bool(inputs.get("include_vps_buffer", True)),
+            "include_security_scan": include_security_scan,
+            "security_scan_monthly_price": (
+                int(inputs.get("security_scan_monthly_price", SECURITY_SCAN_PER_PROJECT_MONTH))
+                if include_security_scan
+                else 0
+            ),
+        }
+        current = self.values
+        downstream = self._downstream
+        changed = []
+        for name, value in values.items():
+            previous = current.get(name, _MISSING)
+            if previous is not value and previous != value:
+                current[name] = value
+                self._dirty |= downstream[name]
+                changed.append(name)
+        if self._set_domains(inputs.get("domains", [])):
+            changed.append("domains")
+        return changed
+
+    def evaluate(self) -> dict:
+        """Recompute the dirty nodes in dependency order and return the breakdown."""
+        values = self.values
+        dirty = self._dirty
+        trace = []
+        clock = time.perf_counter
+        started = clock()
+        for name, arguments, compute in self._plan:
+            if name in dirty:
+                values[name] = compute(*arguments(values))
+                finished = clock()
+                trace.append((name, finished - started))
+                started = finished
+        dirty.clear()
+        self.trace = trace
+        return self.breakdown()
+
+    def update(self, inputs: dict) -> dict:
+        self.set_inputs(inputs)
+        return self.evaluate()
+
+    def breakdown(self) -> dict:
+        """The current values under the keys of ``pricing.price_breakdown``."""
+        return dict(zip(BREAKDOWN_KEYS, _breakdown_values(self.values)))
+
+    def recomputed(self) -> list[str]:
+        """Names of the nodes the last evaluation recomputed, in evaluation order."""
+        return [name for name, _ in self.trace]
+
+    def trace_rows(self) -> list[dict]:
+        """Every node with whether the last evaluation recomputed it and how long that took."""
+        seconds = dict(self.trace)
+        return [
+            {
+                "Node": name,
+                "Dihitung ulang": name in seconds,
+                "Waktu (ms)": round(seconds.get(name, 0.0) * 1000, 3),
+            }
+            for name, _, _ in self._plan
+        ]
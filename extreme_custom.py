@@ -1,21 +1,9 @@
 import streamlit as st
-import json
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen import canvas
 from io import BytesIO
 
-# ============================================================
-# Function: Cloud VPS Price Calculation
-# ============================================================
-def calculate_cloud_vps(cpu, ram, storage, coef):
-    per_hour = (
-        (cpu * coef["cpuram1"] if cpu <= 2 else cpu * coef["cpuram2"])
-        + (ram * coef["cpuram1"] if ram <= 2 else ram * coef["cpuram2"])
-        + (storage * coef["storage1"] if storage < 81 else storage * coef["storage2"])
-    )
-    per_month = per_hour * 730
-    return int(1000 * round(per_month / 1000))
-
+from catalog import get_cloud_vps_coefficients
+from money import FLOOR, with_rate
+from pricing import PPN_RATE_BP, calculate_cloud_vps
 
 # ============================================================
 # Render Function: Cloud VPS Page
@@ -26,8 +14,7 @@ def render_cloud_vps():
     # ------------------------------
     # Load coefficient data
     # ------------------------------
-    with open("data/cloud_vps_coeff.json") as f:
-        cloud_vps_data = json.load(f)
+    cloud_vps_data = get_cloud_vps_coefficients()
 
     # ------------------------------
     # Package selector
@@ -60,8 +47,9 @@ def render_cloud_vps():
         monitoring_fee = 10_000
         unit_label = "/bulan"
 
-    vat_price = base_price * 1.11
-    total_price = (base_price + monitoring_fee) * 1.11
+    # This page taxes the monitoring fee too: (base + monitoring) + PPN 11%.
+    vat_price = with_rate(base_price, PPN_RATE_BP, FLOOR)
+    total_price = with_rate(base_price + monitoring_fee, PPN_RATE_BP, FLOOR)
 
     # ------------------------------
     # Display pricing
@@ -108,6 +96,9 @@ def render_cloud_vps():
     st.markdown("### 📄 Ekspor Hasil ke PDF")
 
     if st.button("Export ke PDF"):
+        from reportlab.lib.pagesizes import A4
+        from reportlab.pdfgen import canvas
+
         buffer = BytesIO()
         c = canvas.Canvas(buffer, pagesize=A4)
         width, height = A4
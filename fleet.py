@@ -0,0 +1,150 @@
+"""Fleet estimates: several server roles priced as one deployment.
+
+A fleet is a list of roles (app nodes, database, workers, ...). Each role has
+a node spec (``cpu``, ``ram``, ``storage``, ``variant``), a minimum node
+``count`` and a ``load_share``: the percentage of the page's concurrent
+users the role serves. A role with a load share scales horizontally. One
+node handles the concurrency its spec is rated for in
+``data/spec_load_rules.csv`` (users per hour x session seconds / 3600,
+rounded up like ``get_concurrent_users``), so the role runs
+``max(count, ceil(share / node capacity))`` nodes. Roles with a zero share
+keep their count.
+
+All roles are sized and priced in one vectorized pass (``pricing_batch``),
+then the fleet's monthly price goes through ``pricing.price_breakdown``
+once. Buffer, monitoring 4% and PPN 11% therefore apply to the fleet
+subtotal together with the shared object storage, domains and security
+scan, and a fleet of one fixed node prices exactly like ``pricing.quote``.
+"""
+import numpy as np
+
+from capacity import SECONDS_PER_HOUR
+from catalog import get_cloud_vps_coefficients, get_spec_load_rules
+from limits import CPU_LIMITS, RAM_LIMITS, STORAGE_LIMITS
+from pricing import price_breakdown
+from pricing_batch import calculate_cloud_vps_batch, variant_indices
+
+ROLE_COUNT_LIMITS = (0, 1000)
+LOAD_SHARE_LIMITS = (0, 100)
+ROLE_DEFAULTS = {"count": 1, "cpu": CPU_LIMITS[0], "ram": RAM_LIMITS[0], "storage": STORAGE_LIMITS[0], "load_share": 0}
+# (field, limits, label) checked for every role.
+ROLE_LIMITS = (
+    ("count", ROLE_COUNT_LIMITS, "Node minimum"),
+    ("cpu", CPU_LIMITS, "CPU"),
+    ("ram", RAM_LIMITS, "RAM (GB)"),
+    ("storage", STORAGE_LIMITS, "Storage (GB)"),
+    ("load_share", LOAD_SHARE_LIMITS, "Beban (%)"),
+)
+ROLE_LABELS = {field: label for field, _, label in ROLE_LIMITS}
+# A typical three-tier deployment; ``variant`` is filled in by the caller.
+DEFAULT_FLEET_ROLES = (
+    {"name": "App", "count": 2, "cpu": 2, "ram": 4, "storage": 40, "load_share": 100},
+    {"name": "Database", "count": 1, "cpu": 4, "ram": 8, "storage": 200, "load_share": 0},
+    {"name": "Worker", "count": 1, "cpu": 2, "ram": 4, "storage": 40, "load_share": 0},
+)
+
+
+def _is_blank(value) -> bool:
+    # Rows added in a data editor come back with None (or NaN) in untouched cells.
+    return value is None or value != value or value == ""
+
+
+def _whole_number(value) -> int:
+    """``value`` as an int; a fractional number is rejected rather than truncated."""
+    number = int(value)
+    if not isinstance(value, str) and number != value:
+        raise ValueError(value)
+    return number
+
+
+def role_columns(roles, coefficients: dict) -> dict:
+    """Validate ``roles`` and return their fields as columns (int64 arrays, plus names and variants)."""
+    if not roles:
+        raise ValueError("Armada harus berisi minimal satu role.")
+    names, variants = [], []
+    columns = {field: [] for field in ROLE_DEFAULTS}
+    for position, role in enumerate(roles, 1):
+        name = role.get("name")
+        name = f"Role {position}" if _is_blank(name) else str(name)
+        names.append(name)
+        variant = role.get("variant")
+        if _is_blank(variant):
+            raise ValueError(f"{name}: pilih tipe CPU.")
+        if variant not in coefficients:
+            raise ValueError(f"{name}: tipe CPU tidak dikenal: {variant}.")
+        variants.append(variant)
+        for field, default in ROLE_DEFAULTS.items():
+            value = role.get(field)
+            try:
+                columns[field].append(default if _is_blank(value) else _whole_number(value))
+            except (TypeError, ValueError, OverflowError):
+                raise ValueError(f"{name}: {ROLE_LABELS[field]} harus berupa bilangan bulat.") from None
+
+    arrays = {field: np.asarray(values, dtype=np.int64) for field, values in columns.items()}
+    for field, (low, high), label in ROLE_LIMITS:
+        values = arrays[field]
+        invalid = np.flatnonzero((values < low) | (values > high))
+        if invalid.size:
+            raise ValueError(f"{names[invalid[0]]}: {label} harus di antara {low} dan {high}.")
+    return {"name": names, "variant": variants, **arrays}
+
+
+def scale_roles(count, cpu, ram, load_share, concurrent: int, rules=None) -> dict:
+    """Nodes per role for ``concurrent`` users, with each node's rated concurrency.
+
+    ``assigned_concurrency`` is the role's share of ``concurrent`` and
+    ``per_node_concurrency`` what each of its nodes ends up serving.
+    """
+    rules = rules if rules is not None else get_spec_load_rules()
+    users_per_hour, session_seconds = rules.load_for_batch(cpu, ram)
+    node_capacity = np.maximum(-(-(users_per_hour * session_seconds) // SECONDS_PER_HOUR), 1)
+    assigned = -(-(int(concurrent) * np.asarray(load_share, dtype=np.int64)) // 100)
+    nodes = np.maximum(np.asarray(count, dtype=np.int64), -(-assigned // node_capacity))
+    return {
+        "node_capacity": node_capacity,
+        "assigned_concurrency": assigned,
+        "nodes": nodes,
+        "per_node_concurrency": -(-assigned // np.maximum(nodes, 1)),
+    }
+
+
+def quote_fleet(roles, inputs: dict, concurrent: int = 0, coefficients: dict | None = None, rules=None) -> dict:
+    """Price a fleet and return ``pricing.price_breakdown`` for it plus one row per role.
+
+    ``inputs`` carries the shared part of the estimate with the keys of
+    ``pricing.quote`` (object storage, duration, domains, buffer and
+    security-scan settings); the per-server keys are ignored. Each role row
+    has its spec, node counts (see ``scale_roles``), ``node_monthly_price``,
+    ``monthly_price`` (all its nodes) and ``base_price`` over the duration.
+    """
+    coefficients = coefficients if coefficients is not None else get_cloud_vps_coefficients()
+    columns = role_columns(roles, coefficients)
+    scaled = scale_roles(columns["count"], columns["cpu"], columns["ram"], columns["load_share"], concurrent, rules)
+    node_monthly_price = calculate_cloud_vps_batch(
+        columns["cpu"],
+        columns["ram"],
+        columns["storage"],
+        variant_indices(columns["variant"], list(coefficients)),
+        coefficients,
+    )
+    monthly_price = node_monthly_price * scaled["nodes"]
+    breakdown = price_breakdown(int(monthly_price.sum()), inputs)
+
+    per_role = {
+        **{field: columns[field].tolist() for field in ROLE_DEFAULTS},
+        **{field: values.tolist() for field, values in scaled.items()},
+        "node_monthly_price": node_monthly_price.tolist(),
+        "monthly_price": monthly_price.tolist(),
+        "base_price": (monthly_price * breakdown["duration_months"]).tolist(),
+    }
+    fields = list(per_role)
+    role_rows = [
+        {"name": name, "variant": variant, **dict(zip(fields, values))}
+        for name, variant, *values in zip(columns["name"], columns["variant"], *per_role.values())
+    ]
+    return {
+        **breakdown,
+        "concurrent": int(concurrent),
+        "node_count": int(scaled["nodes"].sum()),
+        "roles": role_rows,
+    }
@@ -1,14 +1,48 @@
-import json
+import os
 import streamlit as st
-from io import BytesIO
 from datetime import datetime
-from reportlab.lib.pagesizes import A4, landscape
-from reportlab.pdfgen import canvas
-from reportlab.lib.units import cm
+from io import TextIOWrapper
+
+from pricing import (
+    DOMAIN_ACTION_OPTIONS,
+    OBJECT_STORAGE_PER_GB_HOUR,
+    OBJECT_STORAGE_PER_GB_MONTH,
+    SECURITY_SCAN_PER_PROJECT_MONTH,
+    VPS_RESERVE_MONTHS_PER_YEAR,
+    DomainList,
+    get_concurrent_users,
+    get_load_from_specs,
+    get_specs_from_concurrency,
+    parse_domain_import,
+    recommend_from_concurrency,
+)
+from report import get_pdf_report, pdf_cache_key
+from catalog import catalog_stats, get_cloud_vps_coefficients
+from cost_graph import CostGraph
+from limits import (
+    CPU_LIMITS,
+    DURATION_LIMITS,
+    OBJECT_STORAGE_LIMITS,
+    OBJECT_STORAGE_STEP,
+    RAM_LIMITS,
+    STORAGE_LIMITS,
+    STORAGE_STEP,
+)
+from optimizer import cheapest_options
+from profiling import PROFILE_QUERY_PARAM, RerunHistory, profiling_enabled
+from capacity import parse_hourly_profile, profile_stats
 
 # ----------------------------
 # Page setup
 # ----------------------------
+if "profile_history" not in st.session_state:
+    st.session_state["profile_history"] = RerunHistory()
+profile_history = st.session_state["profile_history"]
+profiler = profile_history.start(
+    profiling_enabled(st.query_params.get(PROFILE_QUERY_PARAM)),
+    capture_cprofile=st.session_state.get("profile_capture_cprofile", False),
+)
+profiler.mark("Page config & CSS")
 st.set_page_config(page_title="IDCloudHost Calculator", page_icon="💰", layout="wide")
 st.markdown(
     """
@@ -36,146 +70,6 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
-# ----------------------------
-# Pricing & Logic
-# ----------------------------
-def calculate_cloud_vps(cpu: int, ram: int, storage: int, coef: dict) -> int:
-    per_hour = (
-        (cpu * coef["cpuram1"] if cpu <= 2 else cpu * coef["cpuram2"])
-        + (ram * coef["cpuram1"] if ram <= 2 else ram * coef["cpuram2"])
-        + (storage * coef["storage1"] if storage < 81 else storage * coef["storage2"])
-    )
-    per_month = per_hour * 730
-    return int(1000 * round(per_month / 1000))
-
-def ceil_div(a: int, b: int) -> int:
-    return (a + b - 1) // b
-
-def get_specs_from_concurrency(concurrent: int):
-    """Logic mapping for sync: CU -> (CPU, RAM)"""
-    if concurrent <= 20:
-        return 1, 2
-    elif concurrent <= 60:
-        return 2, 4
-    elif concurrent <= 150:
-        return 4, 8
-    elif concurrent <= 400:
-        return 8, 16
-    else:
-        return 8, 32
-
-SPEC_LOAD_RULES = [
-    {"cpu": 1, "ram": 1, "users_per_hour": 600, "session_seconds": 60},
-    {"cpu": 1, "ram": 2, "users_per_hour": 1200, "session_seconds": 60},
-    {"cpu": 2, "ram": 4, "users_per_hour": 3600, "session_seconds": 60},
-    {"cpu": 4, "ram": 8, "users_per_hour": 9000, "session_seconds": 60},
-    {"cpu": 8, "ram": 16, "users_per_hour": 36000, "session_seconds": 40},
-    {"cpu": 8, "ram": 32, "users_per_hour": 45000, "session_seconds": 40},
-]
-
-def get_load_from_specs(cpu: int, ram: int) -> tuple[int, int]:
-    """Estimate traffic inputs from the selected CPU/RAM."""
-    matching_rules = [
-        rule for rule in SPEC_LOAD_RULES
-        if cpu >= rule["cpu"] and ram >= rule["ram"]
-    ]
-    selected = matching_rules[-1] if matching_rules else SPEC_LOAD_RULES[0]
-    return selected["users_per_hour"], selected["session_seconds"]
-
-def recommend_from_concurrency(concurrent: int) -> str:
-    cpu, ram = get_specs_from_concurrency(concurrent)
-    suffix = " (atau lebih)" if concurrent > 400 else ""
-    return f"{cpu} vCPU / {ram} GB RAM{suffix}"
-
-# ----------------------------
-# Additional Cost Config
-# ----------------------------
-OBJECT_STORAGE_PER_GB_MONTH = 507
-OBJECT_STORAGE_PER_GB_HOUR = 0.694
-SECURITY_SCAN_PER_PROJECT_MONTH = 100_000
-DEFAULT_DOMAIN_PRICE_YEARLY = 300_000
-VPS_RESERVE_MONTHS_PER_YEAR = 2
-MONTHS_PER_YEAR = 12
-DOMAIN_ACTION_OPTIONS = ["Register", "Renewal", "Transfer"]
-DOMAIN_PRICES_YEARLY = {
-    ".my.id": {"Register": 25_000, "Renewal": 25_000, "Transfer": 25_000},
-    ".biz.id": {"Register": 55_000, "Renewal": 55_000, "Transfer": 55_000},
-    ".ponpes.id": {"Register": 55_000, "Renewal": 55_000, "Transfer": 55_000},
-    ".sch.id": {"Register": 55_000, "Renewal": 55_000, "Transfer": 55_000},
-    ".ac.id": {"Register": 55_000, "Renewal": 100_000, "Transfer": 55_000},
-    ".or.id": {"Register": 55_000, "Renewal": 55_000, "Transfer": 55_000},
-    ".web.id": {"Register": 55_000, "Renewal": 55_000, "Transfer": 55_000},
-    ".id": {"Register": 210_000, "Renewal": 210_000, "Transfer": 210_000},
-    ".co.id": {"Register": 270_000, "Renewal": 300_000, "Transfer": 300_000},
-    ".net.id": {"Register": 400_000, "Renewal": 400_000, "Transfer": 400_000},
-    ".top": {"Register": 121_000, "Renewal": 121_000, "Transfer": 121_000},
-    ".xyz": {"Register": 292_000, "Renewal": 292_000, "Transfer": 292_000},
-    ".asia": {"Register": 235_000, "Renewal": 235_000, "Transfer": 235_000},
-    ".icu": {"Register": 287_300, "Renewal": 287_300, "Transfer": 287_300},
-    ".com": {"Register": 160_000, "Renewal": 185_000, "Transfer": 185_000},
-    ".click": {"Register": 190_000, "Renewal": 190_000, "Transfer": 190_000},
-    ".net": {"Register": 295_000, "Renewal": 295_000, "Transfer": 295_000},
-    ".org": {"Register": 230_000, "Renewal": 230_000, "Transfer": 230_000},
-    ".info": {"Register": 451_000, "Renewal": 451_000, "Transfer": 451_000},
-    ".vip": {"Register": 311_000, "Renewal": 311_000, "Transfer": 311_000},
-    ".website": {"Register": 640_000, "Renewal": 640_000, "Transfer": 640_000},
-    ".pw": {"Register": 415_000, "Renewal": 415_000, "Transfer": 415_000},
-    ".space": {"Register": 640_000, "Renewal": 640_000, "Transfer": 640_000},
-    ".co": {"Register": 641_000, "Renewal": 641_000, "Transfer": 641_000},
-    ".site": {"Register": 721_000, "Renewal": 721_000, "Transfer": 721_000},
-    ".com.sg": {"Register": 800_000, "Renewal": 800_000, "Transfer": 800_000},
-    ".design": {"Register": 1_150_000, "Renewal": 1_150_000, "Transfer": 1_150_000},
-    ".io": {"Register": 1_500_000, "Renewal": 1_500_000, "Transfer": 1_500_000},
-}
-
-def get_domain_extension(domain_name: str) -> str:
-    normalized = domain_name.strip().lower()
-    for extension in sorted(DOMAIN_PRICES_YEARLY, key=len, reverse=True):
-        if normalized.endswith(extension):
-            return extension
-    return "Lainnya"
-
-def get_domain_yearly_price(extension: str, action: str) -> int:
-    if extension not in DOMAIN_PRICES_YEARLY:
-        return DEFAULT_DOMAIN_PRICE_YEARLY
-    return DOMAIN_PRICES_YEARLY[extension].get(action, DEFAULT_DOMAIN_PRICE_YEARLY)
-
-def get_domain_period_price(domain: dict, duration_months: int) -> int:
-    yearly_price = int(domain.get("price_yearly", 0))
-    return int(round(yearly_price * duration_months / MONTHS_PER_YEAR))
-
-def get_buffer_months(duration_months: int) -> float:
-    """Scale the two-month annual VPS buffer to the application duration."""
-    return duration_months * VPS_RESERVE_MONTHS_PER_YEAR / MONTHS_PER_YEAR
-
-def format_duration_months(months: float) -> str:
-    if months >= 1:
-        return f"{months:g} bulan"
-
-    weeks = months * 4
-    rounded_weeks = round(weeks, 1)
-    return f"{rounded_weeks:g} minggu"
-
-def normalize_domain_entry(domain_entry):
-    if isinstance(domain_entry, dict):
-        domain_name = domain_entry.get("name", "").strip()
-        action = domain_entry.get("action", "Register")
-    else:
-        domain_name = str(domain_entry).strip()
-        action = "Register"
-
-    if action not in DOMAIN_ACTION_OPTIONS:
-        action = "Register"
-
-    extension = get_domain_extension(domain_name)
-    price = get_domain_yearly_price(extension, action)
-    return {
-        "name": domain_name,
-        "extension": extension,
-        "action": action,
-        "price_yearly": price,
-    }
-
 # ----------------------------
 # Presets Data
 # ----------------------------
@@ -191,6 +85,43 @@ PRESETS = [
 PRESET_MAP = {p["key"]: p for p in PRESETS}
 RADIO_OPTIONS = [f'{p["key"]}: {p["desc"]} ({p["label"]})' for p in PRESETS] + [CUSTOM_KEY]
 
+DOMAIN_PAGE_SIZE = 25
+ALL_EXTENSIONS_KEY = "Semua ekstensi"
+# Breakdown keys the PDF takes from the fleet quote in fleet mode.
+FLEET_PDF_KEYS = (
+    "base_price",
+    "vps_buffer_price",
+    "object_storage_price",
+    "security_scan_price",
+    "pre_tax_subtotal",
+    "monitoring_fee",
+    "tax_fee",
+    "total_price",
+)
+# Toggles of the analysis sections; their results depend on the whole estimate.
+ANALYSIS_TOGGLES = ("fleet_enabled", "sweep_enabled", "optimizer_enabled")
+# Estimate inputs the optimizer prices every option with, besides the server itself.
+OPTIMIZER_INPUT_KEYS = (
+    "object_storage_gb",
+    "domains",
+    "include_vps_buffer",
+    "include_security_scan",
+    "security_scan_monthly_price",
+)
+SWEEP_MODES = ["Durasi", "Object Storage", "Keduanya"]
+SWEEP_STORAGE_STEPS = [10, 50, 100, 250, 500, 1000]
+SWEEP_MAX_CHART_LINES = 25
+SWEEP_COMPONENT_LABELS = {
+    "base_price": "VPS dasar",
+    "vps_buffer_price": "Buffer",
+    "object_storage_price": "Object storage",
+    "domain_price": "Domain",
+    "monitoring_fee": "Monitoring 4%",
+    "tax_fee": "PPN 11%",
+    "security_scan_price": "Security scan",
+    "total_price": "Total",
+}
+
 def preset_key_from_radio(radio_value: str) -> str:
     if radio_value == CUSTOM_KEY: return CUSTOM_KEY
     return radio_value.split(":", 1)[0].strip()
@@ -217,8 +148,9 @@ def sync_sliders_to_load():
     """Triggered when users manually change traffic numbers"""
     u_hour = st.session_state.get("users_per_hour", 0)
     s_sec = st.session_state.get("session_seconds", 0)
-    concurrent = ceil_div(int(u_hour * s_sec), 3600)
-    
+    apply_specs_for_concurrency(get_concurrent_users(u_hour, s_sec))
+
+def apply_specs_for_concurrency(concurrent: int):
     # Auto-adjust hardware based on load
     new_cpu, new_ram = get_specs_from_concurrency(concurrent)
     st.session_state["cpu"] = new_cpu
@@ -229,6 +161,14 @@ def sync_sliders_to_load():
     # Switch radio to custom because we are departing from fixed presets
     st.session_state["preset_radio"] = CUSTOM_KEY
 
+def apply_access_log_summary():
+    """Copy the traffic measured from an uploaded access log into the traffic inputs."""
+    summary = st.session_state["access_log_summary"]["summary"]
+    st.session_state["users_per_hour"] = summary["users_per_hour"]
+    st.session_state["session_seconds"] = summary["session_seconds"]
+    st.session_state["traffic_profile_text"] = ", ".join(map(str, summary["hourly_profile"]))
+    sync_sliders_to_load()
+
 def auto_switch_to_custom():
     """Triggered when sliders are moved manually"""
     st.session_state["preset_radio"] = CUSTOM_KEY
@@ -277,11 +217,18 @@ def on_object_storage_manual_change():
     auto_switch_to_custom()
     st.session_state["object_storage_gb"] = st.session_state["object_storage_gb_manual"]
 
+def get_domains() -> DomainList:
+    """The session's domains, upgrading a plain list of dicts if one was stored."""
+    domains = st.session_state.get("domains")
+    if not isinstance(domains, DomainList):
+        domains = st.session_state["domains"] = DomainList(domains or ())
+    return domains
+
 def set_domain_action(index: int, action: str):
-    domains = [normalize_domain_entry(domain) for domain in st.session_state.get("domains", [])]
-    if 0 <= index < len(domains):
-        domains[index] = normalize_domain_entry({"name": domains[index]["name"], "action": action})
-        st.session_state["domains"] = domains
+    get_domains().set_action(index, action)
+
+def set_domains_action_by_extension(extension: str, action: str):
+    get_domains().set_action_by_extension(None if extension == ALL_EXTENSIONS_KEY else extension, action)
 
 def set_new_domain_action(action: str):
     st.session_state["new_domain_action"] = action
@@ -291,151 +238,79 @@ def add_domain():
     if not domain_name:
         return
 
-    domains = st.session_state.setdefault("domains", [])
     action = st.session_state.get("new_domain_action", "Register")
-    domain_entry = normalize_domain_entry({"name": domain_name, "action": action})
-    if not any(normalize_domain_entry(existing)["name"].lower() == domain_name.lower() for existing in domains):
-        domains.append(domain_entry)
+    # Skips names already in the list; only the new entry is normalized.
+    get_domains().add({"name": domain_name, "action": action})
     st.session_state["domain_name_input"] = ""
 
-def remove_domain(index: int):
-    domains = st.session_state.get("domains", [])
-    if 0 <= index < len(domains):
-        st.session_state["domains"] = domains[:index] + domains[index + 1:]
+def import_domains():
+    domains = get_domains()
+    default_action = st.session_state.get("new_domain_action", "Register")
+    existing_names = domains.names
 
-# ----------------------------
-# PDF Export
-# ----------------------------
-def build_pdf_report(data: dict) -> bytes:
-    buf = BytesIO()
-    page_size = landscape(A4)
-    c = canvas.Canvas(buf, pagesize=page_size)
-    width, height = page_size
-
-    margin_x = 2 * cm
-    top_y = height - 2 * cm
-
-    # Column positions (label/value)
-    label_x = margin_x
-    value_x = margin_x + 8.5 * cm  # adjust to taste for alignment
-    right_x = width - margin_x
-
-    # ---- Header
-    c.setFont("Helvetica-Bold", 16)
-    c.drawString(margin_x, top_y, "DATA LAB INDONESIA (DLI)")
-
-    c.setFont("Helvetica", 10)
-    c.drawString(margin_x, top_y - 16, "Estimasi spesifikasi dan biaya infrastruktur digital")
-
-    c.setFont("Helvetica", 10)
-    c.drawRightString(right_x, top_y, f"Tanggal Export: {data['exported_at_str']}")
-
-    # Divider line
-    c.setLineWidth(1)
-    c.line(margin_x, top_y - 28, right_x, top_y - 28)
-
-    y = top_y - 55
-
-    def section(title: str):
-        nonlocal y
-        c.setFont("Helvetica-Bold", 13)
-        c.drawString(margin_x, y, title)
-        y -= 18
-
-    def row(label: str, value: str):
-        """One neat label-value row, like the screenshot."""
-        nonlocal y
-        c.setFont("Helvetica-Bold", 11)
-        c.drawString(label_x, y, label)
-        c.setFont("Helvetica", 11)
-        c.drawString(value_x, y, str(value))
-        y -= 16
-
-    # ---- Section 1: Ringkasan Estimasi & Beban
-    section("Ringkasan Estimasi & Beban")
-
-    row("Preset", data.get("preset_label", "—"))
-    row("User per Jam", f"{int(data.get('users_per_hour', 0)):,}")
-    row("Durasi Sesi", f"{int(data.get('session_seconds', 0))} detik")
-    row("Concurrent Users", f"~{int(data.get('concurrent_users', 0)):,}")
-
-    y -= 8
-
-    # ---- Section 2: Konfigurasi & Biaya
-    section("Konfigurasi & Biaya")
-
-    cpu = data.get("cpu", 0)
-    ram = data.get("ram", 0)
-    storage = data.get("storage", 0)
-    row("CPU / RAM / Disk", f"{cpu} vCPU / {ram} GB / {storage} GB")
-
-    object_storage_gb = data.get("object_storage_gb", 0)
-    row("Object Storage", f"{object_storage_gb} GB")
-
-    row("Tipe CPU", data.get("cpu_type", "—"))
-    row("Durasi Aplikasi", f"{int(data.get('duration_months', 1))} bulan")
-    domains = [normalize_domain_entry(domain) for domain in data.get("domains", [])]
-    domain_label = ", ".join(
-        f"{domain['name']} ({domain['action']}, {domain['extension']})"
-        for domain in domains
-    ) if domains else "Tidak ada"
-    row("Domain", domain_label)
-
-    row("Biaya VPS Dasar", f"Rp {int(data.get('base_price', 0)):,}{data.get('unit_label', '')}")
-    if data.get("include_vps_buffer", True):
-        row(
-            f"Buffer {data.get('buffer_duration_label', '—')}",
-            f"Rp {int(data.get('vps_buffer_price', 0)):,}{data.get('unit_label', '')}",
-        )
-    else:
-        row("Buffer Server", "Tidak aktif")
-    row("Biaya Object Storage", f"Rp {int(data.get('object_storage_price', 0)):,}{data.get('unit_label', '')}")
-    if domains:
-        for domain in domains:
-            domain_period_price = get_domain_period_price(domain, int(data.get("duration_months", 1)))
-            row(f"Domain {domain['name']}", f"Rp {domain_period_price:,}{data.get('unit_label', '')}")
-    else:
-        row("Biaya Domain", f"Rp {int(data.get('domain_price', 0)):,}{data.get('unit_label', '')}")
-    row("Subtotal Pra-Pajak", f"Rp {int(data.get('pre_tax_subtotal', 0)):,}{data.get('unit_label', '')}")
-    row("Monitoring (4%)", f"Rp {int(data.get('monitoring_fee', 0)):,}{data.get('unit_label', '')}")
-    row("PPN (11%)", f"Rp {int(data.get('tax_fee', 0)):,}{data.get('unit_label', '')}")
-    if data.get("include_security_scan", True):
-        row(
-            "Security Scan",
-            f"Rp {int(data.get('security_scan_price', 0)):,}{data.get('unit_label', '')} "
-            f"(Rp {int(data.get('security_scan_monthly_price', 0)):,}/bulan)",
+    imported, rejected = parse_domain_import(
+        st.session_state.get("domain_bulk_text", ""), default_action, existing_names
+    )
+    uploaded_file = st.session_state.get("domain_bulk_file")
+    if uploaded_file is not None:
+        uploaded_file.seek(0)
+        lines = TextIOWrapper(uploaded_file, encoding="utf-8-sig", errors="replace")
+        file_imported, file_rejected = parse_domain_import(
+            lines, default_action, [*existing_names, *(domain["name"] for domain in imported)]
         )
-    else:
-        row("Security Scan", "Tidak aktif")
-
-    total_price = int(data.get("total_price", 0))
-    unit_label = data.get("unit_label", "")
-    row("Total (Final)", f"Rp {total_price:,}{unit_label}")
+        # Detach so the wrapper does not close Streamlit's upload buffer.
+        lines.detach()
+        imported += file_imported
+        rejected += [{**item, "text": f"{uploaded_file.name}: {item['text']}"} for item in file_rejected]
 
-    y -= 10
-    
-    # Footer (subtle)
-    c.setLineWidth(0.5)
-    c.setStrokeColorRGB(0.75, 0.75, 0.75)
-    c.line(margin_x, 2.2 * cm, right_x, 2.2 * cm)
+    domains.extend_normalized(imported)
+    st.session_state["domain_import_report"] = {"added": len(imported), "rejected": rejected}
+    st.session_state["domain_bulk_text"] = ""
 
-    c.setFillColorRGB(0.2, 0.2, 0.2)
-    c.setFont("Helvetica", 9)
-    c.drawString(margin_x, 1.7 * cm, "by Data Lab Indonesia")
-    c.drawRightString(right_x, 1.7 * cm, "Generated via DLI Smart Estimator")
-
-    c.showPage()
-    c.save()
-    return buf.getvalue()
+def remove_domain(index: int):
+    remove_domains([index])
+
+def remove_domains(indices):
+    get_domains().remove(indices)
+
+def apply_domain_table_edits():
+    """Apply action changes and deletions from the current domain table page."""
+    editor_key = f"domain_editor_{st.session_state.get('domain_editor_version', 0)}"
+    edited_rows = st.session_state.get(editor_key, {}).get("edited_rows", {})
+    page_indices = st.session_state.get("domain_page_indices", [])
+    to_remove = []
+    for row_position, changes in edited_rows.items():
+        row_position = int(row_position)
+        if row_position >= len(page_indices):
+            continue
+        index = page_indices[row_position]
+        if changes.get("Jenis"):
+            set_domain_action(index, changes["Jenis"])
+        if changes.get("Hapus"):
+            to_remove.append(index)
+    if to_remove:
+        remove_domains(to_remove)
+    # A fresh editor key drops the applied edits from widget state.
+    st.session_state["domain_editor_version"] = st.session_state.get("domain_editor_version", 0) + 1
+
+def apply_bulk_domain_action():
+    set_domains_action_by_extension(
+        st.session_state.get("domain_bulk_extension", ALL_EXTENSIONS_KEY),
+        st.session_state.get("domain_bulk_action", DOMAIN_ACTION_OPTIONS[0]),
+    )
+    st.session_state["domain_editor_version"] = st.session_state.get("domain_editor_version", 0) + 1
 
+def analysis_shown() -> bool:
+    """Whether the analysis fragment shows results computed from the estimate."""
+    return "pdf_export" in st.session_state or any(st.session_state.get(key) for key in ANALYSIS_TOGGLES)
 
 # ----------------------------
 # Main UI
 # ----------------------------
+profiler.mark("Catalog & session state")
 st.title("Estimasi spesifikasi dan biaya infrastruktur digital")
 
-with open("data/cloud_vps_coeff.json") as f:
-    cloud_vps_data = json.load(f)
+cloud_vps_data = get_cloud_vps_coefficients()
 
 if "users_per_hour" not in st.session_state:
     st.session_state["users_per_hour"] = PRESETS[0]["capacity_users"]
@@ -452,7 +327,7 @@ if "users_per_hour" not in st.session_state:
     st.session_state["include_vps_buffer"] = True
     st.session_state["include_security_scan"] = True
     st.session_state["security_scan_monthly_price"] = SECURITY_SCAN_PER_PROJECT_MONTH
-    st.session_state["domains"] = []
+    st.session_state["domains"] = DomainList()
     st.session_state["new_domain_action"] = "Register"
 
 if "new_domain_action" not in st.session_state:
@@ -470,11 +345,13 @@ if "duration_months" not in st.session_state:
 if "include_vps_buffer" not in st.session_state:
     st.session_state["include_vps_buffer"] = True
 
+profiler.mark("Preset radio")
 with st.expander("📁 1. Pilih Preset Infrastruktur", expanded=True):
     st.markdown('<div class="preset-radio">', unsafe_allow_html=True)
     st.radio(" ", RADIO_OPTIONS, key="preset_radio", label_visibility="collapsed", on_change=apply_preset_to_sliders)
     st.markdown("</div>", unsafe_allow_html=True)
 
+profiler.mark("Traffic & recommendation")
 with st.expander("📊 2. Beban Aplikasi (Estimasi Trafik)", expanded=True):
     c1, c2 = st.columns(2)
     with c1:
@@ -482,188 +359,654 @@ with st.expander("📊 2. Beban Aplikasi (Estimasi Trafik)", expanded=True):
     with c2:
         s_sec = st.number_input("Durasi Sesi (detik):", min_value=1, key="session_seconds", on_change=sync_sliders_to_load)
     
-    concurrent = ceil_div(int(u_hour * s_sec), 3600)
+    concurrent = get_concurrent_users(u_hour, s_sec)
+    concurrency_label = f"~{concurrent} concurrent users"
+    st.toggle(
+        "Gunakan profil trafik per jam",
+        key="traffic_profile_enabled",
+        help="Isi user per jam untuk 24 jam (atau 168 jam seminggu). Rekomendasi memakai jam tersibuk, bukan rata-rata.",
+    )
+    if st.session_state.traffic_profile_enabled:
+        profile_text = st.text_area(
+            "User per jam (24 atau 168 angka, dipisah koma/spasi)",
+            key="traffic_profile_text",
+            placeholder="contoh: 50, 40, 30, ..., 3600, 4200, ...",
+        )
+        if not profile_text.strip():
+            st.caption("Durasi sesi di atas dipakai untuk setiap jam.")
+        else:
+            try:
+                hourly_users = parse_hourly_profile(profile_text)
+            except ValueError as exc:
+                st.warning(str(exc))
+            else:
+                profile = profile_stats(hourly_users, s_sec)
+                concurrent = int(profile["peak"])
+                concurrency_label = f"puncak ~{concurrent} concurrent users"
+                p1, p2, p3 = st.columns(3)
+                p1.metric("Concurrent puncak", f"{concurrent:,}")
+                p2.metric("Concurrent p95", f"{int(profile['p95']):,}")
+                p3.metric("Concurrent rata-rata", f"{float(profile['mean']):,.1f}")
+                st.bar_chart(
+                    {"Jam": list(range(len(hourly_users))), "Concurrent users": profile["concurrency"].tolist()},
+                    x="Jam",
+                    y="Concurrent users",
+                )
+                st.button(
+                    "Terapkan rekomendasi puncak ke spesifikasi",
+                    on_click=apply_specs_for_concurrency,
+                    args=(concurrent,),
+                )
+    st.toggle(
+        "Turunkan dari access log",
+        key="access_log_enabled",
+        help="Unggah access log nginx/Apache (combined format, boleh .gz) untuk mengukur user per jam dan durasi sesi.",
+    )
+    if st.session_state.access_log_enabled:
+        l1, l2 = st.columns([3, 1])
+        with l1:
+            log_file = st.file_uploader("Access log", type=["log", "txt", "gz"], key="access_log_file")
+        with l2:
+            idle_minutes = st.number_input(
+                "Batas idle sesi (menit)", min_value=1, max_value=240, value=30, key="access_log_idle_minutes"
+            )
+        st.caption("Untuk log berukuran GB, jalankan `python access_log.py access.log.gz` dan isi hasilnya di atas.")
+        if log_file is not None:
+            # Parsed once per upload and timeout; reruns reuse the summary.
+            cache_key = (log_file.file_id, idle_minutes)
+            cached = st.session_state.get("access_log_summary")
+            if cached is None or cached["key"] != cache_key:
+                from access_log import summarize_access_logs
+
+                log_file.seek(0)
+                cached = {"key": cache_key, "summary": summarize_access_logs(log_file, idle_minutes * 60)}
+                st.session_state["access_log_summary"] = cached
+            log_summary = cached["summary"]
+            if not log_summary["sessions"]:
+                st.warning(f"Tidak ada baris access log yang dikenali ({log_summary['skipped']:,} baris dilewati).")
+            else:
+                a1, a2, a3, a4 = st.columns(4)
+                a1.metric("User jam tersibuk", f"{log_summary['users_per_hour']:,}")
+                a2.metric("Durasi sesi rata-rata", f"{log_summary['session_seconds']:,} detik")
+                a3.metric("Median sesi", f"{log_summary['session_percentiles']['p50']:,} detik")
+                a4.metric("Concurrent terukur (puncak)", f"{log_summary['peak_concurrency']:,}")
+                st.caption(
+                    f"{log_summary['lines']:,} baris ({log_summary['skipped']:,} dilewati), "
+                    f"{log_summary['sessions']:,} sesi, {log_summary['first_seen']} s.d. {log_summary['last_seen']}. "
+                    f"Saran untuk concurrent terukur: {log_summary['recommendation']}."
+                )
+                st.bar_chart(log_summary["session_histogram"], x="Durasi sesi", y="Sesi", sort=False)
+                st.button(
+                    "Terapkan ke beban aplikasi",
+                    on_click=apply_access_log_summary,
+                    help="Mengisi user per jam, durasi sesi dan profil trafik per jam dari log.",
+                )
     rec_text = recommend_from_concurrency(concurrent)
-    st.markdown(f'<div class="rec-box">💡 Saran: {rec_text} (untuk ~{concurrent} concurrent users)</div>', unsafe_allow_html=True)
+    st.markdown(f'<div class="rec-box">💡 Saran: {rec_text} (untuk {concurrency_label})</div>', unsafe_allow_html=True)
 
+profiler.mark("Spec sliders")
 st.divider()
 
 st.subheader("Customisasi Spesifikasi")
 s1, s2, s3, s4 = st.columns(4)
 with s1:
-    st.slider("CPU (Core)", 1, 32, key="cpu", on_change=on_cpu_slider_change)
+    st.slider("CPU (Core)", *CPU_LIMITS, key="cpu", on_change=on_cpu_slider_change)
 with s2:
-    st.slider("RAM (GB)", 1, 128, key="ram", on_change=on_ram_slider_change)
+    st.slider("RAM (GB)", *RAM_LIMITS, key="ram", on_change=on_ram_slider_change)
 with s3:
-    st.slider("Storage (GB)", 20, 2000, step=10, key="storage", on_change=on_storage_slider_change)
+    st.slider("Storage (GB)", *STORAGE_LIMITS, step=STORAGE_STEP, key="storage", on_change=on_storage_slider_change)
 with s4:
-    st.slider("Object Storage (GB)", 0, 10000, step=10, key="object_storage_gb", on_change=on_object_storage_slider_change)
+    st.slider("Object Storage (GB)", *OBJECT_STORAGE_LIMITS, step=OBJECT_STORAGE_STEP, key="object_storage_gb", on_change=on_object_storage_slider_change)
 
 st.toggle("Manual type override", key="manual_override")
 if st.session_state.manual_override:
     m1, m2, m3, m4 = st.columns(4)
     with m1:
-        st.number_input("CPU (manual)", min_value=1, max_value=32, key="cpu_manual", on_change=on_cpu_manual_change)
+        st.number_input("CPU (manual)", min_value=CPU_LIMITS[0], max_value=CPU_LIMITS[1], key="cpu_manual", on_change=on_cpu_manual_change)
     with m2:
-        st.number_input("RAM (manual)", min_value=1, max_value=128, key="ram_manual", on_change=on_ram_manual_change)
+        st.number_input("RAM (manual)", min_value=RAM_LIMITS[0], max_value=RAM_LIMITS[1], key="ram_manual", on_change=on_ram_manual_change)
     with m3:
-        st.number_input("Storage (manual)", min_value=20, max_value=2000, step=10, key="storage_manual", on_change=on_storage_manual_change)
+        st.number_input("Storage (manual)", min_value=STORAGE_LIMITS[0], max_value=STORAGE_LIMITS[1], step=STORAGE_STEP, key="storage_manual", on_change=on_storage_manual_change)
     with m4:
-        st.number_input("Object Storage (manual)", min_value=0, max_value=10000, step=10, key="object_storage_gb_manual", on_change=on_object_storage_manual_change)
-
-st.subheader("Domain")
-st.write("Jenis domain baru")
-new_domain_action = st.session_state.get("new_domain_action", "Register")
-new_action_cols = st.columns(3)
-for action_index, action in enumerate(DOMAIN_ACTION_OPTIONS):
-    new_action_cols[action_index].button(
-        action,
-        key=f"new_domain_{action.lower()}",
-        on_click=set_new_domain_action,
-        args=(action,),
-        type="primary" if new_domain_action == action else "secondary",
-        use_container_width=True,
+        st.number_input("Object Storage (manual)", min_value=OBJECT_STORAGE_LIMITS[0], max_value=OBJECT_STORAGE_LIMITS[1], step=OBJECT_STORAGE_STEP, key="object_storage_gb_manual", on_change=on_object_storage_manual_change)
+
+# ----------------------------
+# Pricing and analysis fragments
+# ----------------------------
+# Data dependencies between the page sections (session-state keys):
+#   preset radio    writes cpu, ram, storage, users_per_hour, session_seconds
+#   traffic         reads users_per_hour, session_seconds; writes cpu, ram, preset_radio
+#                   (an access log also writes users_per_hour, session_seconds,
+#                   traffic_profile_text)
+#   spec sliders    reads/writes cpu, ram, storage, object_storage_gb (+ *_manual);
+#                   writes users_per_hour, session_seconds, preset_radio
+#   domains         reads/writes domains and the domain_* widget keys
+#   add-ons         reads/writes variant, duration_months, include_vps_buffer,
+#                   include_security_scan, security_scan_monthly_price
+#   cost summary,   read everything above plus concurrent users
+#   fleet, sweep,
+#   optimizer, PDF
+# Preset, traffic and sliders feed each other and every section below, so
+# they run with the full script. Domains, add-ons and the cost summary only
+# read those upstream keys, so they form the pricing fragment: an interaction
+# there re-executes just that function, with the upstream values captured at
+# the last full run. Fleet, sweep, optimizer and PDF form the analysis
+# fragment, which reads the estimate the pricing fragment left in session
+# state ("estimate"), so a domain edit does not rerun them. When one of them
+# shows results and a pricing rerun changed the estimate, the page reruns so
+# those results are not left stale.
+def fragment_profiler(profiler):
+    """The profiler of a fragment: the page's on a full run, a new one on a fragment rerun."""
+    if not profiler.done:
+        return profiler
+    return profile_history.start(
+        profiling_enabled(st.query_params.get(PROFILE_QUERY_PARAM)),
+        capture_cprofile=st.session_state.get("profile_capture_cprofile", False),
+        scope="fragment",
     )
-st.caption(f"Domain baru akan ditambahkan sebagai: {new_domain_action}")
-
-d1, d2 = st.columns([3, 1])
-with d1:
-    st.text_input("Nama domain", placeholder="contoh: datalab.co.id", key="domain_name_input")
-with d2:
-    st.write("")
-    st.button("Tambah Domain", on_click=add_domain, use_container_width=True)
-
-domains = [normalize_domain_entry(domain) for domain in st.session_state.get("domains", [])]
-st.session_state["domains"] = domains
-if domains:
-    st.caption("Pilih Register, Renewal, atau Transfer untuk masing-masing domain.")
-    for index, domain in enumerate(domains):
-        st.markdown(f"**{domain['name']}**")
-        st.caption(f"{domain['extension']} | {domain['action']} | Rp {domain['price_yearly']:,}/tahun")
-        action_cols = st.columns([1, 1, 1, 1])
-        for action_index, action in enumerate(DOMAIN_ACTION_OPTIONS):
-            action_cols[action_index].button(
-                action,
-                key=f"domain_{index}_{action.lower()}",
-                on_click=set_domain_action,
-                args=(index, action),
-                type="primary" if domain["action"] == action else "secondary",
-                use_container_width=True,
-            )
-        action_cols[3].button(
-            "Hapus",
-            key=f"remove_domain_{index}",
-            on_click=remove_domain,
-            args=(index,),
+
+
+@st.fragment
+def render_pricing(profiler):
+    fragment_rerun = profiler.done
+    profiler = fragment_profiler(profiler)
+
+    profiler.mark("Domains")
+    st.subheader("Domain")
+    st.write("Jenis domain baru")
+    new_domain_action = st.session_state.get("new_domain_action", "Register")
+    new_action_cols = st.columns(3)
+    for action_index, action in enumerate(DOMAIN_ACTION_OPTIONS):
+        new_action_cols[action_index].button(
+            action,
+            key=f"new_domain_{action.lower()}",
+            on_click=set_new_domain_action,
+            args=(action,),
+            type="primary" if new_domain_action == action else "secondary",
             use_container_width=True,
         )
-        st.divider()
-else:
-    st.caption("Belum ada domain yang ditambahkan. Tambahkan domain dulu, lalu pilih Register, Renewal, atau Transfer pada domain tersebut.")
-
-variant = st.radio("Tipe CPU", list(cloud_vps_data.keys()), key="variant")
-duration_months = st.number_input(
-    "Durasi aplikasi (bulan)",
-    min_value=1,
-    max_value=120,
-    step=1,
-    key="duration_months",
-    help="Semua biaya bulanan dan buffer akan disesuaikan dengan durasi ini.",
-)
+    st.caption(f"Domain baru akan ditambahkan sebagai: {new_domain_action}")
+
+    d1, d2 = st.columns([3, 1])
+    with d1:
+        st.text_input("Nama domain", placeholder="contoh: datalab.co.id", key="domain_name_input")
+    with d2:
+        st.write("")
+        st.button("Tambah Domain", on_click=add_domain, use_container_width=True)
+
+    with st.expander("📥 Impor domain massal", expanded=False):
+        st.caption(
+            "Satu domain per baris, opsional diikuti jenisnya (Register/Renewal/Transfer), "
+            f"dipisah koma, titik koma, tab, atau spasi. Tanpa jenis, domain ditambahkan sebagai {new_domain_action}."
+        )
+        st.text_area("Tempel daftar domain", placeholder="datalab.co.id,Renewal\ncontoh.com", key="domain_bulk_text")
+        st.file_uploader("Atau unggah file CSV/TXT", type=["csv", "txt"], key="domain_bulk_file")
+        st.button("Impor Domain", on_click=import_domains, use_container_width=True)
 
-st.subheader("Buffer Server")
-st.toggle(
-    "Tambahkan buffer server",
-    key="include_vps_buffer",
-    help="Jika aktif, buffer dihitung proporsional sebesar 2 bulan untuk setiap 12 bulan durasi aplikasi.",
-)
+        import_report = st.session_state.get("domain_import_report")
+        if import_report:
+            st.caption(f"{import_report['added']:,} domain ditambahkan, {len(import_report['rejected']):,} baris ditolak.")
+            if import_report["rejected"]:
+                st.dataframe(import_report["rejected"], hide_index=True, use_container_width=True)
 
-st.subheader("Security Scan")
-sec1, sec2 = st.columns([1, 1])
-with sec1:
-    st.toggle("Tambahkan security scan", key="include_security_scan")
-with sec2:
-    st.number_input(
-        "Biaya security scan per bulan",
-        min_value=0,
-        step=10_000,
-        key="security_scan_monthly_price",
-        disabled=not st.session_state.include_security_scan,
+    domains = get_domains()
+    if domains:
+        st.caption("Ubah kolom Jenis untuk memilih Register, Renewal, atau Transfer, atau centang Hapus untuk menghapus domain.")
+        f1, f2 = st.columns([3, 1])
+        with f1:
+            domain_search = st.text_input("Cari domain", key="domain_search", placeholder="contoh: .co.id")
+        search_text = domain_search.strip().lower()
+        filtered_indices = [
+            index for index, domain in enumerate(domains)
+            if search_text in domain.name.lower()
+        ] if search_text else range(len(domains))
+        page_count = max(1, -(-len(filtered_indices) // DOMAIN_PAGE_SIZE))
+        if st.session_state.get("domain_page", 1) > page_count:
+            st.session_state["domain_page"] = page_count
+        with f2:
+            page = st.number_input("Halaman", min_value=1, max_value=page_count, step=1, key="domain_page")
+        page_indices = list(filtered_indices[(page - 1) * DOMAIN_PAGE_SIZE:page * DOMAIN_PAGE_SIZE])
+        st.session_state["domain_page_indices"] = page_indices
+
+        st.data_editor(
+            [
+                {
+                    "Domain": domains[index].name,
+                    "Ekstensi": domains[index].extension,
+                    "Jenis": domains[index].action,
+                    "Harga / tahun": domains[index].price_yearly,
+                    "Hapus": False,
+                }
+                for index in page_indices
+            ],
+            key=f"domain_editor_{st.session_state.get('domain_editor_version', 0)}",
+            on_change=apply_domain_table_edits,
+            column_config={
+                "Jenis": st.column_config.SelectboxColumn("Jenis", options=DOMAIN_ACTION_OPTIONS, required=True),
+                "Harga / tahun": st.column_config.NumberColumn("Harga / tahun", format="Rp %d"),
+                "Hapus": st.column_config.CheckboxColumn("Hapus"),
+            },
+            disabled=["Domain", "Ekstensi", "Harga / tahun"],
+            hide_index=True,
+            use_container_width=True,
+        )
+        st.caption(
+            f"Menampilkan {len(page_indices):,} dari {len(filtered_indices):,} domain "
+            f"(total {len(domains):,}) — halaman {page} dari {page_count}."
+        )
+
+        b1, b2, b3 = st.columns([2, 2, 1])
+        with b1:
+            st.selectbox(
+                "Ubah jenis untuk ekstensi",
+                [ALL_EXTENSIONS_KEY] + domains.extensions(),
+                key="domain_bulk_extension",
+            )
+        with b2:
+            st.selectbox("Menjadi", DOMAIN_ACTION_OPTIONS, key="domain_bulk_action")
+        with b3:
+            st.write("")
+            st.button("Terapkan", on_click=apply_bulk_domain_action, use_container_width=True)
+    else:
+        st.caption("Belum ada domain yang ditambahkan. Tambahkan domain dulu, lalu pilih Register, Renewal, atau Transfer pada domain tersebut.")
+
+    profiler.mark("Variant, duration & add-ons")
+    variant = st.radio("Tipe CPU", list(cloud_vps_data.keys()), key="variant")
+    duration_months = st.number_input(
+        "Durasi aplikasi (bulan)",
+        min_value=DURATION_LIMITS[0],
+        max_value=DURATION_LIMITS[1],
+        step=1,
+        key="duration_months",
+        help="Semua biaya bulanan dan buffer akan disesuaikan dengan durasi ini.",
     )
 
-coef = cloud_vps_data[variant]
-monthly_base_price = calculate_cloud_vps(st.session_state.cpu, st.session_state.ram, st.session_state.storage, coef)
-duration_months = int(duration_months)
-buffer_months = get_buffer_months(duration_months)
-buffer_duration_label = format_duration_months(buffer_months)
-unit_label = f" ({duration_months} bulan)"
-domains = [normalize_domain_entry(domain) for domain in st.session_state.get("domains", [])]
-security_scan_monthly_price = (
-    int(st.session_state.security_scan_monthly_price)
-    if st.session_state.include_security_scan
-    else 0
-)
-base_price = monthly_base_price * duration_months
-vps_buffer_price = (
-    int(round(monthly_base_price * buffer_months))
-    if st.session_state.include_vps_buffer
-    else 0
-)
-object_storage_price = int(round(
-    st.session_state.object_storage_gb * OBJECT_STORAGE_PER_GB_MONTH * duration_months
-))
-security_scan_price = security_scan_monthly_price * duration_months
-domain_cost_items = [
-    {
-        **domain,
-        "period_price": get_domain_period_price(domain, duration_months),
+    st.subheader("Buffer Server")
+    st.toggle(
+        "Tambahkan buffer server",
+        key="include_vps_buffer",
+        help="Jika aktif, buffer dihitung proporsional sebesar 2 bulan untuk setiap 12 bulan durasi aplikasi.",
+    )
+
+    st.subheader("Security Scan")
+    sec1, sec2 = st.columns([1, 1])
+    with sec1:
+        st.toggle("Tambahkan security scan", key="include_security_scan")
+    with sec2:
+        st.number_input(
+            "Biaya security scan per bulan",
+            min_value=0,
+            step=10_000,
+            key="security_scan_monthly_price",
+            disabled=not st.session_state.include_security_scan,
+        )
+
+    profiler.mark("Cost pipeline")
+    quote_inputs = {
+        "cpu": st.session_state.cpu,
+        "ram": st.session_state.ram,
+        "storage": st.session_state.storage,
+        "object_storage_gb": st.session_state.object_storage_gb,
+        "duration_months": duration_months,
+        "domains": domains,
+        "include_vps_buffer": st.session_state.include_vps_buffer,
+        "include_security_scan": st.session_state.include_security_scan,
+        "security_scan_monthly_price": st.session_state.security_scan_monthly_price,
+        "coef": cloud_vps_data[variant],
     }
-    for domain in domains
-]
-domain_price = sum(domain["period_price"] for domain in domain_cost_items)
-
-pre_tax_subtotal = base_price + vps_buffer_price + object_storage_price + domain_price
-monitoring_fee = int(pre_tax_subtotal * 0.04)
-tax_fee = int((pre_tax_subtotal + monitoring_fee) * 0.11)
-total_price = pre_tax_subtotal + monitoring_fee + tax_fee + security_scan_price
-
-st.markdown(f"""
-    <div style='text-align:center; background:#f0f2f6; padding:20px; border-radius:10px;'>
-        <p style='margin:0;'>💰 <b>Biaya Total (VPS + Object Storage + Domain + Monitoring 4% + PPN 11%)</b></p>
-        <h2 style='margin:0; color:#1f77b4;'>Rp {int(total_price):,}{unit_label}</h2>
-    </div>
-""", unsafe_allow_html=True)
-
-st.caption(
-    f"Tarif Object Storage: Rp {OBJECT_STORAGE_PER_GB_MONTH:,}/GB/bulan "
-    f"(~Rp {OBJECT_STORAGE_PER_GB_HOUR}/GB/jam) | Security Scan opsional: Rp {security_scan_monthly_price:,}/bulan/proyek. "
-    f"Domain mengikuti ekstensi dan jenis domain yang dipilih. "
-    + (
-        f"Buffer server {buffer_duration_label} dihitung proporsional dari durasi aplikasi "
-        f"({VPS_RESERVE_MONTHS_PER_YEAR} bulan buffer per tahun)."
-        if st.session_state.include_vps_buffer
-        else "Buffer server tidak aktif."
+    # The session's cost graph only recomputes the nodes downstream of what changed.
+    if "cost_graph" not in st.session_state:
+        st.session_state["cost_graph"] = CostGraph()
+    cost_graph = st.session_state["cost_graph"]
+    breakdown = cost_graph.update(quote_inputs)
+    duration_months = breakdown["duration_months"]
+    buffer_duration_label = breakdown["buffer_duration_label"]
+    unit_label = breakdown["unit_label"]
+    security_scan_monthly_price = breakdown["security_scan_monthly_price"]
+    base_price = breakdown["base_price"]
+    vps_buffer_price = breakdown["vps_buffer_price"]
+    object_storage_price = breakdown["object_storage_price"]
+    security_scan_price = breakdown["security_scan_price"]
+    domain_cost_items = breakdown["domain_cost_items"]
+    domain_price = breakdown["domain_price"]
+    pre_tax_subtotal = breakdown["pre_tax_subtotal"]
+    monitoring_fee = breakdown["monitoring_fee"]
+    tax_fee = breakdown["tax_fee"]
+    total_price = breakdown["total_price"]
+
+    profiler.mark("Cost summary")
+    st.markdown(f"""
+        <div style='text-align:center; background:#f0f2f6; padding:20px; border-radius:10px;'>
+            <p style='margin:0;'>💰 <b>Biaya Total (VPS + Object Storage + Domain + Monitoring 4% + PPN 11%)</b></p>
+            <h2 style='margin:0; color:#1f77b4;'>Rp {int(total_price):,}{unit_label}</h2>
+        </div>
+    """, unsafe_allow_html=True)
+
+    st.caption(
+        f"Tarif Object Storage: Rp {OBJECT_STORAGE_PER_GB_MONTH:,}/GB/bulan "
+        f"(~Rp {OBJECT_STORAGE_PER_GB_HOUR}/GB/jam) | Security Scan opsional: Rp {security_scan_monthly_price:,}/bulan/proyek. "
+        f"Domain mengikuti ekstensi dan jenis domain yang dipilih. "
+        + (
+            f"Buffer server {buffer_duration_label} dihitung proporsional dari durasi aplikasi "
+            f"({VPS_RESERVE_MONTHS_PER_YEAR} bulan buffer per tahun)."
+            if st.session_state.include_vps_buffer
+            else "Buffer server tidak aktif."
+        )
     )
-)
 
-st.markdown("**Rincian biaya:**")
-st.write(f"- VPS dasar: Rp {int(base_price):,}{unit_label}")
-if st.session_state.include_vps_buffer:
-    st.write(f"- Buffer {buffer_duration_label}: Rp {int(vps_buffer_price):,}{unit_label}")
-else:
-    st.write("- Buffer server: tidak aktif")
-st.write(f"- Object storage: Rp {int(object_storage_price):,}{unit_label}")
-if domain_cost_items:
-    for domain in domain_cost_items:
-        st.write(f"- Domain {domain['name']} ({domain['action']}): Rp {domain['period_price']:,}{unit_label}")
-else:
-    st.write(f"- Domain: Rp 0{unit_label}")
-st.write(f"- Subtotal pra-pajak: Rp {int(pre_tax_subtotal):,}{unit_label}")
-st.write(f"- Monitoring 4%: Rp {int(monitoring_fee):,}{unit_label}")
-st.write(f"- PPN 11%: Rp {int(tax_fee):,}{unit_label}")
-security_scan_label = "aktif" if st.session_state.include_security_scan else "tidak aktif"
-st.write(f"- Security scan ({security_scan_label}, non-pajak): Rp {int(security_scan_price):,}{unit_label}")
+    st.markdown("**Rincian biaya:**")
+    st.write(f"- VPS dasar: Rp {int(base_price):,}{unit_label}")
+    if st.session_state.include_vps_buffer:
+        st.write(f"- Buffer {buffer_duration_label}: Rp {int(vps_buffer_price):,}{unit_label}")
+    else:
+        st.write("- Buffer server: tidak aktif")
+    st.write(f"- Object storage: Rp {int(object_storage_price):,}{unit_label}")
+    if domain_cost_items:
+        for domain in domain_cost_items:
+            st.write(f"- Domain {domain['name']} ({domain['action']}): Rp {domain['period_price']:,}{unit_label}")
+    else:
+        st.write(f"- Domain: Rp 0{unit_label}")
+    st.write(f"- Subtotal pra-pajak: Rp {int(pre_tax_subtotal):,}{unit_label}")
+    st.write(f"- Monitoring 4%: Rp {int(monitoring_fee):,}{unit_label}")
+    st.write(f"- PPN 11%: Rp {int(tax_fee):,}{unit_label}")
+    security_scan_label = "aktif" if st.session_state.include_security_scan else "tidak aktif"
+    st.write(f"- Security scan ({security_scan_label}, non-pajak): Rp {int(security_scan_price):,}{unit_label}")
+
+    estimate_signature = (
+        tuple(value for key, value in quote_inputs.items() if key != "domains"),
+        id(domains),
+        domains.version,
+    )
+    st.session_state["estimate"] = {
+        "variant": variant,
+        "inputs": quote_inputs,
+        "breakdown": breakdown,
+        "signature": estimate_signature,
+    }
+
+    if fragment_rerun:
+        profiler.finish()
+        if analysis_shown() and st.session_state.get("analysis_signature") != estimate_signature:
+            st.rerun()
+
+
+@st.fragment
+def render_analysis(concurrent: int, u_hour: int, s_sec: int, profiler):
+    fragment_rerun = profiler.done
+    profiler = fragment_profiler(profiler)
+
+    estimate = st.session_state["estimate"]
+    st.session_state["analysis_signature"] = estimate["signature"]
+    variant = estimate["variant"]
+    quote_inputs = estimate["inputs"]
+    breakdown = estimate["breakdown"]
+    domains = quote_inputs["domains"]
+    duration_months = breakdown["duration_months"]
+    unit_label = breakdown["unit_label"]
+
+    profiler.mark("Fleet")
+    fleet_quote = None
+    with st.expander("🏗️ Mode Armada (Multi-Server)", expanded=False):
+        st.caption(
+            "Hitung beberapa role server (app, database, worker, ...) sebagai satu deployment. "
+            f"Role dengan beban di atas 0% diskalakan horizontal untuk ~{concurrent} concurrent users; "
+            "object storage, domain, buffer, security scan, monitoring 4% dan PPN 11% dihitung sekali untuk seluruh armada."
+        )
+        # Fleet pricing runs on NumPy, which is only imported once fleet mode is on.
+        if not st.toggle("Aktifkan mode armada", key="fleet_enabled", help="Jika aktif, PDF estimasi memakai armada ini."):
+            st.caption("Aktifkan untuk menyusun armada server.")
+        else:
+            from fleet import DEFAULT_FLEET_ROLES, ROLE_COUNT_LIMITS, quote_fleet
+
+            if "fleet_roles" not in st.session_state:
+                st.session_state["fleet_roles"] = [{**role, "variant": variant} for role in DEFAULT_FLEET_ROLES]
+            fleet_roles = st.data_editor(
+                st.session_state.fleet_roles,
+                key="fleet_roles_editor",
+                num_rows="dynamic",
+                column_config={
+                    "name": st.column_config.TextColumn("Role", required=True),
+                    "count": st.column_config.NumberColumn(
+                        "Node minimum", min_value=ROLE_COUNT_LIMITS[0], max_value=ROLE_COUNT_LIMITS[1], step=1, default=1
+                    ),
+                    "cpu": st.column_config.NumberColumn(
+                        "CPU", min_value=CPU_LIMITS[0], max_value=CPU_LIMITS[1], step=1, default=CPU_LIMITS[0]
+                    ),
+                    "ram": st.column_config.NumberColumn(
+                        "RAM (GB)", min_value=RAM_LIMITS[0], max_value=RAM_LIMITS[1], step=1, default=RAM_LIMITS[0]
+                    ),
+                    "storage": st.column_config.NumberColumn(
+                        "Storage (GB)", min_value=STORAGE_LIMITS[0], max_value=STORAGE_LIMITS[1], step=STORAGE_STEP,
+                        default=STORAGE_LIMITS[0],
+                    ),
+                    "load_share": st.column_config.NumberColumn(
+                        "Beban (%)", min_value=0, max_value=100, step=1, default=0,
+                        help="Persentase concurrent users yang dilayani role ini. 0 = jumlah node tetap.",
+                    ),
+                    "variant": st.column_config.SelectboxColumn(
+                        "Tipe CPU", options=list(cloud_vps_data), default=variant, required=True
+                    ),
+                },
+                hide_index=True,
+                use_container_width=True,
+            )
+            try:
+                fleet_quote = quote_fleet(fleet_roles, quote_inputs, concurrent, cloud_vps_data)
+            except ValueError as exc:
+                st.warning(str(exc))
+            else:
+                r1, r2, r3 = st.columns(3)
+                r1.metric("Total armada", f"Rp {fleet_quote['total_price']:,}")
+                r2.metric("Jumlah node", f"{fleet_quote['node_count']:,}")
+                r3.metric("Biaya server / bulan", f"Rp {fleet_quote['monthly_base_price']:,}")
+                st.dataframe(
+                    [
+                        {
+                            "Role": role["name"],
+                            "Node": role["nodes"],
+                            "Kapasitas / node": role["node_capacity"],
+                            "Concurrent / node": role["per_node_concurrency"],
+                            "Biaya / node / bulan": role["node_monthly_price"],
+                            "Biaya role / bulan": role["monthly_price"],
+                            f"Biaya role ({duration_months} bulan)": role["base_price"],
+                        }
+                        for role in fleet_quote["roles"]
+                    ],
+                    hide_index=True,
+                    use_container_width=True,
+                )
+                st.caption(
+                    f"VPS dasar Rp {fleet_quote['base_price']:,}"
+                    + (f" + buffer Rp {fleet_quote['vps_buffer_price']:,}" if fleet_quote["include_vps_buffer"] else "")
+                    + f" + object storage Rp {fleet_quote['object_storage_price']:,}"
+                    f" + domain Rp {fleet_quote['domain_price']:,}"
+                    f" = subtotal Rp {fleet_quote['pre_tax_subtotal']:,}; monitoring 4% Rp {fleet_quote['monitoring_fee']:,},"
+                    f" PPN 11% Rp {fleet_quote['tax_fee']:,}, security scan Rp {fleet_quote['security_scan_price']:,}{unit_label}."
+                )
+
+    profiler.mark("Sensitivity sweep")
+    with st.expander("📈 Sensitivitas Durasi & Object Storage", expanded=False):
+        st.caption(
+            "Kurva biaya untuk rentang durasi dan/atau ukuran object storage, dengan konfigurasi lain tetap. "
+            "Harga bulanan dihitung sekali lalu diskalakan ke setiap titik."
+        )
+        sweep_mode = st.radio("Variabel", SWEEP_MODES, horizontal=True, key="sweep_mode")
+        w1, w2 = st.columns(2)
+        with w1:
+            sweep_durations = st.slider(
+                "Rentang durasi (bulan)", *DURATION_LIMITS, (1, 60), key="sweep_duration_range",
+                disabled=sweep_mode == SWEEP_MODES[1],
+            )
+        with w2:
+            sweep_storage = st.slider(
+                "Rentang object storage (GB)", *OBJECT_STORAGE_LIMITS, (0, 2000), step=OBJECT_STORAGE_STEP, key="sweep_storage_range",
+                disabled=sweep_mode == SWEEP_MODES[0],
+            )
+            sweep_storage_step = st.selectbox(
+                "Langkah object storage (GB)", SWEEP_STORAGE_STEPS, index=3, key="sweep_storage_step",
+                disabled=sweep_mode == SWEEP_MODES[0],
+            )
+        # The sweep runs on NumPy, which is only imported once it is requested.
+        if not st.toggle("Hitung kurva", key="sweep_enabled"):
+            st.caption("Aktifkan untuk menghitung kurva biaya.")
+        else:
+            from sweep import sweep
+
+            curve = sweep(
+                quote_inputs,
+                duration_months=(
+                    None if sweep_mode == SWEEP_MODES[1]
+                    else range(sweep_durations[0], sweep_durations[1] + 1)
+                ),
+                object_storage_gb=(
+                    None if sweep_mode == SWEEP_MODES[0]
+                    else range(sweep_storage[0], sweep_storage[1] + 1, sweep_storage_step)
+                ),
+            )
+            if sweep_mode == SWEEP_MODES[2]:
+                # One total-price line per storage size, durations on the x axis.
+                storage_columns = [f"{gb:,} GB" for gb in curve["object_storage_gb"].tolist()]
+                table = [
+                    {"Durasi (bulan)": duration, **dict(zip(storage_columns, totals))}
+                    for duration, totals in zip(curve["duration_months"].tolist(), curve["total_price"].tolist())
+                ]
+                if len(storage_columns) <= SWEEP_MAX_CHART_LINES:
+                    st.line_chart(table, x="Durasi (bulan)", y=storage_columns, y_label="Total (Rp)")
+                else:
+                    st.caption(
+                        f"Grafik dilewati untuk lebih dari {SWEEP_MAX_CHART_LINES} ukuran storage; "
+                        "perbesar langkah object storage untuk menampilkannya."
+                    )
+            else:
+                by_duration = sweep_mode == SWEEP_MODES[0]
+                x_label = "Durasi (bulan)" if by_duration else "Object Storage (GB)"
+                x_values = curve["duration_months" if by_duration else "object_storage_gb"].tolist()
+                series = {
+                    label: (curve[key][:, 0] if by_duration else curve[key][0]).tolist()
+                    for key, label in SWEEP_COMPONENT_LABELS.items()
+                }
+                table = [
+                    {x_label: x_value, **{label: values[index] for label, values in series.items()}}
+                    for index, x_value in enumerate(x_values)
+                ]
+                st.line_chart(table, x=x_label, y=list(SWEEP_COMPONENT_LABELS.values()), y_label="Biaya (Rp)")
+            st.dataframe(table, hide_index=True, use_container_width=True)
+
+    profiler.mark("Optimizer")
+    with st.expander("🔎 Cari Konfigurasi Termurah", expanded=False):
+        st.caption(
+            f"Membandingkan semua varian Cloud VPS dan paket server untuk ~{concurrent} concurrent users "
+            f"selama {duration_months} bulan, termasuk buffer, object storage, domain, monitoring 4% dan PPN 11%."
+        )
+        o1, o2 = st.columns(2)
+        with o1:
+            ram_floor = st.number_input("RAM minimum (GB)", min_value=RAM_LIMITS[0], max_value=RAM_LIMITS[1], value=1, key="optimizer_ram_floor")
+        with o2:
+            storage_need = st.number_input(
+                "Kebutuhan storage (GB)", min_value=0, max_value=STORAGE_LIMITS[1], step=STORAGE_STEP, value=20, key="optimizer_storage_gb"
+            )
+        # The plan catalog loads only once the comparison is requested.
+        if not st.toggle("Hitung perbandingan", key="optimizer_enabled"):
+            st.caption("Aktifkan untuk memuat katalog paket server dan menghitung perbandingan.")
+        else:
+            options = cheapest_options(
+                concurrent,
+                ram_floor=ram_floor,
+                storage_gb=storage_need,
+                duration_months=duration_months,
+                inputs={key: quote_inputs[key] for key in OPTIMIZER_INPUT_KEYS},
+            )
+            if options:
+                st.dataframe(
+                    [
+                        {
+                            "Jenis": option["kind"],
+                            "Paket / Varian": option["name"],
+                            "CPU": option["cpu"],
+                            "RAM (GB)": option["ram"],
+                            "Storage (GB)": option["storage"],
+                            "Biaya Server / bulan": option["monthly_base_price"],
+                            f"Total ({duration_months} bulan)": option["total_price"],
+                        }
+                        for option in options
+                    ],
+                    hide_index=True,
+                    use_container_width=True,
+                )
+            else:
+                st.caption("Tidak ada konfigurasi yang memenuhi kebutuhan ini.")
+
+    profiler.mark("PDF export")
+    st.divider()
+
+    pdf_data = {
+        "preset_label": st.session_state.preset_radio,
+        "users_per_hour": u_hour,
+        "session_seconds": s_sec,
+        "concurrent_users": concurrent,
+        "cpu": quote_inputs["cpu"],
+        "ram": quote_inputs["ram"],
+        "storage": quote_inputs["storage"],
+        "object_storage_gb": quote_inputs["object_storage_gb"],
+        "domains": domains,
+        "duration_months": duration_months,
+        "include_vps_buffer": breakdown["include_vps_buffer"],
+        "buffer_duration_label": breakdown["buffer_duration_label"],
+        "cpu_type": variant,
+        "base_price": breakdown["base_price"],
+        "vps_buffer_price": breakdown["vps_buffer_price"],
+        "object_storage_price": breakdown["object_storage_price"],
+        "include_security_scan": breakdown["include_security_scan"],
+        "security_scan_monthly_price": breakdown["security_scan_monthly_price"],
+        "security_scan_price": breakdown["security_scan_price"],
+        "domain_cost_items": breakdown["domain_cost_items"],
+        "domain_price": breakdown["domain_price"],
+        "pre_tax_subtotal": breakdown["pre_tax_subtotal"],
+        "monitoring_fee": breakdown["monitoring_fee"],
+        "tax_fee": breakdown["tax_fee"],
+        "total_price": breakdown["total_price"],
+        "unit_label": unit_label,
+    }
 
+    if fleet_quote is not None:
+        # The fleet replaces the single server in the export; domains keep their priced items.
+        pdf_data.update({key: fleet_quote[key] for key in FLEET_PDF_KEYS})
+        pdf_data["fleet"] = {
+            "concurrent": fleet_quote["concurrent"],
+            "node_count": fleet_quote["node_count"],
+            "roles": fleet_quote["roles"],
+        }
+
+    pdf_key = pdf_cache_key(pdf_data)
+
+    # Only render when asked; the download stays available until the estimate changes.
+    # The export time is taken on the click, so reruns reuse the cached PDF with its timestamp.
+    if st.button("📄 Siapkan PDF Estimasi Infrastruktur"):
+        st.session_state["pdf_export"] = {"key": pdf_key, "exported_at": datetime.now()}
+
+    pdf_export = st.session_state.get("pdf_export")
+    if pdf_export is not None and pdf_export["key"] != pdf_key:
+        # The estimate changed since the export; its download is gone.
+        del st.session_state["pdf_export"]
+    elif pdf_export is not None:
+        exported_at = pdf_export["exported_at"]
+        pdf_data["exported_at_str"] = exported_at.strftime("%d-%m-%Y %H:%M:%S")
+        st.download_button(
+            label="📥 Unduh PDF Estimasi Infrastruktur",
+            data=get_pdf_report(pdf_data, pdf_key),
+            file_name=f"DLI_Estimasi_{exported_at.strftime('%Y%m%d_%H%M%S')}.pdf",
+            mime="application/pdf",
+        )
+
+    if fragment_rerun:
+        profiler.finish()
+
+
+render_pricing(profiler)
+render_analysis(concurrent, u_hour, s_sec, profiler)
+
+
+profiler.mark("Explanation (LaTeX)")
 st.divider()
 # Dedicated collapsible explanation under estimator
 with st.expander("📐 Penjelasan Perhitungan", expanded=False):
@@ -690,40 +1033,28 @@ with st.expander("📐 Penjelasan Perhitungan", expanded=False):
     
     st.warning("⚠️ **Catatan:** Durasi sesi dibatasi sesuai timeout agar estimasi tetap realistis.")
 
-st.divider()
-
-pdf_bytes = build_pdf_report({
-    "exported_at_str": datetime.now().strftime("%d-%m-%Y %H:%M:%S"),
-    "preset_label": st.session_state.preset_radio,
-    "users_per_hour": u_hour,
-    "session_seconds": s_sec,
-    "concurrent_users": concurrent,
-    "cpu": st.session_state.cpu,
-    "ram": st.session_state.ram,
-    "storage": st.session_state.storage,
-    "object_storage_gb": st.session_state.object_storage_gb,
-    "domains": st.session_state.get("domains", []),
-    "duration_months": duration_months,
-    "include_vps_buffer": st.session_state.include_vps_buffer,
-    "buffer_duration_label": buffer_duration_label,
-    "cpu_type": variant,
-    "base_price": base_price,
-    "vps_buffer_price": vps_buffer_price,
-    "object_storage_price": object_storage_price,
-    "include_security_scan": st.session_state.include_security_scan,
-    "security_scan_monthly_price": security_scan_monthly_price,
-    "security_scan_price": security_scan_price,
-    "domain_price": domain_price,
-    "pre_tax_subtotal": pre_tax_subtotal,
-    "monitoring_fee": monitoring_fee,
-    "tax_fee": tax_fee,
-    "total_price": total_price,
-    "unit_label": unit_label,
-})
-
-st.download_button(
-    label="📄 Export PDF Estimasi Infrastruktur",
-    data=pdf_bytes,
-    file_name=f"DLI_Estimasi_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
-    mime="application/pdf",
-)
+if profiler.finish() is not None:
+    with st.expander("⏱️ Profil Rerun", expanded=True):
+        st.caption(
+            f"Waktu per bagian untuk {len(profile_history.records)} rerun terakhir. "
+            f"Aktif karena {PROFILE_QUERY_PARAM}=1 di URL atau variabel lingkungan IDCH_PROFILE."
+        )
+        st.dataframe(profile_history.summary(), hide_index=True, use_container_width=True)
+        st.toggle("Rekam cProfile untuk rerun berikutnya", key="profile_capture_cprofile")
+        if profile_history.records[-1].get("cprofile_skipped"):
+            st.warning("cProfile sedang merekam rerun sesi lain, jadi rerun ini hanya diukur waktunya.")
+        stats_path = profile_history.dump_stats()
+        if stats_path:
+            with open(stats_path, "rb") as f:
+                st.download_button(
+                    label=f"📥 Unduh pstats ({len(profile_history.profiles)} rerun terakhir)",
+                    data=f.read(),
+                    file_name="idcloudhost_rerun.pstats",
+                    mime="application/octet-stream",
+                )
+            os.remove(stats_path)
+        if "cost_graph" in st.session_state:
+            st.markdown("**Graf biaya (evaluasi terakhir)**")
+            st.dataframe(st.session_state.cost_graph.trace_rows(), hide_index=True, use_container_width=True)
+        st.markdown("**Katalog data**")
+        st.dataframe(catalog_stats(), hide_index=True, use_container_width=True)
@@ -0,0 +1,14 @@
+"""Input ranges of the estimator page, shared by every entry point.
+
+The page's sliders and number inputs use them, ``batch_quote.py`` and
+``quote_server.py`` check requests against them, and the price table, the
+optimizer, the sweep and fleet mode stay inside them. Plain tuples only, so
+reading a range never imports NumPy or another pricing module.
+"""
+CPU_LIMITS = (1, 32)
+RAM_LIMITS = (1, 128)
+STORAGE_LIMITS = (20, 2000)
+STORAGE_STEP = 10
+OBJECT_STORAGE_LIMITS = (0, 10_000)
+OBJECT_STORAGE_STEP = 10
+DURATION_LIMITS = (1, 120)
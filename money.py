@@ -0,0 +1,67 @@
+"""Fixed-point integer rupiah arithmetic shared by every pricing path.
+
+Amounts are whole rupiah. Rates are basis points (1/10 000) and the per-hour
+Cloud VPS coefficients are milli-rupiah, so every step is an integer
+operation with an explicit rounding rule:
+
+* ``FLOOR`` drops the remainder (monitoring and PPN, as ``int(x * rate)`` did);
+* ``HALF_EVEN`` rounds to nearest with ties to even (Python's ``round``).
+
+The helpers accept Python ints or NumPy integer arrays and return the same
+values for both, so scalar, vectorized and cached results can be compared
+bit for bit.
+"""
+RATE_SCALE = 10_000
+MILLI = 1_000
+
+FLOOR = "floor"
+HALF_EVEN = "half_even"
+
+
+def to_milli(value) -> int:
+    """Exact milli-units of a decimal value with at most three decimals."""
+    scaled = round(float(value) * MILLI)
+    if abs(float(value) * MILLI - scaled) > 1e-6:
+        raise ValueError(f"{value!r} has more than three decimals and cannot be stored in milli-rupiah.")
+    return int(scaled)
+
+
+def rate_bp(rate) -> int:
+    """Basis points of a fractional rate (0.11 -> 1100)."""
+    scaled = round(float(rate) * RATE_SCALE)
+    if abs(float(rate) * RATE_SCALE - scaled) > 1e-6:
+        raise ValueError(f"Rate {rate!r} is finer than one basis point.")
+    return int(scaled)
+
+
+def divide(numerator, denominator: int, rounding: str = HALF_EVEN):
+    """``numerator / denominator`` for non-negative integers, rounded per ``rounding``."""
+    if rounding == FLOOR:
+        return numerator // denominator
+    if rounding != HALF_EVEN:
+        raise ValueError(f"Unknown rounding rule: {rounding!r}")
+    # Round half up, then step exact ties that landed on an odd result back down.
+    shifted = numerator + denominator // 2
+    quotient = shifted // denominator
+    if denominator % 2:
+        return quotient  # an odd denominator never leaves an exact half
+    tie = shifted == quotient * denominator
+    if isinstance(tie, bool):
+        return quotient - 1 if tie and quotient % 2 else quotient
+    # NumPy arrays: same rule, element-wise.
+    return quotient - (tie & (quotient % 2 == 1))
+
+
+def apply_rate(amount, basis_points: int, rounding: str = FLOOR):
+    """``amount * basis_points / 10 000``: a fee charged on ``amount``."""
+    return divide(amount * basis_points, RATE_SCALE, rounding)
+
+
+def with_rate(amount, basis_points: int, rounding: str = FLOOR):
+    """``amount`` plus the fee at ``basis_points`` (e.g. a price including PPN)."""
+    return amount + apply_rate(amount, basis_points, rounding)
+
+
+def prorate(amount, numerator: int, denominator: int, rounding: str = HALF_EVEN):
+    """``amount * numerator / denominator``, e.g. a yearly price over some months."""
+    return divide(amount * numerator, denominator, rounding)
@@ -0,0 +1,97 @@
+"""Cheapest-configuration search across Cloud VPS variants and fixed plans.
+
+Given a concurrency target, a RAM floor and a storage need, every Cloud VPS
+variant in ``cloud_vps_coeff.json`` and every plan in
+``server_vps_plans.csv`` is priced over the chosen duration through the same
+pipeline as the estimator page (buffer, monitoring 4%, PPN 11%), and the
+feasible options are returned cheapest first.
+
+The Cloud VPS price never decreases when CPU, RAM or storage grow (all
+coefficients are positive and the upper tiers cost more per unit, which
+``catalog.check_cloud_vps_tiers`` enforces when the coefficients load), so
+the smallest feasible configuration is the cheapest one for its variant: one
+candidate per variant instead of a sweep over the whole slider grid. Plans
+are walked in price order (``PlanCatalog.by_price``), so each group stops at
+its first feasible plan.
+"""
+from catalog import check_cloud_vps_tiers, get_cloud_vps_coefficients, get_server_vps_plans
+from limits import CPU_LIMITS, RAM_LIMITS, STORAGE_LIMITS, STORAGE_STEP
+from price_table import cloud_vps_price
+from pricing import get_specs_from_concurrency, price_breakdown
+
+CLOUD_VPS_KIND = "Cloud VPS"
+SERVER_PLAN_KIND = "Paket Server"
+
+def required_specs(concurrent: int | None, ram_floor: int = 1, storage_gb: int = 0) -> tuple[int, int, int]:
+    """Smallest (cpu, ram, storage) that covers the concurrency, RAM floor and storage need.
+
+    No concurrency target (``None`` or 0) gets the lowest capacity tier, the
+    same spec ``get_specs_from_concurrency(0)`` gives the estimator page.
+    """
+    cpu, ram = get_specs_from_concurrency(concurrent or 0)
+    ram = max(ram, int(ram_floor))
+    storage = max(STORAGE_LIMITS[0], -(-int(storage_gb) // STORAGE_STEP) * STORAGE_STEP)
+    return cpu, ram, storage
+
+
+def cheapest_options(
+    concurrent: int | None = None,
+    ram_floor: int = 1,
+    storage_gb: int = 0,
+    duration_months: int = 12,
+    top_n: int | None = 5,
+    inputs: dict | None = None,
+    coefficients: dict | None = None,
+    plans=None,
+) -> list[dict]:
+    """Rank the cheapest feasible options by total cost over ``duration_months``.
+
+    ``inputs`` carries the rest of the estimate (object storage, domains,
+    buffer and security-scan toggles) so totals match the estimator page.
+    Explicit ``coefficients`` go through ``catalog.check_cloud_vps_tiers``
+    like the catalog's own.
+    """
+    if coefficients is None:
+        coefficients = get_cloud_vps_coefficients()
+    else:
+        check_cloud_vps_tiers(coefficients)
+    catalog = plans if plans is not None else get_server_vps_plans()
+    cpu, ram, storage = required_specs(concurrent, ram_floor, storage_gb)
+    shared_inputs = {**(inputs or {}), "duration_months": duration_months}
+
+    options = []
+    if cpu <= CPU_LIMITS[1] and ram <= RAM_LIMITS[1] and storage <= STORAGE_LIMITS[1]:
+        for variant, coef in coefficients.items():
+            breakdown = price_breakdown(cloud_vps_price(cpu, ram, storage, coef), shared_inputs)
+            options.append({
+                "kind": CLOUD_VPS_KIND,
+                "name": variant,
+                "cpu": cpu,
+                "ram": ram,
+                "storage": storage,
+                "monthly_base_price": breakdown["monthly_base_price"],
+                "total_price": breakdown["total_price"],
+                "breakdown": breakdown,
+            })
+
+    cheapest_group_found = set()
+    for plan in catalog.by_price:
+        if plan.group in cheapest_group_found:
+            continue
+        if plan.cpu < cpu or plan.ram < ram or plan.storage < storage:
+            continue
+        cheapest_group_found.add(plan.group)
+        breakdown = price_breakdown(plan.monthly_price, shared_inputs)
+        options.append({
+            "kind": SERVER_PLAN_KIND,
+            "name": f"{plan.group} — {plan.name}",
+            "cpu": plan.cpu,
+            "ram": plan.ram,
+            "storage": plan.storage,
+            "monthly_base_price": plan.monthly_price,
+            "total_price": breakdown["total_price"],
+            "breakdown": breakdown,
+        })
+
+    options.sort(key=lambda option: option["total_price"])
+    return options if top_n is None else options[:top_n]
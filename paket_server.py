@@ -1,9 +1,9 @@
 import streamlit as st
-import pandas as pd
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen import canvas
 from io import BytesIO
 
+from catalog import get_server_vps_plans
+from plans import BASE, BILLING_PERIODS, BILLING_UNIT_LABELS, TOTAL, WITH_PPN, WITH_PPN_MONITORING
+
 # ============================================================
 # Render Function: Server VPS Page
 # ============================================================
@@ -11,13 +11,14 @@ def render_server_vps():
     # ------------------------------
     # Load data
     # ------------------------------
-    df = pd.read_csv("data/server_vps_plans.csv")
+    catalog = get_server_vps_plans()
+    billing_matrix = catalog.billing
 
     # ------------------------------
     # User selection
     # ------------------------------
     st.markdown("#### Pilih Jenis VPS:")
-    group = st.radio("", sorted(df["Group"].unique()), horizontal=True, label_visibility="collapsed")
+    group = st.radio("", list(catalog.groups), horizontal=True, label_visibility="collapsed")
     st.markdown("<div style='margin-top:-1rem'></div>", unsafe_allow_html=True)
 
 
@@ -38,45 +39,34 @@ def render_server_vps():
     # ------------------------------
     billing = st.radio(
         "Periode Pembayaran",
-        ["Bulanan", "Tahunan"],
+        list(BILLING_PERIODS),
         horizontal=True
     )
 
-    # ------------------------------
-    # Filter dataset
-    # ------------------------------
-    df_group = df[df["Group"] == group].copy()
-
-    if billing == "Tahunan":
-        df_group["Biaya Dasar"] = df_group["Price (IDR)"] * 12
-        monitoring_fee = 120_000
-        unit_label = "/tahun"
-    else:
-        df_group["Biaya Dasar"] = df_group["Price (IDR)"]
-        monitoring_fee = 10_000
-        unit_label = "/bulan"
-
-    df_group["Biaya + PPN (11%)"] = df_group["Biaya Dasar"] * 1.11
-    df_group["Biaya + PPN + Monitoring"] = df_group["Biaya + PPN (11%)"] + monitoring_fee
-    df_group["Biaya Total / Final"] = df_group["Biaya + PPN + Monitoring"]
+    unit_label = BILLING_UNIT_LABELS[billing]
 
     # ------------------------------
-    # Display table
+    # Display table (rows prebuilt in the billing matrix)
     # ------------------------------
     st.dataframe(
-        df_group[[
-            "Plan", "CPU", "RAM (GB)", "Storage (GB)",
-            "Biaya Dasar", "Biaya + PPN (11%)", "Biaya + PPN + Monitoring"
-        ]],
+        billing_matrix.table(group, billing),
         hide_index=True,
         use_container_width=True
     )
 
+    with st.expander("📊 Bandingkan Jenis VPS", expanded=False):
+        compared_groups = st.multiselect("Jenis VPS", list(catalog.groups), default=list(catalog.groups))
+        st.dataframe(
+            billing_matrix.comparison(billing, compared_groups),
+            hide_index=True,
+            use_container_width=True
+        )
+
     # ------------------------------
     # Package selection
     # ------------------------------
-    plan = st.selectbox("Pilih Paket untuk Perhitungan:", df_group["Plan"].tolist())
-    row = df_group[df_group["Plan"] == plan].iloc[0]
+    plan = st.selectbox("Pilih Paket untuk Perhitungan:", [p.name for p in catalog.in_group(group)])
+    fees = billing_matrix.fees(group, plan, billing)
 
     # ------------------------------
     # Selected Package Display
@@ -90,19 +80,19 @@ def render_server_vps():
     with col1:
         st.markdown(
             f"<p style='font-size:14px; margin-bottom:4px;'>Biaya Dasar</p>"
-            f"<p style='font-size:18px; font-weight:600;'>Rp {int(row['Biaya Dasar']):,} {unit_label}</p>",
+            f"<p style='font-size:18px; font-weight:600;'>Rp {int(fees[BASE]):,} {unit_label}</p>",
             unsafe_allow_html=True
         )
     with col2:
         st.markdown(
             f"<p style='font-size:14px; margin-bottom:4px;'>Biaya + PPN (11%)</p>"
-            f"<p style='font-size:18px; font-weight:600;'>Rp {int(row['Biaya + PPN (11%)']):,} {unit_label}</p>",
+            f"<p style='font-size:18px; font-weight:600;'>Rp {int(fees[WITH_PPN]):,} {unit_label}</p>",
             unsafe_allow_html=True
         )
     with col3:
         st.markdown(
             f"<p style='font-size:14px; margin-bottom:4px;'>Biaya + PPN + Monitoring</p>"
-            f"<p style='font-size:18px; font-weight:600;'>Rp {int(row['Biaya + PPN + Monitoring']):,} {unit_label}</p>",
+            f"<p style='font-size:18px; font-weight:600;'>Rp {int(fees[WITH_PPN_MONITORING]):,} {unit_label}</p>",
             unsafe_allow_html=True
         )
 
@@ -110,7 +100,7 @@ def render_server_vps():
     st.markdown(
         f"<div style='text-align:center;'>"
         f"<p style='font-size:15px; margin-top:16px;'>💰 <b>Biaya Total / Final</b></p>"
-        f"<h2 style='margin-top:-5px;'>Rp {int(row['Biaya Total / Final']):,} {unit_label}</h2>"
+        f"<h2 style='margin-top:-5px;'>Rp {int(fees[TOTAL]):,} {unit_label}</h2>"
         f"</div>",
         unsafe_allow_html=True
     )
@@ -126,6 +116,9 @@ def render_server_vps():
     st.markdown("### 📄 Ekspor Hasil ke PDF")
 
     if st.button("Export ke PDF"):
+        from reportlab.lib.pagesizes import A4
+        from reportlab.pdfgen import canvas
+
         buffer = BytesIO()
         c = canvas.Canvas(buffer, pagesize=A4)
         width, height = A4
@@ -140,10 +133,10 @@ def render_server_vps():
 
         c.line(50, height - 130, width - 50, height - 130)
 
-        c.drawString(50, height - 150, f"Biaya Dasar: Rp {int(row['Biaya Dasar']):,} {unit_label}")
-        c.drawString(50, height - 170, f"Biaya + PPN (11%): Rp {int(row['Biaya + PPN (11%)']):,} {unit_label}")
-        c.drawString(50, height - 190, f"Biaya + PPN + Monitoring: Rp {int(row['Biaya + PPN + Monitoring']):,} {unit_label}")
-        c.drawString(50, height - 210, f"Biaya Total / Final: Rp {int(row['Biaya Total / Final']):,} {unit_label}")
+        c.drawString(50, height - 150, f"Biaya Dasar: Rp {int(fees[BASE]):,} {unit_label}")
+        c.drawString(50, height - 170, f"Biaya + PPN (11%): Rp {int(fees[WITH_PPN]):,} {unit_label}")
+        c.drawString(50, height - 190, f"Biaya + PPN + Monitoring: Rp {int(fees[WITH_PPN_MONITORING]):,} {unit_label}")
+        c.drawString(50, height - 210, f"Biaya Total / Final: Rp {int(fees[TOTAL]):,} {unit_label}")
 
         c.setFont("Helvetica-Oblique", 9)
         c.drawString(50, 60, "Laporan ini dihasilkan otomatis dari kalkulator internal IDCloudHost.")
@@ -0,0 +1,143 @@
+"""Typed catalog of the fixed-price server plans (``server_vps_plans.csv``).
+
+The CSV is small and read-only, so it is parsed once per catalog version
+(see ``catalog.get_server_vps_plans``) into ``__slots__`` records indexed by
+group and plan name. Parsing also builds the ``BillingMatrix``: every plan x
+billing period x fee stage, plus the table rows the Paket Server page shows.
+The table, the selected-plan metrics, the PDF export and the cross-group
+comparison all read from it, so a rerun only does lookups.
+"""
+import csv
+from io import StringIO
+
+from money import FLOOR, with_rate
+
+MONTHLY = "Bulanan"
+ANNUAL = "Tahunan"
+BILLING_PERIODS = (MONTHLY, ANNUAL)
+BILLING_MONTHS = {MONTHLY: 1, ANNUAL: 12}
+BILLING_UNIT_LABELS = {MONTHLY: "/bulan", ANNUAL: "/tahun"}
+# Mandatory monitoring fee on the fixed plans, per billing period.
+PLAN_MONITORING_FEES = {MONTHLY: 10_000, ANNUAL: 120_000}
+# PPN 11% in basis points, floored to whole rupiah. On these plans monitoring
+# is added after tax (the Cloud VPS page taxes it; see extreme_custom).
+PLAN_PPN_RATE_BP = 1100
+
+# Fee stages, in the order they are applied; the last one is the final total.
+FEE_STAGES = ("Biaya Dasar", "Biaya + PPN (11%)", "Biaya + PPN + Monitoring")
+BASE, WITH_PPN, WITH_PPN_MONITORING = range(len(FEE_STAGES))
+TOTAL = WITH_PPN_MONITORING
+GROUP_COLUMN = "Jenis VPS"
+
+
+def plan_fee_stages(monthly_price: int, period: str) -> tuple:
+    """(base, base + PPN 11%, base + PPN + monitoring) for one billing period."""
+    base = monthly_price * BILLING_MONTHS[period]
+    with_ppn = with_rate(base, PLAN_PPN_RATE_BP, FLOOR)
+    return base, with_ppn, with_ppn + PLAN_MONITORING_FEES[period]
+
+
+class Plan:
+    __slots__ = ("group", "name", "cpu", "ram", "storage", "monthly_price")
+
+    def __init__(self, group: str, name: str, cpu: int, ram: int, storage: int, monthly_price: int):
+        self.group = group
+        self.name = name
+        self.cpu = cpu
+        self.ram = ram
+        self.storage = storage
+        self.monthly_price = monthly_price
+
+    def __repr__(self):
+        return f"Plan({self.group!r}, {self.name!r}, cpu={self.cpu}, ram={self.ram}, storage={self.storage})"
+
+
+class BillingMatrix:
+    """Fee stages of every plan for every billing period, built once per catalog.
+
+    ``fees(group, plan, period)`` returns the stage tuple indexed by ``BASE``,
+    ``WITH_PPN`` and ``WITH_PPN_MONITORING``. ``table`` and ``comparison``
+    return prebuilt row lists; treat them as read-only.
+    """
+
+    __slots__ = ("_fees", "_tables", "_comparison")
+
+    def __init__(self, plans_by_group: dict[str, tuple[Plan, ...]]):
+        self._fees = {}
+        self._tables = {}
+        self._comparison = {}
+        for period in BILLING_PERIODS:
+            comparison = []
+            for group, plans in plans_by_group.items():
+                rows = []
+                for plan in plans:
+                    stages = plan_fee_stages(plan.monthly_price, period)
+                    self._fees[(group, plan.name, period)] = stages
+                    row = {
+                        "Plan": plan.name,
+                        "CPU": plan.cpu,
+                        "RAM (GB)": plan.ram,
+                        "Storage (GB)": plan.storage,
+                        **dict(zip(FEE_STAGES, stages)),
+                    }
+                    rows.append(row)
+                    comparison.append({GROUP_COLUMN: group, **row})
+                self._tables[(group, period)] = rows
+            self._comparison[period] = comparison
+
+    def fees(self, group: str, plan: str, period: str) -> tuple:
+        return self._fees[(group, plan, period)]
+
+    def table(self, group: str, period: str) -> list[dict]:
+        """Rows of one group's plan table for ``period``."""
+        return self._tables.get((group, period), [])
+
+    def comparison(self, period: str, groups=None) -> list[dict]:
+        """Rows of every plan (or of ``groups`` only) for ``period``, with a group column."""
+        rows = self._comparison[period]
+        if groups is None:
+            return rows
+        wanted = set(groups)
+        return [row for row in rows if row[GROUP_COLUMN] in wanted]
+
+
+class PlanCatalog:
+    """Plans indexed by group and by (group, plan name), a price-sorted view and the billing matrix."""
+
+    __slots__ = ("plans", "groups", "by_price", "billing", "_by_group", "_by_key")
+
+    def __init__(self, plans: list[Plan]):
+        self.plans = tuple(plans)
+        by_group: dict[str, list[Plan]] = {}
+        for plan in self.plans:
+            by_group.setdefault(plan.group, []).append(plan)
+        self._by_group = {group: tuple(members) for group, members in by_group.items()}
+        self._by_key = {(plan.group, plan.name): plan for plan in self.plans}
+        self.groups = tuple(sorted(self._by_group))
+        self.by_price = tuple(sorted(self.plans, key=lambda plan: plan.monthly_price))
+        self.billing = BillingMatrix({group: self._by_group[group] for group in self.groups})
+
+    @classmethod
+    def from_csv(cls, raw: bytes) -> "PlanCatalog":
+        reader = csv.DictReader(StringIO(raw.decode("utf-8-sig")))
+        return cls([
+            Plan(
+                row["Group"],
+                row["Plan"],
+                int(row["CPU"]),
+                int(row["RAM (GB)"]),
+                int(row["Storage (GB)"]),
+                int(row["Price (IDR)"]),
+            )
+            for row in reader
+        ])
+
+    def __len__(self):
+        return len(self.plans)
+
+    def in_group(self, group: str) -> tuple[Plan, ...]:
+        """Plans of ``group`` in catalog order."""
+        return self._by_group.get(group, ())
+
+    def get(self, group: str, name: str) -> Plan:
+        return self._by_key[(group, name)]
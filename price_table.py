@@ -0,0 +1,329 @@
+"""Precomputed, memory-mapped monthly price table for the slider domain.
+
+The estimator sliders bound the Cloud VPS space to CPU 1-32, RAM 1-128 and
+storage 20-2000 GB in steps of 10. ``build_price_table`` prices every cell
+for every variant once and stores the result as ``.npy`` files named after a
+hash of ``cloud_vps_coeff.json`` and ``TABLE_VERSION``; ``PriceTable`` memory-maps them so every
+worker process shares a single copy through the page cache.
+
+The estimator page, the cost graph behind ``batch_quote.py`` and
+``quote_server.py``, the optimizer and the sweep price servers through
+``cloud_vps_price``. It looks the cell up in the table of the current
+coefficient catalog (``get_price_table``) and falls back to
+``pricing.calculate_cloud_vps`` off the grid or for coefficients that are
+not in the catalog. A coefficient change or a ``TABLE_VERSION`` bump gives a
+new file name, so the table is rebuilt on first use and the stale files are
+removed.
+
+Single lookups read the mapping through a ``memoryview``, so the page never
+imports NumPy for them; the build and ``configs_under`` range scans do.
+
+Usage::
+
+    python price_table.py build
+"""
+import bisect
+import hashlib
+import json
+import logging
+import mmap
+import os
+import sys
+import threading
+from pathlib import Path
+
+from catalog import CLOUD_VPS_COEFF_PATH, DATA_DIR, get_cloud_vps_coefficients
+from limits import CPU_LIMITS, RAM_LIMITS, STORAGE_LIMITS, STORAGE_STEP
+from pricing import calculate_cloud_vps
+
+CACHE_DIR = DATA_DIR / "cache"
+CPU_RANGE = CPU_LIMITS
+RAM_RANGE = RAM_LIMITS
+STORAGE_RANGE = STORAGE_LIMITS
+# Monthly prices are whole thousands of rupiah, stored as thousands.
+PRICE_UNIT = 1000
+# Bump when the pricing rules change so stale tables are not reused.
+TABLE_VERSION = b"fixed-point-1"
+# Cells per axis of the grid above.
+GRID_SHAPE = (
+    CPU_RANGE[1] - CPU_RANGE[0] + 1,
+    RAM_RANGE[1] - RAM_RANGE[0] + 1,
+    (STORAGE_RANGE[1] - STORAGE_RANGE[0]) // STORAGE_STEP + 1,
+)
+_CPUS, _RAMS, _STORAGES = GRID_SHAPE
+# memoryview formats of the little-endian ``.npy`` dtypes the table uses.
+_NPY_FORMATS = {"<u2": "H", "<u4": "I"}
+
+_table = None
+_table_lock = threading.Lock()
+logger = logging.getLogger("price_table")
+
+
+def coefficient_hash(path=CLOUD_VPS_COEFF_PATH) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read() + TABLE_VERSION).hexdigest()[:16]
+
+
+def grid_axes():
+    import numpy as np
+
+    cpu = np.arange(CPU_RANGE[0], CPU_RANGE[1] + 1)
+    ram = np.arange(RAM_RANGE[0], RAM_RANGE[1] + 1)
+    storage = np.arange(STORAGE_RANGE[0], STORAGE_RANGE[1] + 1, STORAGE_STEP)
+    return cpu, ram, storage
+
+
+def table_paths(digest: str, cache_dir=CACHE_DIR) -> tuple[Path, Path]:
+    cache_dir = Path(cache_dir)
+    return (
+        cache_dir / f"price_table-{digest}.npy",
+        cache_dir / f"price_order-{digest}.npy",
+    )
+
+
+def _save_atomic(path: Path, array):
+    import numpy as np
+
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        np.save(f, array)
+    os.replace(tmp_path, path)
+
+
+def _remove_stale_tables(digest: str, cache_dir: Path):
+    """Delete tables of older coefficient files or table versions."""
+    current = set(table_paths(digest, cache_dir))
+    for pattern in ("price_table-*.npy", "price_order-*.npy"):
+        for path in cache_dir.glob(pattern):
+            if path not in current:
+                path.unlink(missing_ok=True)
+
+
+def build_price_table(coeff_path=CLOUD_VPS_COEFF_PATH, cache_dir=CACHE_DIR) -> Path:
+    """Price the whole slider domain and write it next to its sort order."""
+    import numpy as np
+
+    from pricing_batch import calculate_cloud_vps_batch
+
+    with open(coeff_path) as f:
+        coefficients = json.load(f)
+    digest = coefficient_hash(coeff_path)
+    prices_path, order_path = table_paths(digest, cache_dir)
+    Path(cache_dir).mkdir(parents=True, exist_ok=True)
+
+    cpu, ram, storage = grid_axes()
+    variant = np.arange(len(coefficients))
+    v, c, r, s = np.meshgrid(variant, cpu, ram, storage, indexing="ij")
+    prices = calculate_cloud_vps_batch(c, r, s, v, coefficients) // PRICE_UNIT
+    if prices.max() > np.iinfo(np.uint16).max:
+        raise ValueError("Monthly prices no longer fit the uint16 price table.")
+    prices = prices.astype(np.uint16)
+    # Stable sort so configurations with equal prices keep grid order.
+    order = np.argsort(prices, axis=None, kind="stable").astype(np.uint32)
+
+    _save_atomic(prices_path, prices)
+    _save_atomic(order_path, order)
+    _remove_stale_tables(digest, Path(cache_dir))
+    return prices_path
+
+
+def _map_npy(path: Path) -> tuple[tuple[int, ...], memoryview]:
+    """Shape and flat read-only ``memoryview`` of a C-ordered little-endian ``.npy`` file."""
+    import ast
+
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if mapped[:6] != b"\x93NUMPY":
+        raise ValueError(f"{path} is not a .npy file.")
+    if mapped[6] == 1:
+        header_start, header_length = 10, int.from_bytes(mapped[8:10], "little")
+    else:
+        header_start, header_length = 12, int.from_bytes(mapped[8:12], "little")
+    header = ast.literal_eval(mapped[header_start:header_start + header_length].decode("latin1"))
+    view_format = _NPY_FORMATS.get(header["descr"])
+    if view_format is None or header["fortran_order"] or sys.byteorder != "little":
+        raise ValueError(f"{path} has an unsupported layout: {header}")
+    return tuple(header["shape"]), memoryview(mapped)[header_start + header_length:].cast(view_format)
+
+
+def _flat_index(variant_index: int, cpu: int, ram: int, storage: int) -> int | None:
+    """Position of a cell in the flattened table, or None off the grid."""
+    if not (
+        CPU_RANGE[0] <= cpu <= CPU_RANGE[1]
+        and RAM_RANGE[0] <= ram <= RAM_RANGE[1]
+        and STORAGE_RANGE[0] <= storage <= STORAGE_RANGE[1]
+        and not (storage - STORAGE_RANGE[0]) % STORAGE_STEP
+    ):
+        return None
+    cpus, rams, storages = GRID_SHAPE
+    return (
+        ((variant_index * cpus + cpu - CPU_RANGE[0]) * rams + ram - RAM_RANGE[0]) * storages
+        + (storage - STORAGE_RANGE[0]) // STORAGE_STEP
+    )
+
+
+class PriceTable:
+    """Read-only view over a built price table."""
+
+    def __init__(self, coefficients: dict, prices_path: Path, order_path: Path, digest: str):
+        self.coefficients = coefficients
+        self.variants = list(coefficients)
+        self.digest = digest
+        self.shape, self._prices = _map_npy(prices_path)
+        _, self._order = _map_npy(order_path)
+        if self.shape != (len(self.variants), *GRID_SHAPE):
+            raise ValueError(f"Price table {digest} has shape {self.shape}, expected {(len(self.variants), *GRID_SHAPE)}.")
+        # The catalog hands out the same coefficient dicts, so most lookups match by identity.
+        self._index_by_id = {id(coef): index for index, coef in enumerate(coefficients.values())}
+
+    @classmethod
+    def open(cls, coeff_path=CLOUD_VPS_COEFF_PATH, cache_dir=CACHE_DIR, build: bool = True) -> "PriceTable":
+        """Memory-map the table for the current coefficient file, building it if missing."""
+        digest = coefficient_hash(coeff_path)
+        prices_path, order_path = table_paths(digest, cache_dir)
+        if not (prices_path.exists() and order_path.exists()):
+            if not build:
+                raise FileNotFoundError(f"No price table for coefficients {digest} in {cache_dir}")
+            build_price_table(coeff_path, cache_dir)
+        with open(coeff_path) as f:
+            coefficients = json.load(f)
+        return cls(coefficients, prices_path, order_path, digest)
+
+    @property
+    def prices(self):
+        """The table as a (variants, cpu, ram, storage) NumPy array over the mapping."""
+        import numpy as np
+
+        return np.frombuffer(self._prices, dtype=np.uint16).reshape(self.shape)
+
+    @property
+    def order(self):
+        import numpy as np
+
+        return np.frombuffer(self._order, dtype=np.uint32)
+
+    def _variant_index(self, variant) -> int:
+        if isinstance(variant, str):
+            return self.variants.index(variant)
+        index = int(variant)
+        if not 0 <= index < len(self.variants):
+            raise ValueError(f"Cloud VPS variant index out of range 0..{len(self.variants) - 1}.")
+        return index
+
+    def variant_of(self, coef: dict) -> int | None:
+        """Position of the variant with exactly these coefficients, or None."""
+        index = self._index_by_id.get(id(coef))
+        if index is not None:
+            return index
+        for index, known in enumerate(self.coefficients.values()):
+            if known == coef:
+                return index
+        return None
+
+    def price(self, variant, cpu: int, ram: int, storage: int) -> int:
+        """Monthly price of one configuration; off-grid cells are computed directly."""
+        variant_index = self._variant_index(variant)
+        index = _flat_index(variant_index, int(cpu), int(ram), int(storage))
+        if index is None:
+            coef = self.coefficients[self.variants[variant_index]]
+            return calculate_cloud_vps(int(cpu), int(ram), int(storage), coef)
+        return self._prices[index] * PRICE_UNIT
+
+    def configs_under(self, max_price: int, variant=None) -> dict:
+        """Every configuration whose monthly price is at most ``max_price``, cheapest first."""
+        import numpy as np
+
+        flat_prices = self._prices
+        # Binary search over the shared sort order; no per-process sorted copy.
+        count = bisect.bisect_right(self._order, max_price // PRICE_UNIT, key=flat_prices.__getitem__)
+        flat = self.order[:count].astype(np.intp)
+        variant_index, cpu_index, ram_index, storage_index = np.unravel_index(flat, self.shape)
+        if variant is not None:
+            keep = variant_index == self._variant_index(variant)
+            flat = flat[keep]
+            variant_index, cpu_index = variant_index[keep], cpu_index[keep]
+            ram_index, storage_index = ram_index[keep], storage_index[keep]
+        return {
+            "variant": variant_index,
+            "cpu": cpu_index + CPU_RANGE[0],
+            "ram": ram_index + RAM_RANGE[0],
+            "storage": storage_index * STORAGE_STEP + STORAGE_RANGE[0],
+            "monthly_price": self.prices.reshape(-1)[flat].astype(np.int64) * PRICE_UNIT,
+        }
+
+
+def get_price_table() -> PriceTable | None:
+    """The table of the current coefficient catalog, shared by the whole process.
+
+    Reopened (and built, when this coefficient file or ``TABLE_VERSION`` has
+    no table yet) whenever ``catalog`` loads a new coefficient file. None when
+    the table cannot be built or opened, e.g. on a read-only checkout or when
+    a price no longer fits the table; callers then compute prices directly.
+    """
+    global _table
+    coefficients = get_cloud_vps_coefficients()
+    current = _table
+    if current is not None and current[0] is coefficients:
+        return current[1]
+    with _table_lock:
+        if _table is None or _table[0] is not coefficients:
+            try:
+                table = PriceTable.open(cache_dir=CACHE_DIR)
+            except (OSError, ValueError):
+                logger.exception("Price table unavailable; computing Cloud VPS prices directly.")
+                table = None
+            if table is not None and table.coefficients == coefficients:
+                table._index_by_id.update({id(coef): index for index, coef in enumerate(coefficients.values())})
+            _table = (coefficients, table)
+        return _table[1]
+
+
+def cloud_vps_price(cpu: int, ram: int, storage: int, coef: dict) -> int:
+    """``pricing.calculate_cloud_vps``, read from the price table when the cell is on it.
+
+    Coefficient dicts the current table was built from are recognised by
+    identity without touching the catalog; any other dict revalidates the
+    catalog first, so a reloaded coefficient file switches to its own table.
+    """
+    current = _table
+    table = current[1] if current is not None else None
+    variant_index = table._index_by_id.get(id(coef)) if table is not None else None
+    if variant_index is None:
+        table = get_price_table()
+        variant_index = table.variant_of(coef) if table is not None else None
+        if variant_index is None:
+            return calculate_cloud_vps(cpu, ram, storage, coef)
+    # ``_flat_index`` inlined: this runs once per priced estimate.
+    if (
+        CPU_RANGE[0] <= cpu <= CPU_RANGE[1]
+        and RAM_RANGE[0] <= ram <= RAM_RANGE[1]
+        and STORAGE_RANGE[0] <= storage <= STORAGE_RANGE[1]
+        and not (storage - STORAGE_RANGE[0]) % STORAGE_STEP
+    ):
+        index = (
+            ((variant_index * _CPUS + cpu - CPU_RANGE[0]) * _RAMS + ram - RAM_RANGE[0]) * _STORAGES
+            + (storage - STORAGE_RANGE[0]) // STORAGE_STEP
+        )
+        try:
+            return table._prices[index] * PRICE_UNIT
+        except TypeError:
+            pass  # fractional specs are not on the grid
+    return calculate_cloud_vps(cpu, ram, storage, coef)
+
+
+def main(argv=None):
+    # argparse only for the CLI: the page imports this module through cost_graph.
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build the precomputed Cloud VPS price table.")
+    parser.add_argument("command", choices=["build"])
+    parser.add_argument("--coefficients", default=CLOUD_VPS_COEFF_PATH, type=Path)
+    parser.add_argument("--cache-dir", default=CACHE_DIR, type=Path)
+    args = parser.parse_args(argv)
+
+    path = build_price_table(args.coefficients, args.cache_dir)
+    print(f"Price table written to {path}")
+
+
+if __name__ == "__main__":
+    main()
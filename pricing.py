@@ -0,0 +1,570 @@
+"""Headless pricing engine for the IDCloudHost estimator.
+
+Everything here is plain Python: no Streamlit and no reportlab, so the
+Streamlit pages, batch jobs and services can all price a quote by calling
+``quote(inputs)`` directly. Money math goes through the integer engine in
+``money``: coefficients in milli-rupiah, rates in basis points, and an
+explicit rounding rule at each step.
+"""
+import hashlib
+
+from catalog import get_capacity_tiers, get_cloud_vps_coefficients, get_spec_load_rules
+from money import FLOOR, HALF_EVEN, MILLI, apply_rate, prorate, to_milli
+
+# ----------------------------
+# Pricing & Logic
+# ----------------------------
+HOURS_PER_MONTH = 730
+# Monthly Cloud VPS prices are rounded half-even to whole thousands of rupiah.
+PRICE_ROUNDING_UNIT = 1000
+COEFFICIENT_FIELDS = ("cpuram1", "cpuram2", "storage1", "storage2")
+# Milli-rupiah per month -> thousands of rupiah; an even divisor, so exact ties exist.
+_MONTHLY_PRICE_DIVISOR = MILLI * PRICE_ROUNDING_UNIT
+_MILLI_COEFFICIENTS_LIMIT = 64
+_milli_coefficients: dict[int, tuple[dict, tuple[int, int, int, int]]] = {}
+
+def milli_coefficients(coef: dict) -> tuple[int, int, int, int]:
+    """(cpuram1, cpuram2, storage1, storage2) in milli-rupiah per hour, cached per dict."""
+    cached = _milli_coefficients.get(id(coef))
+    if cached is None or cached[0] is not coef:
+        if len(_milli_coefficients) >= _MILLI_COEFFICIENTS_LIMIT:
+            _milli_coefficients.clear()
+        cached = _milli_coefficients[id(coef)] = (coef, tuple(to_milli(coef[field]) for field in COEFFICIENT_FIELDS))
+    return cached[1]
+
+def calculate_cloud_vps(cpu: int, ram: int, storage: int, coef: dict) -> int:
+    cached = _milli_coefficients.get(id(coef))
+    cpuram1, cpuram2, storage1, storage2 = (
+        cached[1] if cached is not None and cached[0] is coef else milli_coefficients(coef)
+    )
+    per_hour_milli = (
+        (cpu * cpuram1 if cpu <= 2 else cpu * cpuram2)
+        + (ram * cpuram1 if ram <= 2 else ram * cpuram2)
+        + (storage * storage1 if storage < 81 else storage * storage2)
+    )
+    # ``divide(..., HALF_EVEN)`` inlined: this runs once per priced configuration,
+    # and the generic helper made it ~1.4x slower than the old float formula.
+    # Exact ties (e.g. 2,737,500) now round to even; floats got them wrong.
+    thousands, rest = divmod(per_hour_milli * HOURS_PER_MONTH, _MONTHLY_PRICE_DIVISOR)
+    if rest * 2 > _MONTHLY_PRICE_DIVISOR or (rest * 2 == _MONTHLY_PRICE_DIVISOR and thousands & 1):
+        thousands += 1
+    return thousands * PRICE_ROUNDING_UNIT
+
+def ceil_div(a: int, b: int) -> int:
+    return (a + b - 1) // b
+
+def get_specs_from_concurrency(concurrent: int):
+    """Logic mapping for sync: CU -> (CPU, RAM), from ``data/capacity_tiers.csv``."""
+    return get_capacity_tiers().specs_for(concurrent)
+
+def get_load_from_specs(cpu: int, ram: int) -> tuple[int, int]:
+    """Estimate traffic inputs from the selected CPU/RAM (``data/spec_load_rules.csv``)."""
+    return get_spec_load_rules().load_for(cpu, ram)
+
+def recommend_from_concurrency(concurrent: int) -> str:
+    tiers = get_capacity_tiers()
+    cpu, ram = tiers.specs_for(concurrent)
+    suffix = " (atau lebih)" if tiers.in_top_tier(concurrent) else ""
+    return f"{cpu} vCPU / {ram} GB RAM{suffix}"
+
+# ----------------------------
+# Additional Cost Config
+# ----------------------------
+OBJECT_STORAGE_PER_GB_MONTH = 507
+OBJECT_STORAGE_PER_GB_HOUR = 0.694
+SECURITY_SCAN_PER_PROJECT_MONTH = 100_000
+DEFAULT_DOMAIN_PRICE_YEARLY = 300_000
+VPS_RESERVE_MONTHS_PER_YEAR = 2
+MONTHS_PER_YEAR = 12
+# Rates in basis points; the float forms are kept for display.
+MONITORING_RATE_BP = 400
+PPN_RATE_BP = 1100
+MONITORING_RATE = MONITORING_RATE_BP / 10_000
+PPN_RATE = PPN_RATE_BP / 10_000
+DOMAIN_ACTION_OPTIONS = ["Register", "Renewal", "Transfer"]
+DOMAIN_PRICES_YEARLY = {
+    ".my.id": {"Register": 25_000, "Renewal": 25_000, "Transfer": 25_000},
+    ".biz.id": {"Register": 55_000, "Renewal": 55_000, "Transfer": 55_000},
+    ".ponpes.id": {"Register": 55_000, "Renewal": 55_000, "Transfer": 55_000},
+    ".sch.id": {"Register": 55_000, "Renewal": 55_000, "Transfer": 55_000},
+    ".ac.id": {"Register": 55_000, "Renewal": 100_000, "Transfer": 55_000},
+    ".or.id": {"Register": 55_000, "Renewal": 55_000, "Transfer": 55_000},
+    ".web.id": {"Register": 55_000, "Renewal": 55_000, "Transfer": 55_000},
+    ".id": {"Register": 210_000, "Renewal": 210_000, "Transfer": 210_000},
+    ".co.id": {"Register": 270_000, "Renewal": 300_000, "Transfer": 300_000},
+    ".net.id": {"Register": 400_000, "Renewal": 400_000, "Transfer": 400_000},
+    ".top": {"Register": 121_000, "Renewal": 121_000, "Transfer": 121_000},
+    ".xyz": {"Register": 292_000, "Renewal": 292_000, "Transfer": 292_000},
+    ".asia": {"Register": 235_000, "Renewal": 235_000, "Transfer": 235_000},
+    ".icu": {"Register": 287_300, "Renewal": 287_300, "Transfer": 287_300},
+    ".com": {"Register": 160_000, "Renewal": 185_000, "Transfer": 185_000},
+    ".click": {"Register": 190_000, "Renewal": 190_000, "Transfer": 190_000},
+    ".net": {"Register": 295_000, "Renewal": 295_000, "Transfer": 295_000},
+    ".org": {"Register": 230_000, "Renewal": 230_000, "Transfer": 230_000},
+    ".info": {"Register": 451_000, "Renewal": 451_000, "Transfer": 451_000},
+    ".vip": {"Register": 311_000, "Renewal": 311_000, "Transfer": 311_000},
+    ".website": {"Register": 640_000, "Renewal": 640_000, "Transfer": 640_000},
+    ".pw": {"Register": 415_000, "Renewal": 415_000, "Transfer": 415_000},
+    ".space": {"Register": 640_000, "Renewal": 640_000, "Transfer": 640_000},
+    ".co": {"Register": 641_000, "Renewal": 641_000, "Transfer": 641_000},
+    ".site": {"Register": 721_000, "Renewal": 721_000, "Transfer": 721_000},
+    ".com.sg": {"Register": 800_000, "Renewal": 800_000, "Transfer": 800_000},
+    ".design": {"Register": 1_150_000, "Renewal": 1_150_000, "Transfer": 1_150_000},
+    ".io": {"Register": 1_500_000, "Renewal": 1_500_000, "Transfer": 1_500_000},
+}
+
+UNKNOWN_DOMAIN_EXTENSION = "Lainnya"
+
+class DomainSuffixIndex:
+    """Reversed-label trie over the priced extensions.
+
+    ``.co.id`` is stored as ``id -> co``, so the longest matching extension
+    is found by walking a name's labels from the right: O(label count) per
+    lookup instead of sorting and scanning every extension.
+    """
+
+    __slots__ = ("_root", "_prices")
+
+    def __init__(self, prices_yearly: dict):
+        self._root = {}
+        for extension in prices_yearly:
+            node = self._root
+            for label in reversed(extension.lstrip(".").split(".")):
+                node = node.setdefault(label, {})
+            # None never collides with a label, so it marks "an extension ends here".
+            node[None] = extension
+        self._prices = {
+            (extension, action): price
+            for extension, actions in prices_yearly.items()
+            for action, price in actions.items()
+        }
+
+    def extension(self, domain_name: str) -> str:
+        labels = domain_name.strip().lower().split(".")
+        node = self._root
+        match = UNKNOWN_DOMAIN_EXTENSION
+        # Stop before labels[0]: ".id" only matches when something precedes the dot.
+        for position in range(len(labels) - 1, 0, -1):
+            node = node.get(labels[position])
+            if node is None:
+                break
+            match = node.get(None, match)
+        return match
+
+    def price(self, extension: str, action: str) -> int:
+        return self._prices.get((extension, action), DEFAULT_DOMAIN_PRICE_YEARLY)
+
+    def classify(self, domain_names, actions=None) -> list[tuple[str, int]]:
+        """Resolve (extension, yearly price) for many names at once.
+
+        ``actions`` is one action for every name or a sequence aligned with
+        ``domain_names``; it defaults to Register.
+        """
+        if actions is None or isinstance(actions, str):
+            action = actions or "Register"
+            actions = (action for _ in domain_names)
+        extension_of = self.extension
+        prices = self._prices
+        results = []
+        for domain_name, action in zip(domain_names, actions):
+            extension = extension_of(domain_name)
+            results.append((extension, prices.get((extension, action), DEFAULT_DOMAIN_PRICE_YEARLY)))
+        return results
+
+DOMAIN_SUFFIX_INDEX = DomainSuffixIndex(DOMAIN_PRICES_YEARLY)
+
+def get_domain_extension(domain_name: str) -> str:
+    return DOMAIN_SUFFIX_INDEX.extension(domain_name)
+
+def get_domain_yearly_price(extension: str, action: str) -> int:
+    return DOMAIN_SUFFIX_INDEX.price(extension, action)
+
+def classify_domains(domain_names, actions=None) -> list[tuple[str, int]]:
+    return DOMAIN_SUFFIX_INDEX.classify(domain_names, actions)
+
+def get_domain_period_price(domain: dict, duration_months: int) -> int:
+    return _period_price(int(domain.get("price_yearly", 0)), duration_months)
+
+def _period_price(yearly_price: int, duration_months: int) -> int:
+    return prorate(yearly_price, duration_months, MONTHS_PER_YEAR, HALF_EVEN)
+
+def get_buffer_months(duration_months: int) -> float:
+    """Scale the two-month annual VPS buffer to the application duration."""
+    return duration_months * VPS_RESERVE_MONTHS_PER_YEAR / MONTHS_PER_YEAR
+
+def get_vps_buffer_price(base_price: int) -> int:
+    """Buffer of ``VPS_RESERVE_MONTHS_PER_YEAR`` months per year on the VPS base price."""
+    return prorate(base_price, VPS_RESERVE_MONTHS_PER_YEAR, MONTHS_PER_YEAR, HALF_EVEN)
+
+def get_object_storage_price(object_storage_gb, duration_months: int) -> int:
+    return int(round(object_storage_gb * OBJECT_STORAGE_PER_GB_MONTH * duration_months))
+
+def format_duration_months(months: float) -> str:
+    if months >= 1:
+        return f"{months:g} bulan"
+
+    weeks = months * 4
+    rounded_weeks = round(weeks, 1)
+    return f"{rounded_weeks:g} minggu"
+
+def normalize_domain_entry(domain_entry):
+    if isinstance(domain_entry, dict):
+        domain_name = domain_entry.get("name", "").strip()
+        action = domain_entry.get("action", "Register")
+    else:
+        domain_name = str(domain_entry).strip()
+        action = "Register"
+
+    if action not in DOMAIN_ACTION_OPTIONS:
+        action = "Register"
+
+    extension = get_domain_extension(domain_name)
+    price = get_domain_yearly_price(extension, action)
+    return {
+        "name": domain_name,
+        "extension": extension,
+        "action": action,
+        "price_yearly": price,
+    }
+
+_ACTION_BY_LOWER = {action.lower(): action for action in DOMAIN_ACTION_OPTIONS}
+_IMPORT_SEPARATORS = str.maketrans({",": " ", ";": " ", "\t": " "})
+
+def parse_domain_import(lines, default_action: str = "Register", existing_names=()) -> tuple[list[dict], list[dict]]:
+    """Normalize pasted or uploaded domain lines in a single pass.
+
+    Each line holds a domain name and an optional action, separated by a
+    comma, semicolon, tab or spaces (so CSV and plain TXT both work). Names
+    are deduplicated case-insensitively against each other and against
+    ``existing_names``. Returns the normalized entries and the rejected
+    lines as ``{"line", "text", "reason"}`` dicts.
+    """
+    if isinstance(lines, str):
+        lines = lines.splitlines()
+    seen = {name.lower() for name in existing_names}
+    index = DOMAIN_SUFFIX_INDEX
+    entries = []
+    rejected = []
+    for line_number, raw_line in enumerate(lines, start=1):
+        text = raw_line.strip()
+        if not text or text.startswith("#"):
+            continue
+        fields = text.translate(_IMPORT_SEPARATORS).split()
+        domain_name = fields[0].strip("\"'")
+        action_text = fields[1].strip("\"'") if len(fields) > 1 else ""
+        if line_number == 1 and domain_name.lower() in ("name", "domain", "nama"):
+            continue  # CSV header
+        if len(fields) > 2:
+            rejected.append({"line": line_number, "text": text, "reason": "Kolom terlalu banyak"})
+            continue
+        if "." not in domain_name.strip("."):
+            rejected.append({"line": line_number, "text": text, "reason": "Nama domain tidak valid"})
+            continue
+        action = _ACTION_BY_LOWER.get(action_text.lower()) if action_text else default_action
+        if action is None:
+            rejected.append({"line": line_number, "text": text, "reason": f"Jenis domain tidak dikenal: {action_text}"})
+            continue
+        key = domain_name.lower()
+        if key in seen:
+            rejected.append({"line": line_number, "text": text, "reason": "Duplikat"})
+            continue
+        seen.add(key)
+        extension = index.extension(domain_name)
+        entries.append({
+            "name": domain_name,
+            "extension": extension,
+            "action": action,
+            "price_yearly": index.price(extension, action),
+        })
+    return entries, rejected
+
+class DomainEntry:
+    """One normalized domain; built once, when the domain is added or its action changes."""
+
+    __slots__ = ("name", "extension", "action", "price_yearly")
+
+    def __init__(self, name: str, extension: str, action: str, price_yearly: int):
+        self.name = name
+        self.extension = extension
+        self.action = action
+        self.price_yearly = price_yearly
+
+    @classmethod
+    def from_input(cls, domain_entry) -> "DomainEntry":
+        """Normalize a raw entry (dict, name, or an already normalized dict/entry)."""
+        if isinstance(domain_entry, DomainEntry):
+            return domain_entry
+        normalized = normalize_domain_entry(domain_entry)
+        return cls(normalized["name"], normalized["extension"], normalized["action"], normalized["price_yearly"])
+
+    def with_action(self, action: str) -> "DomainEntry":
+        """Same domain with another action; the extension is reused, not looked up again."""
+        if action not in DOMAIN_ACTION_OPTIONS:
+            action = "Register"
+        return DomainEntry(self.name, self.extension, action, get_domain_yearly_price(self.extension, action))
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "extension": self.extension,
+            "action": self.action,
+            "price_yearly": self.price_yearly,
+        }
+
+    def __repr__(self):
+        return f"DomainEntry({self.name!r}, {self.action!r}, {self.price_yearly})"
+
+class DomainList:
+    """The estimator's domains, normalized once and priced incrementally.
+
+    Each mutation normalizes only the entries it touches and updates a count
+    of entries per yearly price, so ``period_total`` costs O(distinct prices)
+    regardless of list size. Derived views (``as_dicts``, ``cost_items``,
+    ``fingerprint``) are built lazily and cached until the next mutation.
+    """
+
+    __slots__ = ("_entries", "_names", "_price_counts", "_extension_counts", "version", "_views")
+
+    def __init__(self, domains=()):
+        self._entries: list[DomainEntry] = []
+        self._names: set[str] = set()
+        self._price_counts: dict[int, int] = {}
+        self._extension_counts: dict[str, int] = {}
+        self.version = 0
+        self._views = {}
+        for domain in domains:
+            self._insert(DomainEntry.from_input(domain))
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __getitem__(self, index: int) -> DomainEntry:
+        return self._entries[index]
+
+    @property
+    def names(self) -> set[str]:
+        """Lower-cased names, for duplicate checks. Read-only."""
+        return self._names
+
+    def _count(self, entry: DomainEntry, delta: int):
+        for counts, key in ((self._price_counts, entry.price_yearly), (self._extension_counts, entry.extension)):
+            remaining = counts.get(key, 0) + delta
+            if remaining:
+                counts[key] = remaining
+            else:
+                counts.pop(key, None)
+
+    def _insert(self, entry: DomainEntry):
+        self._entries.append(entry)
+        self._names.add(entry.name.lower())
+        self._count(entry, 1)
+
+    def _changed(self):
+        self.version += 1
+        self._views.clear()
+
+    def add(self, domain_entry) -> bool:
+        """Add one raw entry unless its name is already present (case-insensitive)."""
+        name = domain_entry.get("name", "") if isinstance(domain_entry, dict) else str(domain_entry)
+        if name.strip().lower() in self._names:
+            return False
+        self._insert(DomainEntry.from_input(domain_entry))
+        self._changed()
+        return True
+
+    def extend_normalized(self, entries) -> int:
+        """Append entries that are already normalized (e.g. from ``parse_domain_import``)."""
+        added = 0
+        for entry in entries:
+            if not isinstance(entry, DomainEntry):
+                entry = DomainEntry(entry["name"], entry["extension"], entry["action"], entry["price_yearly"])
+            self._insert(entry)
+            added += 1
+        if added:
+            self._changed()
+        return added
+
+    def set_action(self, index: int, action: str) -> bool:
+        if not 0 <= index < len(self._entries) or self._entries[index].action == action:
+            return False
+        old = self._entries[index]
+        new = old.with_action(action)
+        self._count(old, -1)
+        self._count(new, 1)
+        self._entries[index] = new
+        self._changed()
+        return True
+
+    def set_action_by_extension(self, extension: str | None, action: str) -> int:
+        """Set ``action`` on every domain with ``extension`` (all domains when None)."""
+        changed = 0
+        for index, entry in enumerate(self._entries):
+            if extension in (None, entry.extension) and entry.action != action:
+                old, new = entry, entry.with_action(action)
+                self._count(old, -1)
+                self._count(new, 1)
+                self._entries[index] = new
+                changed += 1
+        if changed:
+            self._changed()
+        return changed
+
+    def remove(self, indices) -> int:
+        drop = {index for index in indices if 0 <= index < len(self._entries)}
+        if not drop:
+            return 0
+        kept = []
+        for index, entry in enumerate(self._entries):
+            if index in drop:
+                self._names.discard(entry.name.lower())
+                self._count(entry, -1)
+            else:
+                kept.append(entry)
+        self._entries = kept
+        self._changed()
+        return len(drop)
+
+    def extensions(self) -> list[str]:
+        return sorted(self._extension_counts)
+
+    def period_total(self, duration_months: int) -> int:
+        """Sum of ``get_domain_period_price`` over all domains, from the per-price counts."""
+        return sum(
+            count * _period_price(price_yearly, duration_months)
+            for price_yearly, count in self._price_counts.items()
+        )
+
+    def _view(self, key, build):
+        view = self._views.get(key)
+        if view is None:
+            view = self._views[key] = build()
+        return view
+
+    def as_dicts(self) -> list[dict]:
+        return self._view("dicts", lambda: [entry.to_dict() for entry in self._entries])
+
+    def cost_items(self, duration_months: int) -> list[dict]:
+        """``domain_cost_items`` rows of the quote breakdown for ``duration_months``."""
+        def build():
+            period_prices = {price: _period_price(price, duration_months) for price in self._price_counts}
+            return [
+                {**entry.to_dict(), "period_price": period_prices[entry.price_yearly]}
+                for entry in self._entries
+            ]
+
+        return self._view(("cost_items", duration_months), build)
+
+    def fingerprint(self) -> str:
+        """Content hash of the names and actions, used in cache keys."""
+        def build():
+            digest = hashlib.sha256()
+            for entry in self._entries:
+                digest.update(f"{entry.name}\0{entry.action}\n".encode("utf-8"))
+            return digest.hexdigest()
+
+        return self._view("fingerprint", build)
+
+def normalized_domains(domains) -> list[dict]:
+    """Normalized dict rows for a ``DomainList`` (cached) or any iterable of raw entries."""
+    if isinstance(domains, DomainList):
+        return domains.as_dicts()
+    return [normalize_domain_entry(domain) for domain in domains or ()]
+
+def get_monitoring_fee(pre_tax_subtotal: int) -> int:
+    """Mandatory monitoring, 4% of the taxable subtotal."""
+    return apply_rate(int(pre_tax_subtotal), MONITORING_RATE_BP, FLOOR)
+
+def get_tax_fee(taxable_amount: int) -> int:
+    """PPN 11% over the subtotal plus monitoring."""
+    return apply_rate(int(taxable_amount), PPN_RATE_BP, FLOOR)
+
+def get_concurrent_users(users_per_hour: int, session_seconds: int) -> int:
+    return ceil_div(int(users_per_hour * session_seconds), 3600)
+
+# ----------------------------
+# Quote
+# ----------------------------
+def quote(inputs: dict, coefficients: dict | None = None) -> dict:
+    """Price one estimate and return the full cost breakdown.
+
+    ``inputs`` uses the same keys as the estimator page: ``cpu``, ``ram``,
+    ``storage``, ``object_storage_gb``, ``duration_months``, ``domains``,
+    ``include_vps_buffer``, ``include_security_scan`` and
+    ``security_scan_monthly_price``. The VPS coefficients come from
+    ``inputs["coef"]`` or are looked up by ``inputs["variant"]`` in
+    ``coefficients`` (defaults to the cached ``data/cloud_vps_coeff.json``).
+    """
+    coef = inputs.get("coef")
+    if coef is None:
+        if coefficients is None:
+            coefficients = get_cloud_vps_coefficients()
+        coef = coefficients[inputs["variant"]]
+
+    monthly_base_price = calculate_cloud_vps(
+        int(inputs["cpu"]), int(inputs["ram"]), int(inputs["storage"]), coef
+    )
+    return price_breakdown(monthly_base_price, inputs)
+
+def price_breakdown(monthly_base_price: int, inputs: dict) -> dict:
+    """Run the cost pipeline for a server that costs ``monthly_base_price`` per month.
+
+    ``quote`` feeds it the Cloud VPS price; fixed-price plans can call it
+    directly so every option goes through the same buffer/monitoring/PPN steps.
+    """
+    duration_months = int(inputs.get("duration_months", 12))
+    include_vps_buffer = bool(inputs.get("include_vps_buffer", True))
+    include_security_scan = bool(inputs.get("include_security_scan", True))
+
+    buffer_months = get_buffer_months(duration_months)
+    security_scan_monthly_price = (
+        int(inputs.get("security_scan_monthly_price", SECURITY_SCAN_PER_PROJECT_MONTH))
+        if include_security_scan
+        else 0
+    )
+    base_price = monthly_base_price * duration_months
+    vps_buffer_price = get_vps_buffer_price(base_price) if include_vps_buffer else 0
+    object_storage_price = get_object_storage_price(inputs.get("object_storage_gb", 0), duration_months)
+    security_scan_price = security_scan_monthly_price * duration_months
+    domains = inputs.get("domains", [])
+    if isinstance(domains, DomainList):
+        # Already normalized; the total comes from the per-price counts.
+        domain_cost_items = domains.cost_items(duration_months)
+        domain_price = domains.period_total(duration_months)
+    else:
+        domain_cost_items = [
+            {
+                **domain,
+                "period_price": get_domain_period_price(domain, duration_months),
+            }
+            for domain in (normalize_domain_entry(entry) for entry in domains)
+        ]
+        domain_price = sum(domain["period_price"] for domain in domain_cost_items)
+
+    pre_tax_subtotal = base_price + vps_buffer_price + object_storage_price + domain_price
+    monitoring_fee = get_monitoring_fee(pre_tax_subtotal)
+    tax_fee = get_tax_fee(pre_tax_subtotal + monitoring_fee)
+    total_price = pre_tax_subtotal + monitoring_fee + tax_fee + security_scan_price
+
+    return {
+        "monthly_base_price": monthly_base_price,
+        "duration_months": duration_months,
+        "buffer_months": buffer_months,
+        "buffer_duration_label": format_duration_months(buffer_months),
+        "unit_label": f" ({duration_months} bulan)",
+        "include_vps_buffer": include_vps_buffer,
+        "include_security_scan": include_security_scan,
+        "base_price": base_price,
+        "vps_buffer_price": vps_buffer_price,
+        "object_storage_price": object_storage_price,
+        "security_scan_monthly_price": security_scan_monthly_price,
+        "security_scan_price": security_scan_price,
+        "domain_cost_items": domain_cost_items,
+        "domain_price": domain_price,
+        "pre_tax_subtotal": pre_tax_subtotal,
+        "monitoring_fee": monitoring_fee,
+        "tax_fee": tax_fee,
+        "total_price": total_price,
+    }
@@ -0,0 +1,175 @@
+"""Vectorized Cloud VPS pricing over NumPy arrays of configurations.
+
+Every step calls the same integer ``money`` helpers as the scalar path in
+``pricing`` (milli-rupiah coefficients, basis-point rates, the same rounding
+rule per step) on int64 arrays, so each row comes out bit-identical to
+``pricing.quote``.
+"""
+import numpy as np
+
+from catalog import get_cloud_vps_coefficients
+from money import FLOOR, HALF_EVEN, MILLI, apply_rate, divide, prorate
+from pricing import (
+    HOURS_PER_MONTH,
+    MONITORING_RATE_BP,
+    MONTHS_PER_YEAR,
+    OBJECT_STORAGE_PER_GB_MONTH,
+    PPN_RATE_BP,
+    PRICE_ROUNDING_UNIT,
+    SECURITY_SCAN_PER_PROJECT_MONTH,
+    VPS_RESERVE_MONTHS_PER_YEAR,
+    milli_coefficients,
+)
+
+
+# ----------------------------
+# Coefficients
+# ----------------------------
+def coefficient_table(coefficients: dict) -> tuple[list[str], np.ndarray]:
+    """Variant names plus a (variants, 4) int64 table of their milli-rupiah coefficients."""
+    names = list(coefficients)
+    table = np.array([milli_coefficients(coefficients[name]) for name in names], dtype=np.int64)
+    return names, table
+
+
+def variant_indices(variant, names: list[str]) -> np.ndarray:
+    """Accept variant names or integer positions and return positions into ``names``.
+
+    Positions are checked against ``names``: a negative or too large index
+    raises ``ValueError`` instead of wrapping around to another variant.
+    """
+    variant = np.asarray(variant)
+    if variant.dtype.kind in "iu":
+        if variant.size and (variant.min() < 0 or variant.max() >= len(names)):
+            raise ValueError(f"Cloud VPS variant index out of range 0..{len(names) - 1}.")
+        return variant.astype(np.intp)
+    lookup = {name: index for index, name in enumerate(names)}
+    try:
+        return np.array([lookup[str(name)] for name in variant.ravel()], dtype=np.intp).reshape(variant.shape)
+    except KeyError as exc:
+        raise KeyError(f"Unknown Cloud VPS variant: {exc.args[0]}") from None
+
+
+# ----------------------------
+# Batch pricing
+# ----------------------------
+def calculate_cloud_vps_batch(cpu, ram, storage, variant, coefficients: dict | None = None) -> np.ndarray:
+    """Monthly Cloud VPS price for every row, rounded to 1000 rupiah like ``calculate_cloud_vps``."""
+    if coefficients is None:
+        coefficients = get_cloud_vps_coefficients()
+    names, table = coefficient_table(coefficients)
+    coef = table[variant_indices(variant, names)]
+
+    cpu = np.asarray(cpu, dtype=np.int64)
+    ram = np.asarray(ram, dtype=np.int64)
+    storage = np.asarray(storage, dtype=np.int64)
+    cpuram1, cpuram2, storage1, storage2 = coef[..., 0], coef[..., 1], coef[..., 2], coef[..., 3]
+
+    per_hour_milli = (
+        np.where(cpu <= 2, cpu * cpuram1, cpu * cpuram2)
+        + np.where(ram <= 2, ram * cpuram1, ram * cpuram2)
+        + np.where(storage < 81, storage * storage1, storage * storage2)
+    )
+    per_month_milli = per_hour_milli * HOURS_PER_MONTH
+    return divide(per_month_milli, MILLI * PRICE_ROUNDING_UNIT, HALF_EVEN) * PRICE_ROUNDING_UNIT
+
+
+def quote_batch(
+    cpu,
+    ram,
+    storage,
+    variant,
+    object_storage_gb=0,
+    duration_months=12,
+    domain_price=0,
+    include_vps_buffer=True,
+    include_security_scan=True,
+    security_scan_monthly_price=SECURITY_SCAN_PER_PROJECT_MONTH,
+    coefficients: dict | None = None,
+) -> dict:
+    """Price many estimates at once and return the breakdown as int64 vectors.
+
+    Arguments broadcast against each other, so scalars apply to every row.
+    ``domain_price`` is the already period-priced domain total per row.
+    """
+    monthly_base_price = calculate_cloud_vps_batch(cpu, ram, storage, variant, coefficients)
+    return price_breakdown_batch(
+        monthly_base_price,
+        object_storage_gb=object_storage_gb,
+        duration_months=duration_months,
+        domain_price=domain_price,
+        include_vps_buffer=include_vps_buffer,
+        include_security_scan=include_security_scan,
+        security_scan_monthly_price=security_scan_monthly_price,
+    )
+
+
+def price_breakdown_batch(
+    monthly_base_price,
+    object_storage_gb=0,
+    duration_months=12,
+    domain_price=0,
+    include_vps_buffer=True,
+    include_security_scan=True,
+    security_scan_monthly_price=SECURITY_SCAN_PER_PROJECT_MONTH,
+) -> dict:
+    """``pricing.price_breakdown`` over arrays, for servers with a known monthly price.
+
+    Every argument broadcasts against the others, so a scalar monthly price
+    with a column of durations and a row of storage sizes yields the whole
+    duration x storage grid.
+    """
+    shape = np.broadcast_shapes(*(
+        np.shape(value)
+        for value in (
+            monthly_base_price,
+            object_storage_gb,
+            duration_months,
+            domain_price,
+            include_vps_buffer,
+            include_security_scan,
+            security_scan_monthly_price,
+        )
+    ))
+    monthly_base_price = np.broadcast_to(np.asarray(monthly_base_price, dtype=np.int64), shape)
+    duration_months = np.broadcast_to(np.asarray(duration_months, dtype=np.int64), shape)
+    include_vps_buffer = np.broadcast_to(np.asarray(include_vps_buffer, dtype=bool), shape)
+    include_security_scan = np.broadcast_to(np.asarray(include_security_scan, dtype=bool), shape)
+    object_storage_gb = np.broadcast_to(np.asarray(object_storage_gb), shape)
+    domain_price = np.broadcast_to(np.asarray(domain_price, dtype=np.int64), shape)
+
+    base_price = monthly_base_price * duration_months
+    vps_buffer_price = np.where(
+        include_vps_buffer,
+        prorate(base_price, VPS_RESERVE_MONTHS_PER_YEAR, MONTHS_PER_YEAR, HALF_EVEN),
+        0,
+    )
+    object_storage_price = np.round(
+        object_storage_gb * OBJECT_STORAGE_PER_GB_MONTH * duration_months
+    ).astype(np.int64)
+    security_scan_monthly_price = np.where(
+        include_security_scan,
+        np.broadcast_to(np.asarray(security_scan_monthly_price, dtype=np.int64), shape),
+        0,
+    )
+    security_scan_price = security_scan_monthly_price * duration_months
+
+    pre_tax_subtotal = base_price + vps_buffer_price + object_storage_price + domain_price
+    monitoring_fee = apply_rate(pre_tax_subtotal, MONITORING_RATE_BP, FLOOR)
+    tax_fee = apply_rate(pre_tax_subtotal + monitoring_fee, PPN_RATE_BP, FLOOR)
+    total_price = pre_tax_subtotal + monitoring_fee + tax_fee + security_scan_price
+
+    return {
+        "monthly_base_price": monthly_base_price,
+        "duration_months": duration_months,
+        "base_price": base_price,
+        "vps_buffer_price": vps_buffer_price,
+        "object_storage_price": object_storage_price,
+        "security_scan_monthly_price": security_scan_monthly_price,
+        "security_scan_price": security_scan_price,
+        "domain_price": domain_price,
+        "pre_tax_subtotal": pre_tax_subtotal,
+        "monitoring_fee": monitoring_fee,
+        "tax_fee": tax_fee,
+        "total_price": total_price,
+    }
@@ -0,0 +1,183 @@
+"""Opt-in per-section rerun profiling for the Streamlit pages.
+
+Enable with ``IDCH_PROFILE=1`` in the environment or ``?profile=1`` in the
+page URL. The page calls ``profiler.mark("section")`` at each section
+boundary; the time between two marks is charged to the earlier section.
+``RerunHistory`` keeps a rolling window of per-section timings and, when
+cProfile capture is on, the raw profiles of the last few reruns so they can
+be dumped as one merged pstats file.
+
+Fragment reruns (see ``st.fragment``) are recorded with ``scope="fragment"``
+and get their own total row, since they only time part of the page.
+
+Streamlit runs every session in one process, and from Python 3.12 only one
+cProfile can be active per process, so one rerun captures at a time; a rerun
+that finds a capture running is timed without one (``cprofile_skipped``).
+"""
+import cProfile
+import os
+import pstats
+import statistics
+import tempfile
+import threading
+import time
+from collections import deque
+
+PROFILE_ENV_VAR = "IDCH_PROFILE"
+PROFILE_QUERY_PARAM = "profile"
+TRUTHY = {"1", "true", "yes", "on"}
+SCOPE_TOTAL_LABELS = {"app": "Total", "fragment": "Total (fragment)"}
+
+_capture_lock = threading.Lock()
+
+
+def profiling_enabled(query_value=None) -> bool:
+    if os.environ.get(PROFILE_ENV_VAR, "").strip().lower() in TRUTHY:
+        return True
+    return str(query_value or "").strip().lower() in TRUTHY
+
+
+class RerunProfiler:
+    """Times the sections of one rerun."""
+
+    __slots__ = (
+        "history", "scope", "sections", "done", "capture_skipped",
+        "_current", "_started", "_rerun_started", "_profile", "_capturing",
+    )
+
+    def __init__(self, history: "RerunHistory", capture_cprofile: bool = False, scope: str = "app"):
+        self.history = history
+        self.scope = scope
+        self.done = False
+        self.sections: list[tuple[str, float]] = []
+        self._current = None
+        self._rerun_started = self._started = time.perf_counter()
+        self._profile = None
+        self._capturing = False
+        self.capture_skipped = False
+        if capture_cprofile:
+            self._start_capture()
+
+    def _start_capture(self):
+        if not _capture_lock.acquire(blocking=False):
+            self.capture_skipped = True
+            return
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:  # another profiling tool is active in this process
+            _capture_lock.release()
+            self.capture_skipped = True
+            return
+        self._profile = profile
+        self._capturing = True
+
+    def stop_capture(self):
+        """Disable the cProfile capture, if this rerun holds it."""
+        if self._capturing:
+            self._capturing = False
+            self._profile.disable()
+            _capture_lock.release()
+
+    def mark(self, section: str):
+        """Close the running section (if any) and start timing ``section``."""
+        now = time.perf_counter()
+        if self._current is not None:
+            self.sections.append((self._current, now - self._started))
+        self._current = section
+        self._started = now
+
+    def finish(self) -> dict:
+        now = time.perf_counter()
+        self.stop_capture()
+        if self._current is not None:
+            self.sections.append((self._current, now - self._started))
+            self._current = None
+        self.done = True
+        record = {
+            "scope": self.scope,
+            "total": now - self._rerun_started,
+            "sections": dict(self.sections),
+            "cprofile_skipped": self.capture_skipped,
+        }
+        self.history.add(record, self._profile)
+        return record
+
+
+class _NullProfiler:
+    """Stand-in used when profiling is off; every call is a no-op."""
+
+    __slots__ = ()
+    done = False
+
+    def mark(self, section: str):
+        pass
+
+    def finish(self):
+        return None
+
+
+NULL_PROFILER = _NullProfiler()
+
+
+class RerunHistory:
+    """Rolling per-session record of rerun timings and cProfile captures."""
+
+    def __init__(self, max_reruns: int = 50, max_profiles: int = 5):
+        self.records = deque(maxlen=max_reruns)
+        self.profiles = deque(maxlen=max_profiles)
+        self._capturing = None
+
+    def start(self, enabled: bool, capture_cprofile: bool = False, scope: str = "app"):
+        if self._capturing is not None:
+            # No-op unless the previous rerun ended before ``finish`` (e.g. ``st.rerun``).
+            self._capturing.stop_capture()
+            self._capturing = None
+        if not enabled:
+            return NULL_PROFILER
+        profiler = RerunProfiler(self, capture_cprofile, scope)
+        if capture_cprofile:
+            self._capturing = profiler
+        return profiler
+
+    def add(self, record: dict, profile: cProfile.Profile | None = None):
+        self.records.append(record)
+        if profile is not None:
+            self.profiles.append(profile)
+
+    def summary(self) -> list[dict]:
+        """Last/mean/max milliseconds per section over the rolling window."""
+        if not self.records:
+            return []
+        names = list(dict.fromkeys(name for record in self.records for name in record["sections"]))
+        series = [
+            (name, [record["sections"][name] for record in self.records if name in record["sections"]])
+            for name in names
+        ]
+        for scope, label in SCOPE_TOTAL_LABELS.items():
+            totals = [record["total"] for record in self.records if record["scope"] == scope]
+            if totals:
+                series.append((label, totals))
+        rows = []
+        for name, values in series:
+            rows.append({
+                "Bagian": name,
+                "Terakhir (ms)": round(values[-1] * 1000, 2),
+                "Rata-rata (ms)": round(statistics.fmean(values) * 1000, 2),
+                "Maks (ms)": round(max(values) * 1000, 2),
+                "Rerun": len(values),
+            })
+        return rows
+
+    def dump_stats(self, path=None) -> str | None:
+        """Merge the kept cProfile captures into one pstats file and return its path."""
+        if not self.profiles:
+            return None
+        if path is None:
+            fd, path = tempfile.mkstemp(prefix="idch-rerun-", suffix=".pstats")
+            os.close(fd)
+        stats = pstats.Stats(self.profiles[0])
+        for profile in list(self.profiles)[1:]:
+            stats.add(profile)
+        stats.dump_stats(path)
+        return path
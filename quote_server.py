@@ -0,0 +1,287 @@
+"""Small asyncio JSON HTTP service around the pricing engine.
+
+Endpoints (all JSON)::
+
+    POST /quote          one quote request, same fields as batch_quote.py
+    POST /quote/batch    {"quotes": [...]} or a bare list of quote requests
+    POST /sweep          {"quote": {...}, "duration_months": [1, 2, ...], "object_storage_gb": [0, 100, ...]}
+    GET  /recommend      ?users_per_hour=3600&session_seconds=60 (or POST a JSON body);
+                         hourly_users=<24 or 168 values> sizes for the peak hour instead
+    GET  /health
+
+The coefficient catalog is loaded once at startup. Connections are HTTP/1.1
+keep-alive, so portals can reuse one socket for many quotes. Quote fields
+are checked like ``batch_quote.py`` rows (``batch_quote.INPUT_LIMITS``,
+domain entries); invalid input is a 400, and an unexpected error is logged
+and answered with a JSON 500 instead of dropping the connection.
+
+Usage::
+
+    python quote_server.py --port 8765
+"""
+import argparse
+import asyncio
+import json
+import logging
+from urllib.parse import parse_qsl, urlsplit
+
+from batch_quote import build_inputs, price_row
+from capacity import parse_hourly_profile, profile_stats
+from catalog import get_cloud_vps_coefficients
+from pricing import get_concurrent_users, get_specs_from_concurrency, recommend_from_concurrency
+
+MAX_BODY_BYTES = 8 * 1024 * 1024
+MAX_HEADER_LINES = 100
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+logger = logging.getLogger("quote_server")
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def check_traffic(users_per_hour: int, session_seconds: int):
+    """Same minimums as the page's traffic inputs."""
+    if users_per_hour < 0:
+        raise HttpError(400, "users_per_hour tidak boleh negatif.")
+    if session_seconds < 1:
+        raise HttpError(400, "session_seconds minimal 1.")
+
+
+class QuoteService:
+    """Request handlers; holds the catalog snapshot taken at startup."""
+
+    def __init__(self, coefficients: dict | None = None):
+        self.coefficients = coefficients if coefficients is not None else get_cloud_vps_coefficients()
+        self.routes = {
+            ("POST", "/quote"): self.quote,
+            ("POST", "/quote/batch"): self.quote_batch,
+            ("POST", "/sweep"): self.sweep,
+            ("GET", "/recommend"): self.recommend,
+            ("POST", "/recommend"): self.recommend,
+            ("GET", "/health"): self.health,
+        }
+
+    def dispatch(self, method: str, target: str, body: bytes) -> dict | list:
+        url = urlsplit(target)
+        handler = self.routes.get((method, url.path))
+        if handler is None:
+            if any(path == url.path for _, path in self.routes):
+                raise HttpError(405, f"{method} tidak didukung untuk {url.path}")
+            raise HttpError(404, f"Endpoint tidak ditemukan: {url.path}")
+        params = dict(parse_qsl(url.query))
+        if body:
+            try:
+                payload = json.loads(body)
+            except ValueError as exc:
+                raise HttpError(400, f"JSON tidak valid: {exc}") from None
+        else:
+            payload = None
+        return handler(params, payload)
+
+    def quote(self, params: dict, payload) -> dict:
+        if not isinstance(payload, dict):
+            raise HttpError(400, "Body harus berupa objek JSON quote.")
+        result = price_row(payload, self.coefficients)
+        if result["error"]:
+            raise HttpError(400, result["error"])
+        return result
+
+    def quote_batch(self, params: dict, payload) -> list:
+        quotes = payload.get("quotes") if isinstance(payload, dict) else payload
+        if not isinstance(quotes, list):
+            raise HttpError(400, 'Body harus berupa list atau {"quotes": [...]}.')
+        return [price_row(item, self.coefficients) for item in quotes]
+
+    def sweep(self, params: dict, payload) -> dict:
+        if not isinstance(payload, dict) or not isinstance(payload.get("quote"), dict):
+            raise HttpError(400, 'Body harus berupa {"quote": {...}, "duration_months": [...], "object_storage_gb": [...]}.')
+        # NumPy and the sweep are imported on the first /sweep request, not at startup.
+        from sweep import sweep, sweep_rows
+
+        try:
+            result = sweep(
+                build_inputs(payload["quote"]),
+                duration_months=payload.get("duration_months"),
+                object_storage_gb=payload.get("object_storage_gb"),
+                coefficients=self.coefficients,
+            )
+        except (KeyError, ValueError, TypeError) as exc:
+            raise HttpError(400, f"{type(exc).__name__}: {exc}") from None
+        return {
+            "monthly_base_price": result["monthly_base_price"],
+            "duration_months": result["duration_months"].tolist(),
+            "object_storage_gb": result["object_storage_gb"].tolist(),
+            "points": sweep_rows(result),
+        }
+
+    def recommend(self, params: dict, payload) -> dict:
+        values = {**params, **(payload if isinstance(payload, dict) else {})}
+        if values.get("hourly_users") is not None:
+            return self.recommend_profile(values)
+        try:
+            users_per_hour = int(values["users_per_hour"])
+            session_seconds = int(values["session_seconds"])
+        except (KeyError, TypeError, ValueError):
+            raise HttpError(400, "users_per_hour dan session_seconds wajib berupa angka.") from None
+        check_traffic(users_per_hour, session_seconds)
+        concurrent = get_concurrent_users(users_per_hour, session_seconds)
+        cpu, ram = get_specs_from_concurrency(concurrent)
+        return {
+            "users_per_hour": users_per_hour,
+            "session_seconds": session_seconds,
+            "concurrent": concurrent,
+            "cpu": cpu,
+            "ram": ram,
+            "recommendation": recommend_from_concurrency(concurrent),
+        }
+
+    def recommend_profile(self, values: dict) -> dict:
+        """Size for the peak hour of ``hourly_users`` (24 or 168 values, list or comma-separated)."""
+        hourly_users = values["hourly_users"]
+        try:
+            session_seconds = int(values["session_seconds"])
+            if not isinstance(hourly_users, str):
+                hourly_users = " ".join(str(int(users)) for users in hourly_users)
+        except (KeyError, TypeError, ValueError):
+            raise HttpError(400, "hourly_users dan session_seconds wajib berupa angka.") from None
+        check_traffic(0, session_seconds)
+        try:
+            hourly_users = parse_hourly_profile(hourly_users)
+        except ValueError as exc:
+            raise HttpError(400, str(exc)) from None
+        profile = profile_stats(hourly_users, session_seconds)
+        concurrent = int(profile["peak"])
+        cpu, ram = get_specs_from_concurrency(concurrent)
+        return {
+            "session_seconds": session_seconds,
+            "hours": len(hourly_users),
+            "concurrent": concurrent,
+            "p95_concurrent": int(profile["p95"]),
+            "mean_concurrent": round(float(profile["mean"]), 2),
+            "hourly_concurrent": profile["concurrency"].tolist(),
+            "cpu": cpu,
+            "ram": ram,
+            "recommendation": recommend_from_concurrency(concurrent),
+        }
+
+    def health(self, params: dict, payload) -> dict:
+        return {"status": "ok", "variants": list(self.coefficients)}
+
+
+# ----------------------------
+# HTTP plumbing
+# ----------------------------
+def encode_response(status: int, payload, keep_alive: bool) -> bytes:
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status} {REASONS.get(status, 'Error')}\r\n"
+        "Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        "\r\n"
+    )
+    return head.encode("ascii") + body
+
+
+async def read_request(reader: asyncio.StreamReader):
+    """Parse one request; returns None when the client closed the connection."""
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    try:
+        method, target, version = request_line.decode("latin-1").split()
+    except ValueError:
+        raise HttpError(400, "Request line tidak valid.") from None
+
+    headers = {}
+    for _ in range(MAX_HEADER_LINES):
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    else:
+        raise HttpError(400, "Header terlalu banyak.")
+
+    try:
+        length = int(headers.get("content-length") or 0)
+    except ValueError:
+        raise HttpError(400, "Content-Length tidak valid.") from None
+    if length > MAX_BODY_BYTES:
+        raise HttpError(413, "Body terlalu besar.")
+    body = await reader.readexactly(length) if length else b""
+
+    connection = headers.get("connection", "").lower()
+    keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+    return method.upper(), target, body, keep_alive
+
+
+def make_handler(service: QuoteService):
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except HttpError as exc:
+                    writer.write(encode_response(exc.status, {"error": exc.message}, False))
+                    break
+                if request is None:
+                    break
+                method, target, body, keep_alive = request
+                try:
+                    status, payload = 200, service.dispatch(method, target, body)
+                except HttpError as exc:
+                    status, payload = exc.status, {"error": exc.message}
+                except Exception:
+                    logger.exception("Gagal memproses %s %s", method, target)
+                    status, payload = 500, {"error": "Terjadi kesalahan internal pada server."}
+                writer.write(encode_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    return handle
+
+
+async def start_server(host: str = "127.0.0.1", port: int = 8765, service: QuoteService | None = None):
+    return await asyncio.start_server(make_handler(service or QuoteService()), host, port)
+
+
+async def serve(host: str, port: int):
+    server = await start_server(host, port)
+    addresses = ", ".join(str(sock.getsockname()) for sock in server.sockets)
+    print(f"Quote service listening on {addresses}")
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve estimator quotes over a local JSON HTTP API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
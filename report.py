@@ -0,0 +1,306 @@
+"""PDF export for the estimator page.
+
+``get_pdf_report`` is the entry point the UI uses: rendered reports are kept
+in a small process-wide LRU keyed by a hash of the quote inputs plus the
+export timestamp printed in the header, so reruns of the same export are
+free and a new export never gets an older timestamp.
+
+reportlab is imported on the first render, not at module import: the page
+imports this module on every cold start but most sessions never export.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from io import BytesIO
+from typing import TYPE_CHECKING
+
+from pricing import DomainList, get_domain_period_price, normalized_domains
+
+PDF_CACHE_SIZE = 128
+# Left out of ``pdf_cache_key``, which identifies the estimate; ``get_pdf_report``
+# adds them back to its cache key because the PDF prints them.
+PDF_CACHE_EXCLUDED_KEYS = ("exported_at_str",)
+# Derived fields, left out of the key when the field they derive from is present.
+PDF_CACHE_DERIVED_KEYS = {"domain_cost_items": "domains"}
+
+_pdf_cache: OrderedDict[str, bytes] = OrderedDict()
+_pdf_cache_lock = threading.Lock()
+
+if TYPE_CHECKING:
+    from reportlab.pdfgen import canvas
+
+# ----------------------------
+# PDF Export
+# ----------------------------
+def page_size() -> tuple[float, float]:
+    from reportlab.lib.pagesizes import A4, landscape
+
+    return landscape(A4)
+
+
+def new_canvas(target) -> "canvas.Canvas":
+    from reportlab.pdfgen import canvas
+
+    # invariant=1 keeps reportlab from stamping creation dates and random IDs,
+    # so identical inputs render identical bytes.
+    return canvas.Canvas(target, pagesize=page_size(), invariant=1)
+
+
+def build_pdf_report(data: dict) -> bytes:
+    buf = BytesIO()
+    c = new_canvas(buf)
+    draw_estimate_page(c, data)
+    c.save()
+    return buf.getvalue()
+
+
+class _Layout:
+    """Header, label/value rows and footer of the estimate pages.
+
+    Rows that would run into the footer continue on a new page with the
+    same header, so long domain lists and large fleets stay readable.
+    """
+
+    def __init__(self, c: "canvas.Canvas", exported_at: str):
+        from reportlab.lib.units import cm
+
+        self.c = c
+        self.exported_at = exported_at
+        self.width, self.height = page_size()
+        self.margin_x = 2 * cm
+        self.top_y = self.height - 2 * cm
+        # Column positions (label/value)
+        self.label_x = self.margin_x
+        self.value_x = self.margin_x + 8.5 * cm  # adjust to taste for alignment
+        self.right_x = self.width - self.margin_x
+        self.footer_y = 2.2 * cm
+        self.footer_text_y = 1.7 * cm
+        self.pages = 0
+        self.header()
+
+    def header(self):
+        c = self.c
+        self.pages += 1
+        if self.pages > 1:
+            c.setFillColorRGB(0, 0, 0)
+            c.setStrokeColorRGB(0, 0, 0)
+
+        # ---- Header
+        c.setFont("Helvetica-Bold", 16)
+        c.drawString(self.margin_x, self.top_y, "DATA LAB INDONESIA (DLI)")
+
+        c.setFont("Helvetica", 10)
+        c.drawString(self.margin_x, self.top_y - 16, "Estimasi spesifikasi dan biaya infrastruktur digital")
+
+        c.setFont("Helvetica", 10)
+        c.drawRightString(self.right_x, self.top_y, f"Tanggal Export: {self.exported_at}")
+
+        # Divider line
+        c.setLineWidth(1)
+        c.line(self.margin_x, self.top_y - 28, self.right_x, self.top_y - 28)
+
+        self.y = self.top_y - 55
+
+    def ensure_space(self, height: float):
+        if self.y - height < self.footer_y + 8:
+            self.finish_page()
+            self.header()
+
+    def section(self, title: str):
+        self.ensure_space(18 + 16)
+        self.c.setFont("Helvetica-Bold", 13)
+        self.c.drawString(self.margin_x, self.y, title)
+        self.y -= 18
+
+    def row(self, label: str, value: str):
+        """One neat label-value row, like the screenshot."""
+        self.ensure_space(16)
+        c = self.c
+        c.setFont("Helvetica-Bold", 11)
+        c.drawString(self.label_x, self.y, label)
+        c.setFont("Helvetica", 11)
+        c.drawString(self.value_x, self.y, str(value))
+        self.y -= 16
+
+    def finish_page(self):
+        # Footer (subtle)
+        c = self.c
+        c.setLineWidth(0.5)
+        c.setStrokeColorRGB(0.75, 0.75, 0.75)
+        c.line(self.margin_x, self.footer_y, self.right_x, self.footer_y)
+
+        c.setFillColorRGB(0.2, 0.2, 0.2)
+        c.setFont("Helvetica", 9)
+        c.drawString(self.margin_x, self.footer_text_y, "by Data Lab Indonesia")
+        c.drawRightString(self.right_x, self.footer_text_y, "Generated via DLI Smart Estimator")
+
+        c.showPage()
+
+
+def _domain_cost_items(data: dict) -> list[dict]:
+    domains = data.get("domain_cost_items")
+    if domains is None:
+        # Input-only quotes (e.g. batch_reports JSON) are priced here.
+        duration_months = int(data.get("duration_months", 1))
+        domains = [
+            {**domain, "period_price": get_domain_period_price(domain, duration_months)}
+            for domain in normalized_domains(data.get("domains", []))
+        ]
+    return domains
+
+
+def _domain_label(domains: list[dict]) -> str:
+    return ", ".join(
+        f"{domain['name']} ({domain['action']}, {domain['extension']})"
+        for domain in domains
+    ) if domains else "Tidak ada"
+
+
+def _cost_rows(layout: _Layout, data: dict, domains: list[dict]):
+    """The breakdown from the VPS base price down to the final total."""
+    row = layout.row
+    row("Biaya VPS Dasar", f"Rp {int(data.get('base_price', 0)):,}{data.get('unit_label', '')}")
+    if data.get("include_vps_buffer", True):
+        row(
+            f"Buffer {data.get('buffer_duration_label', '—')}",
+            f"Rp {int(data.get('vps_buffer_price', 0)):,}{data.get('unit_label', '')}",
+        )
+    else:
+        row("Buffer Server", "Tidak aktif")
+    row("Biaya Object Storage", f"Rp {int(data.get('object_storage_price', 0)):,}{data.get('unit_label', '')}")
+    if domains:
+        for domain in domains:
+            row(f"Domain {domain['name']}", f"Rp {domain['period_price']:,}{data.get('unit_label', '')}")
+    else:
+        row("Biaya Domain", f"Rp {int(data.get('domain_price', 0)):,}{data.get('unit_label', '')}")
+    row("Subtotal Pra-Pajak", f"Rp {int(data.get('pre_tax_subtotal', 0)):,}{data.get('unit_label', '')}")
+    row("Monitoring (4%)", f"Rp {int(data.get('monitoring_fee', 0)):,}{data.get('unit_label', '')}")
+    row("PPN (11%)", f"Rp {int(data.get('tax_fee', 0)):,}{data.get('unit_label', '')}")
+    if data.get("include_security_scan", True):
+        row(
+            "Security Scan",
+            f"Rp {int(data.get('security_scan_price', 0)):,}{data.get('unit_label', '')} "
+            f"(Rp {int(data.get('security_scan_monthly_price', 0)):,}/bulan)",
+        )
+    else:
+        row("Security Scan", "Tidak aktif")
+
+    total_price = int(data.get("total_price", 0))
+    unit_label = data.get("unit_label", "")
+    row("Total (Final)", f"Rp {total_price:,}{unit_label}")
+
+
+def _fleet_sections(layout: _Layout, data: dict, domains: list[dict]):
+    """Role table and fleet-level costs, for estimates with a ``fleet`` (see ``fleet.quote_fleet``)."""
+    fleet = data["fleet"]
+    row = layout.row
+    layout.section("Armada Server")
+    row("Concurrent Dibagi", f"~{int(fleet.get('concurrent', 0)):,} concurrent users")
+    row("Jumlah Role / Node", f"{len(fleet['roles']):,} role / {int(fleet.get('node_count', 0)):,} node")
+    for role in fleet["roles"]:
+        load = (
+            f", beban {role['load_share']}% (~{role['per_node_concurrency']:,}/node)"
+            if role["load_share"]
+            else ""
+        )
+        row(
+            f"{role['name']} ({role['nodes']:,} node)",
+            f"{role['cpu']} vCPU / {role['ram']} GB / {role['storage']} GB, "
+            f"{role['variant'].split(' — ')[0]}{load}: Rp {role['monthly_price']:,}/bulan",
+        )
+
+    layout.y -= 8
+
+    layout.section("Biaya Armada")
+    row("Object Storage (bersama)", f"{data.get('object_storage_gb', 0)} GB")
+    row("Durasi Aplikasi", f"{int(data.get('duration_months', 1))} bulan")
+    row("Domain", _domain_label(domains))
+    _cost_rows(layout, data, domains)
+
+
+def draw_estimate_page(c: "canvas.Canvas", data: dict):
+    """Draw one estimate onto ``c`` and finish its page(s).
+
+    With a ``fleet`` in ``data`` the server section lists the fleet's roles
+    and the costs are the fleet totals; otherwise it shows the single server.
+    """
+    layout = _Layout(c, data["exported_at_str"])
+    row = layout.row
+
+    # ---- Section 1: Ringkasan Estimasi & Beban
+    layout.section("Ringkasan Estimasi & Beban")
+
+    row("Preset", data.get("preset_label", "—"))
+    row("User per Jam", f"{int(data.get('users_per_hour', 0)):,}")
+    row("Durasi Sesi", f"{int(data.get('session_seconds', 0))} detik")
+    row("Concurrent Users", f"~{int(data.get('concurrent_users', 0)):,}")
+
+    layout.y -= 8
+
+    domains = _domain_cost_items(data)
+    if data.get("fleet"):
+        _fleet_sections(layout, data, domains)
+    else:
+        # ---- Section 2: Konfigurasi & Biaya
+        layout.section("Konfigurasi & Biaya")
+
+        cpu = data.get("cpu", 0)
+        ram = data.get("ram", 0)
+        storage = data.get("storage", 0)
+        row("CPU / RAM / Disk", f"{cpu} vCPU / {ram} GB / {storage} GB")
+
+        object_storage_gb = data.get("object_storage_gb", 0)
+        row("Object Storage", f"{object_storage_gb} GB")
+
+        row("Tipe CPU", data.get("cpu_type", "—"))
+        row("Durasi Aplikasi", f"{int(data.get('duration_months', 1))} bulan")
+        row("Domain", _domain_label(domains))
+        _cost_rows(layout, data, domains)
+
+    layout.finish_page()
+
+
+def _cache_key_default(value):
+    # A DomainList hashes its content once per change instead of being serialized.
+    if isinstance(value, DomainList):
+        return f"domains:{value.fingerprint()}"
+    return str(value)
+
+
+def pdf_cache_key(data: dict) -> str:
+    """Content hash of the report inputs, ignoring the export timestamp.
+
+    Two exports of the same estimate share this key; ``get_pdf_report``
+    tells them apart by their timestamps.
+    """
+    payload = {
+        key: value
+        for key, value in data.items()
+        if key not in PDF_CACHE_EXCLUDED_KEYS and PDF_CACHE_DERIVED_KEYS.get(key) not in data
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=_cache_key_default).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def get_pdf_report(data: dict, cache_key: str | None = None) -> bytes:
+    """Return the rendered report for ``data``, building it only on a cache miss.
+
+    ``cache_key`` is ``pdf_cache_key(data)`` when the caller already has it.
+    """
+    if cache_key is None:
+        cache_key = pdf_cache_key(data)
+    cache_key = json.dumps([cache_key, *(data.get(key) for key in PDF_CACHE_EXCLUDED_KEYS)])
+    with _pdf_cache_lock:
+        pdf_bytes = _pdf_cache.get(cache_key)
+        if pdf_bytes is not None:
+            _pdf_cache.move_to_end(cache_key)
+            return pdf_bytes
+
+    pdf_bytes = build_pdf_report(data)
+    with _pdf_cache_lock:
+        _pdf_cache[cache_key] = pdf_bytes
+        _pdf_cache.move_to_end(cache_key)
+        while len(_pdf_cache) > PDF_CACHE_SIZE:
+            _pdf_cache.popitem(last=False)
+    return pdf_bytes
@@ -0,0 +1,131 @@
+"""Duration and object-storage sensitivity sweeps of one estimate.
+
+Every component of the breakdown scales with ``duration_months`` from a
+per-month value: the VPS base price, the buffer (``get_buffer_months``), the
+object storage, the security scan and the domains (each one's
+``get_domain_period_price``). ``sweep`` therefore prices the server and
+counts the domain yearly prices once, then runs the rest of the pipeline
+(``pricing_batch.price_breakdown_batch``) over the whole duration x storage
+grid in one vectorized pass. Each grid point matches ``pricing.quote`` with
+the same ``duration_months`` and ``object_storage_gb``.
+"""
+from collections import Counter
+
+import numpy as np
+
+from catalog import get_cloud_vps_coefficients
+from limits import DURATION_LIMITS, OBJECT_STORAGE_LIMITS
+from money import HALF_EVEN, prorate
+from price_table import cloud_vps_price
+from pricing import (
+    MONTHS_PER_YEAR,
+    SECURITY_SCAN_PER_PROJECT_MONTH,
+    DomainList,
+    get_buffer_months,
+    normalized_domains,
+)
+from pricing_batch import price_breakdown_batch
+
+SWEEP_PRICE_KEYS = (
+    "base_price",
+    "vps_buffer_price",
+    "object_storage_price",
+    "security_scan_price",
+    "domain_price",
+    "pre_tax_subtotal",
+    "monitoring_fee",
+    "tax_fee",
+    "total_price",
+)
+
+
+def _axis(values, default, limits: tuple[int, int], label: str, integer: bool = False) -> np.ndarray:
+    """One sweep axis as a 1-D array within ``limits``.
+
+    With ``integer``, fractional values are rejected rather than truncated
+    and the axis comes back as int64.
+    """
+    values = np.atleast_1d(np.asarray(default if values is None else values))
+    if values.ndim != 1 or not len(values) or values.dtype.kind not in "iuf" or not np.isfinite(values).all():
+        raise ValueError(f"{label} harus berupa daftar angka yang tidak kosong.")
+    low, high = limits
+    if values.min() < low or values.max() > high:
+        raise ValueError(f"{label} harus di antara {low} dan {high}.")
+    if integer:
+        if values.dtype.kind == "f" and not np.array_equal(values, np.floor(values)):
+            raise ValueError(f"{label} harus berupa bilangan bulat.")
+        values = values.astype(np.int64)
+    return values
+
+
+def domain_price_curve(domains, duration_months: np.ndarray) -> np.ndarray:
+    """Total domain price for each duration, from the count of domains per yearly price."""
+    if isinstance(domains, DomainList):
+        totals = domains.period_total(duration_months)
+    else:
+        price_counts = Counter(int(domain.get("price_yearly", 0)) for domain in normalized_domains(domains))
+        totals = sum(
+            count * prorate(price_yearly, duration_months, MONTHS_PER_YEAR, HALF_EVEN)
+            for price_yearly, count in price_counts.items()
+        )
+    return np.broadcast_to(np.asarray(totals, dtype=np.int64), duration_months.shape)
+
+
+def sweep(
+    inputs: dict,
+    duration_months=None,
+    object_storage_gb=None,
+    coefficients: dict | None = None,
+) -> dict:
+    """Cost breakdown of ``inputs`` over a duration range, a storage range, or both.
+
+    ``inputs`` takes the same keys as ``pricing.quote``. An axis left as
+    ``None`` stays at the value in ``inputs``. The result holds both axes
+    (``duration_months``, ``object_storage_gb``), ``buffer_months`` per
+    duration, ``monthly_base_price`` and every price in ``SWEEP_PRICE_KEYS``
+    as an int64 array of shape ``(len(duration_months), len(object_storage_gb))``.
+    """
+    coef = inputs.get("coef")
+    if coef is None:
+        if coefficients is None:
+            coefficients = get_cloud_vps_coefficients()
+        coef = coefficients[inputs["variant"]]
+
+    durations = _axis(
+        duration_months, inputs.get("duration_months", 12), DURATION_LIMITS, "Durasi (bulan)", integer=True
+    )
+    storage = _axis(
+        object_storage_gb, inputs.get("object_storage_gb", 0), OBJECT_STORAGE_LIMITS, "Object storage (GB)"
+    )
+
+    monthly_base_price = cloud_vps_price(
+        int(inputs["cpu"]), int(inputs["ram"]), int(inputs["storage"]), coef
+    )
+    breakdown = price_breakdown_batch(
+        monthly_base_price,
+        object_storage_gb=storage[np.newaxis, :],
+        duration_months=durations[:, np.newaxis],
+        domain_price=domain_price_curve(inputs.get("domains", []), durations)[:, np.newaxis],
+        include_vps_buffer=bool(inputs.get("include_vps_buffer", True)),
+        include_security_scan=bool(inputs.get("include_security_scan", True)),
+        security_scan_monthly_price=int(inputs.get("security_scan_monthly_price", SECURITY_SCAN_PER_PROJECT_MONTH)),
+    )
+    return {
+        "duration_months": durations,
+        "object_storage_gb": storage,
+        "buffer_months": get_buffer_months(durations),
+        "monthly_base_price": monthly_base_price,
+        **{key: breakdown[key] for key in SWEEP_PRICE_KEYS},
+    }
+
+
+def sweep_rows(result: dict) -> list[dict]:
+    """One flat dict per (duration, storage) point, durations outermost."""
+    rows = []
+    for i, duration in enumerate(result["duration_months"].tolist()):
+        for j, storage in enumerate(result["object_storage_gb"].tolist()):
+            row = {"duration_months": duration, "object_storage_gb": storage}
+            for key in SWEEP_PRICE_KEYS:
+                row[key] = int(result[key][i, j])
+            rows.append(row)
+    return rows
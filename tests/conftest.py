@@ -0,0 +1,18 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# The modules live at the repository root, not in an installed package.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+@pytest.fixture(autouse=True, scope="session")
+def price_table_cache(tmp_path_factory):
+    """Build the Cloud VPS price table in a temporary directory, not ``data/cache``."""
+    import price_table
+
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(price_table, "CACHE_DIR", tmp_path_factory.mktemp("price_table_cache"))
+        patch.setattr(price_table, "_table", None)
+        yield price_table.CACHE_DIR
@@ -0,0 +1,159 @@
+import gzip
+import io
+import json
+import random
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from access_log import Sessionizer, main, open_log, summarize_access_logs
+
+TZ = timezone(timedelta(hours=7))
+START = int(datetime(2024, 3, 10, 8, 0, tzinfo=TZ).timestamp())
+
+
+def log_line(ip, epoch, agent="Mozilla/5.0", path="/"):
+    stamp = datetime.fromtimestamp(epoch, TZ).strftime("%d/%b/%Y:%H:%M:%S %z")
+    return f'{ip} - - [{stamp}] "GET {path} HTTP/1.1" 200 512 "-" "{agent}"\n'.encode()
+
+
+def reference(requests, idle):
+    """Sessions, per-hour unique users and peak per-minute concurrency, computed naively."""
+    by_client = {}
+    for client, epoch in sorted(requests, key=lambda item: item[1]):
+        by_client.setdefault(client, []).append(epoch)
+    sessions = []
+    for times in by_client.values():
+        start = previous = times[0]
+        for epoch in times[1:]:
+            if epoch - previous > idle:
+                sessions.append((start, previous))
+                start = epoch
+            previous = epoch
+        sessions.append((start, previous))
+    minutes = Counter()
+    for start, end in sessions:
+        for minute in range(start // 60, end // 60 + 1):
+            minutes[minute] += 1
+    hours = {}
+    for client, epoch in requests:
+        hours.setdefault(epoch // 3600, set()).add(client)
+    return sessions, {hour: len(clients) for hour, clients in hours.items()}, max(minutes.values())
+
+
+def random_log(seed, count=3000):
+    rng = random.Random(seed)
+    clients = [(f"10.0.{i // 250}.{i % 250}", rng.choice(["Mozilla/5.0", "curl/8.0"])) for i in range(300)]
+    epoch = START
+    requests, lines = [], []
+    for _ in range(count):
+        epoch += rng.choice([0, 0, 1, 2, 5, 30, 120, 900])
+        client = rng.choice(clients)
+        requests.append((client, epoch))
+        lines.append(log_line(client[0], epoch, client[1]))
+    return requests, b"".join(lines)
+
+
+@pytest.mark.parametrize("seed, idle", [(1, 1800), (2, 60), (3, 300)])
+def test_sessionization_matches_reference(seed, idle):
+    requests, raw = random_log(seed)
+    summary = summarize_access_logs(io.BytesIO(raw), idle_timeout=idle)
+    sessions, hourly, peak = reference(requests, idle)
+
+    assert summary["lines"] == len(requests)
+    assert summary["skipped"] == 0
+    assert summary["sessions"] == len(sessions)
+    assert summary["session_max_seconds"] == max(end - start for start, end in sessions)
+    assert [row["users"] for row in summary["hourly_unique_users"]] == [hourly[hour] for hour in sorted(hourly)]
+    assert summary["users_per_hour"] == max(hourly.values())
+    assert summary["peak_concurrency"] == peak
+    assert sum(row["Sesi"] for row in summary["session_histogram"]) == len(sessions)
+
+
+def test_idle_timeout_splits_sessions():
+    lines = [log_line("10.0.0.1", START + offset) for offset in (0, 60, 120, 120 + 1801, 120 + 1801 + 30)]
+    summary = summarize_access_logs(io.BytesIO(b"".join(lines)))
+    assert summary["sessions"] == 2
+    assert summary["session_percentiles"]["p50"] == 30
+    assert summary["session_max_seconds"] == 120
+    assert summary["session_seconds"] == 75
+    assert summary["first_seen"] == "2024-03-10T08:00:00+07:00"
+
+
+def test_client_key_ip_merges_user_agents():
+    lines = b"".join(log_line("10.0.0.1", START + i, agent) for i, agent in enumerate(["a", "b", "c"]))
+    assert summarize_access_logs(io.BytesIO(lines))["peak_hour_users"] == 3
+    assert summarize_access_logs(io.BytesIO(lines), client_key="ip")["peak_hour_users"] == 1
+
+
+def test_malformed_lines_are_skipped():
+    good = log_line("10.0.0.1", START)
+    lines = [
+        good,
+        b"\n",
+        b"no timestamp here\n",
+        b'10.0.0.2 - - [10/Foo/2024:08:00:00 +0700] "GET / HTTP/1.1" 200 1 "-" "x"\n',
+        b'10.0.0.3 - - [10/Mar/2024:08:00:xx +0700] "GET / HTTP/1.1" 200 1 "-" "x"\n',
+        b'10.0.0.4 - - [10/Mar/2024:08:00 +0700] "GET / HTTP/1.1" 200 1 "-" "x"\n',
+        b" - - [10/Mar/2024:08:00:00 +0700] \"GET / HTTP/1.1\" 200 1\n",
+        log_line("10.0.0.5", START + 10),
+    ]
+    summary = summarize_access_logs(io.BytesIO(b"".join(lines)))
+    assert summary["lines"] == len(lines)
+    assert summary["skipped"] == 6
+    assert summary["sessions"] == 2
+
+
+def test_common_format_is_keyed_by_ip():
+    lines = b"".join(
+        f'10.0.0.1 - - [10/Mar/2024:08:00:0{i} +0700] "GET /{i} HTTP/1.1" 200 1\n'.encode() for i in range(3)
+    )
+    summary = summarize_access_logs(io.BytesIO(lines))
+    assert summary["skipped"] == 0
+    assert summary["sessions"] == 1
+
+
+def test_gzip_and_plain_inputs_agree(tmp_path):
+    requests, raw = random_log(4, count=500)
+    plain = tmp_path / "access.log"
+    plain.write_bytes(raw)
+    compressed = tmp_path / "access.log.1.gz"
+    compressed.write_bytes(gzip.compress(raw))
+    expected = summarize_access_logs(str(plain))
+    assert summarize_access_logs(str(compressed)) == expected
+    assert summarize_access_logs(io.BytesIO(gzip.compress(raw))) == expected
+    with open(compressed, "rb") as handle:
+        assert open_log(handle).read() == raw
+
+
+def test_rotated_logs_are_read_in_order(tmp_path):
+    requests, raw = random_log(5, count=800)
+    lines = raw.splitlines(keepends=True)
+    older = tmp_path / "access.log.1.gz"
+    older.write_bytes(gzip.compress(b"".join(lines[:400])))
+    newer = tmp_path / "access.log"
+    newer.write_bytes(b"".join(lines[400:]))
+    assert summarize_access_logs([older, newer]) == summarize_access_logs(io.BytesIO(raw))
+
+
+def test_empty_log():
+    summary = summarize_access_logs(io.BytesIO(b""))
+    assert summary["lines"] == summary["sessions"] == summary["peak_concurrency"] == 0
+    assert summary["first_seen"] is None
+    assert summary["hourly_profile"] == [0] * 24
+
+
+@pytest.mark.parametrize("kwargs", [{"idle_timeout": 0}, {"client_key": "ua"}])
+def test_invalid_options(kwargs):
+    with pytest.raises(ValueError):
+        Sessionizer(**kwargs)
+
+
+def test_cli_writes_json(tmp_path, capsys):
+    log = tmp_path / "access.log"
+    log.write_bytes(log_line("10.0.0.1", START) + log_line("10.0.0.2", START + 5))
+    output = tmp_path / "summary.json"
+    assert main([str(log), "-o", str(output), "--client", "ip"]) == 0
+    assert json.loads(output.read_text(encoding="utf-8"))["peak_concurrency"] == 2
+    assert "2 baris dibaca" in capsys.readouterr().err
@@ -0,0 +1,137 @@
+import io
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from batch_quote import parse_domains, parse_int, price_row, price_rows, read_rows
+from catalog import get_cloud_vps_coefficients
+from pricing import quote
+
+ROOT = Path(__file__).resolve().parent.parent
+VARIANT = next(iter(get_cloud_vps_coefficients()))
+
+
+def row(**overrides) -> dict:
+    return {"id": "q1", "variant": VARIANT, "cpu": 2, "ram": 4, "storage": 60, **overrides}
+
+
+def test_valid_row_matches_quote():
+    result = price_row(row(object_storage_gb=100, domains="datalab.co.id:Renewal;contoh.com"))
+    assert result["error"] == ""
+    assert result["id"] == "q1"
+    assert result["domain_count"] == 2
+    inputs = {
+        "variant": VARIANT, "cpu": 2, "ram": 4, "storage": 60, "object_storage_gb": 100, "duration_months": 12,
+        "domains": [{"name": "datalab.co.id", "action": "Renewal"}, {"name": "contoh.com", "action": "Register"}],
+    }
+    assert result["total_price"] == quote(inputs)["total_price"]
+
+
+@pytest.mark.parametrize(
+    "overrides, message",
+    [
+        ({"cpu": 0}, "ValueError: CPU harus di antara 1 dan 32."),
+        ({"ram": 129}, "ValueError: RAM (GB) harus di antara 1 dan 128."),
+        ({"storage": 5}, "ValueError: Storage (GB) harus di antara 20 dan 2000."),
+        ({"object_storage_gb": -1}, "ValueError: Object Storage (GB) harus di antara 0 dan 10000."),
+        ({"duration_months": 0}, "ValueError: Durasi (bulan) harus di antara 1 dan 120."),
+        ({"cpu": 2.5}, "ValueError: CPU harus berupa bilangan bulat: 2.5"),
+        ({"security_scan_monthly_price": -1}, "ValueError: Biaya security scan tidak boleh negatif."),
+        ({"include_vps_buffer": "mungkin"}, "ValueError: Nilai boolean tidak dikenal: 'mungkin'"),
+        ({"domains": [{"action": "Register"}]}, 'ValueError: Domain ke-1 harus berupa nama atau objek dengan "name" berupa teks.'),
+        ({"domains": 5}, "ValueError: domains harus berupa list atau teks."),
+        ({"variant": "Tidak ada"}, "KeyError: 'Tidak ada'"),
+    ],
+)
+def test_invalid_rows_come_back_with_error(overrides, message):
+    result = price_row(row(**overrides))
+    assert result["error"] == message
+    assert result["id"] == "q1"
+
+
+def test_missing_field_is_reported():
+    result = price_row({"variant": VARIANT, "cpu": 2, "ram": 4})
+    assert result["error"] == "KeyError: 'storage'"
+
+
+def test_explicit_zero_security_scan_is_kept():
+    assert price_row(row(security_scan_monthly_price=0))["security_scan_price"] == 0
+    assert price_row(row(security_scan_monthly_price=""))["security_scan_price"] > 0
+
+
+def test_integral_floats_are_accepted():
+    assert price_row(row(cpu=2.0, duration_months="6"))["error"] == ""
+
+
+def test_parse_domains_accepts_names_and_objects():
+    assert parse_domains(["contoh.com", {"name": "datalab.co.id", "action": "Renewal"}]) == [
+        {"name": "contoh.com"},
+        {"name": "datalab.co.id", "action": "Renewal"},
+    ]
+
+
+def test_jsonl_error_rows_keep_their_position():
+    lines = "\n".join([
+        '{"id": "ok", "variant": "%s", "cpu": 2, "ram": 4, "storage": 60}' % VARIANT,
+        "{bukan json",
+        "[1, 2]",
+        "42",
+        "",
+        '{"id": "ok2", "variant": "%s", "cpu": 4, "ram": 8, "storage": 100}' % VARIANT,
+    ])
+    results = price_rows(list(read_rows(io.StringIO(lines), "jsonl")))
+    assert [result["id"] for result in results] == ["ok", "", "", "", "ok2"]
+    assert results[0]["error"] == results[4]["error"] == ""
+    assert results[1]["error"].startswith("JSONDecodeError: ")
+    assert results[2]["error"] == "TypeError: Quote harus berupa objek JSON, bukan list."
+    assert results[3]["error"] == "TypeError: Quote harus berupa objek JSON, bukan int."
+
+
+def test_price_rows_matches_price_row():
+    rows = [row(id=str(i), cpu=1 + i % 4, domains="contoh.com" if i % 2 else "") for i in range(12)]
+    rows.insert(5, row(id="x", cpu=99))
+    assert price_rows(rows) == [price_row(r) for r in rows]
+
+
+def test_csv_cells_are_parsed_as_whole_numbers():
+    text = "id,variant,cpu,ram,storage,duration_months\n" + "\n".join([
+        f"a,{VARIANT},2.0,4,60,12",
+        f"b,{VARIANT},2.5,4,60,12",
+        f"c,{VARIANT},2,empat,60,12",
+        f"d,{VARIANT},2,4,60,1.5",
+        f"e,{VARIANT},2,4,60,",
+    ])
+    results = price_rows(list(read_rows(io.StringIO(text), "csv")))
+    assert [result["error"] for result in results] == [
+        "",
+        "ValueError: CPU harus berupa bilangan bulat: '2.5'",
+        "ValueError: RAM (GB) harus berupa bilangan bulat: 'empat'",
+        "ValueError: Durasi (bulan) harus berupa bilangan bulat: '1.5'",
+        "",
+    ]
+    assert results[0]["total_price"] == price_row(row())["total_price"]
+    assert results[4]["duration_months"] == 12
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [("7", 7), (" 7 ", 7), ("7.0", 7), ("1e2", 100), (7.0, 7), (7, 7)],
+)
+def test_parse_int_accepts_whole_numbers(value, expected):
+    assert parse_int(value, "CPU") == expected
+
+
+@pytest.mark.parametrize("value", ["7.5", "", "tujuh", "nan", "inf", 7.5, float("nan")])
+def test_parse_int_rejects_other_values(value):
+    with pytest.raises(ValueError, match="^CPU harus berupa bilangan bulat: "):
+        parse_int(value, "CPU")
+
+
+def test_cli_and_server_import_without_numpy():
+    code = "import sys, batch_quote, quote_server; print(sorted({'numpy', 'sweep', 'optimizer'} & set(sys.modules)))"
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    assert output.strip() == "[]"
@@ -0,0 +1,132 @@
+import numpy as np
+import pytest
+
+from capacity import CapacityTiers, SpecLoadRules, parse_hourly_profile, profile_stats, size_profiles
+from catalog import get_capacity_tiers, get_spec_load_rules
+from pricing import get_concurrent_users, get_load_from_specs, get_specs_from_concurrency, recommend_from_concurrency
+
+SPEC_LOAD_RULES = [
+    {"cpu": 1, "ram": 1, "users_per_hour": 600, "session_seconds": 60},
+    {"cpu": 1, "ram": 2, "users_per_hour": 1200, "session_seconds": 60},
+    {"cpu": 2, "ram": 4, "users_per_hour": 3600, "session_seconds": 60},
+    {"cpu": 4, "ram": 8, "users_per_hour": 9000, "session_seconds": 60},
+    {"cpu": 8, "ram": 16, "users_per_hour": 36000, "session_seconds": 40},
+    {"cpu": 8, "ram": 32, "users_per_hour": 45000, "session_seconds": 40},
+]
+
+
+def ladder_specs(concurrent):
+    """The original if/elif ladder."""
+    if concurrent <= 20:
+        return 1, 2
+    elif concurrent <= 60:
+        return 2, 4
+    elif concurrent <= 150:
+        return 4, 8
+    elif concurrent <= 400:
+        return 8, 16
+    else:
+        return 8, 32
+
+
+def ladder_load(cpu, ram):
+    """The original scan over ``SPEC_LOAD_RULES``."""
+    selected = SPEC_LOAD_RULES[0]
+    for rule in SPEC_LOAD_RULES:
+        if cpu >= rule["cpu"] and ram >= rule["ram"]:
+            selected = rule
+    return selected["users_per_hour"], selected["session_seconds"]
+
+
+CONCURRENCY = [*range(-1, 402), 1_000, 10**9]
+
+
+def test_specs_match_ladder_at_every_boundary():
+    for concurrent in CONCURRENCY:
+        assert get_specs_from_concurrency(concurrent) == ladder_specs(concurrent), concurrent
+
+
+def test_specs_batch_matches_scalar():
+    cpu, ram = get_capacity_tiers().specs_for_batch(np.array(CONCURRENCY))
+    assert list(zip(cpu.tolist(), ram.tolist())) == [ladder_specs(c) for c in CONCURRENCY]
+
+
+def test_top_tier_is_marked_as_a_floor():
+    assert recommend_from_concurrency(400) == "8 vCPU / 16 GB RAM"
+    assert recommend_from_concurrency(401) == "8 vCPU / 32 GB RAM (atau lebih)"
+
+
+def test_load_matches_rule_scan_for_every_spec():
+    specs = [(cpu, ram) for cpu in range(0, 34) for ram in range(0, 130)]
+    for cpu, ram in specs:
+        assert get_load_from_specs(cpu, ram) == ladder_load(cpu, ram), (cpu, ram)
+    users, seconds = get_spec_load_rules().load_for_batch(*np.array(specs).T)
+    assert list(zip(users.tolist(), seconds.tolist())) == [ladder_load(cpu, ram) for cpu, ram in specs]
+
+
+@pytest.mark.parametrize(
+    "tiers",
+    [[], [(20, 1, 2)], [(20, 1, 2), (None, 2, 4), (None, 4, 8)], [(60, 1, 2), (20, 2, 4), (None, 4, 8)]],
+)
+def test_invalid_tiers_are_rejected(tiers):
+    with pytest.raises(ValueError):
+        CapacityTiers(tiers)
+
+
+@pytest.mark.parametrize("rules", [[], [(2, 4, 3600, 60), (1, 8, 600, 60)], [(1, 4, 600, 60), (2, 2, 1200, 60)]])
+def test_invalid_load_rules_are_rejected(rules):
+    with pytest.raises(ValueError):
+        SpecLoadRules(rules)
+
+
+@pytest.mark.parametrize("separator", [",", ";", " ", "\n", ", "])
+def test_parse_hourly_profile_separators(separator):
+    values = list(range(24))
+    assert parse_hourly_profile(separator.join(map(str, values))) == values
+
+
+@pytest.mark.parametrize(
+    "text, message",
+    [
+        ("1,2,x" + ",0" * 21, "hanya boleh berisi bilangan bulat"),
+        ("1.5" + ",0" * 23, "hanya boleh berisi bilangan bulat"),
+        (",".join(["1"] * 23), "harus berisi 24 atau 168 angka, bukan 23"),
+        ("", "bukan 0"),
+        ("-1" + ",0" * 23, "tidak boleh negatif"),
+    ],
+)
+def test_parse_hourly_profile_errors(text, message):
+    with pytest.raises(ValueError, match=message):
+        parse_hourly_profile(text)
+
+
+def test_profile_stats_matches_scalar_concurrency():
+    rng = np.random.default_rng(7)
+    profiles = rng.integers(0, 20_000, size=(5, 168))
+    seconds = [30, 60, 90, 1, 3600]
+    stats = profile_stats(profiles, seconds)
+    for row, session_seconds, concurrency, p95 in zip(profiles, seconds, stats["concurrency"], stats["p95"]):
+        expected = [get_concurrent_users(int(users), session_seconds) for users in row]
+        assert concurrency.tolist() == expected
+        assert p95 == sorted(expected)[-(-95 * 168 // 100) - 1]
+    assert stats["peak"].tolist() == stats["concurrency"].max(axis=1).tolist()
+    assert np.allclose(stats["mean"], stats["concurrency"].mean(axis=1))
+
+
+def test_profile_stats_p95_is_nearest_rank():
+    hourly = list(range(1, 25))
+    stats = profile_stats(hourly, 3600)
+    assert stats["peak"] == 24
+    assert stats["p95"] == 23  # ceil(0.95 * 24) = 23rd value
+
+
+def test_profile_stats_rejects_other_lengths():
+    with pytest.raises(ValueError, match="not 25"):
+        profile_stats([1] * 25, 60)
+
+
+def test_size_profiles_sizes_the_peak_hour():
+    hourly = [0] * 23 + [401 * 60]
+    stats = size_profiles([hourly, [1200] * 24], 60, get_capacity_tiers())
+    assert stats["peak"].tolist() == [401, 20]
+    assert list(zip(stats["cpu"].tolist(), stats["ram"].tolist())) == [(8, 32), (1, 2)]
@@ -0,0 +1,67 @@
+import json
+import os
+
+import pytest
+
+import catalog
+from catalog import catalog_stats, load
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    path = tmp_path / "coeff.json"
+    path.write_text(json.dumps({"a": 1}))
+    yield path
+    catalog._entries.pop(path, None)
+
+
+def parse_counting(calls):
+    def parse(raw):
+        calls.append(raw)
+        return json.loads(raw)
+
+    return parse
+
+
+def bump_mtime(path):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_unchanged_file_is_parsed_once(data_file):
+    calls = []
+    first = load(data_file, parse_counting(calls))
+    assert load(data_file, parse_counting(calls)) is first
+    assert len(calls) == 1
+
+
+def test_touched_file_with_same_content_is_not_reparsed(data_file):
+    calls = []
+    first = load(data_file, parse_counting(calls))
+    bump_mtime(data_file)
+    assert load(data_file, parse_counting(calls)) is first
+    assert len(calls) == 1
+    stats = next(entry for entry in catalog_stats() if entry["file"] == data_file.name)
+    assert (stats["loads"], stats["hits"], stats["revalidations"]) == (1, 0, 1)
+
+
+def test_edited_file_is_reparsed(data_file):
+    calls = []
+    assert load(data_file, parse_counting(calls)) == {"a": 1}
+    data_file.write_text(json.dumps({"a": 2, "b": 3}))
+    bump_mtime(data_file)
+    assert load(data_file, parse_counting(calls)) == {"a": 2, "b": 3}
+    assert len(calls) == 2
+
+
+def test_same_size_edit_is_noticed_by_mtime(data_file):
+    load(data_file, json.loads)
+    data_file.write_text(json.dumps({"a": 7}))
+    bump_mtime(data_file)
+    assert load(data_file, json.loads) == {"a": 7}
+
+
+def test_data_files_are_shared():
+    assert catalog.get_cloud_vps_coefficients() is catalog.get_cloud_vps_coefficients()
+    assert catalog.get_server_vps_plans() is catalog.get_server_vps_plans()
+    assert catalog.get_capacity_tiers() is catalog.get_capacity_tiers()
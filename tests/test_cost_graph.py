@@ -0,0 +1,120 @@
+import pytest
+
+from cost_graph import COST_NODES, CostGraph, CostNode
+from pricing import DomainList, quote
+
+INPUTS = {
+    "variant": "AMD eXtreme — Moderate website/API (AMD)",
+    "cpu": 4,
+    "ram": 8,
+    "storage": 100,
+    "object_storage_gb": 50,
+    "duration_months": 12,
+    "domains": [{"name": "datalab.co.id", "action": "Renewal"}, "contoh.com"],
+}
+ALL_NODES = [node.name for node in COST_NODES]
+
+
+def test_first_update_computes_every_node():
+    graph = CostGraph()
+    assert graph.update(INPUTS) == quote(INPUTS)
+    assert graph.recomputed() == ALL_NODES
+
+
+def test_unchanged_inputs_recompute_nothing():
+    graph = CostGraph()
+    graph.update(INPUTS)
+    assert graph.update(dict(INPUTS, domains=list(INPUTS["domains"]))) == quote(INPUTS)
+    assert graph.recomputed() == []
+
+
+@pytest.mark.parametrize(
+    "changes, recomputed",
+    [
+        (
+            {"object_storage_gb": 200},
+            ["object_storage_price", "pre_tax_subtotal", "monitoring_fee", "tax_fee", "total_price"],
+        ),
+        (
+            {"include_vps_buffer": False},
+            ["vps_buffer_price", "pre_tax_subtotal", "monitoring_fee", "tax_fee", "total_price"],
+        ),
+        ({"include_security_scan": False}, ["security_scan_price", "total_price"]),
+        ({"security_scan_monthly_price": 150_000}, ["security_scan_price", "total_price"]),
+        (
+            {"domains": [{"name": "datalab.co.id", "action": "Registrasi"}, "contoh.com"]},
+            ["domain_cost_items", "domain_price", "pre_tax_subtotal", "monitoring_fee", "tax_fee", "total_price"],
+        ),
+        (
+            {"cpu": 8},
+            ["monthly_base_price", "base_price", "vps_buffer_price", "pre_tax_subtotal", "monitoring_fee", "tax_fee", "total_price"],
+        ),
+        ({"variant": "Intel eXtreme — Moderate website/API (Intel)"}, None),
+        ({"duration_months": 7}, ALL_NODES[1:]),
+    ],
+)
+def test_partial_changes_match_quote(changes, recomputed):
+    graph = CostGraph()
+    graph.update(INPUTS)
+    changed = {**INPUTS, **changes}
+    assert graph.update(changed) == quote(changed)
+    if recomputed is not None:
+        assert graph.recomputed() == recomputed
+
+
+def test_explicit_coef_matches_variant_lookup():
+    from catalog import get_cloud_vps_coefficients
+
+    coef = get_cloud_vps_coefficients()[INPUTS["variant"]]
+    graph = CostGraph()
+    graph.update(INPUTS)
+    assert graph.update({**INPUTS, "coef": dict(coef)}) == quote(INPUTS)
+    assert graph.recomputed() == []
+
+
+def test_domain_list_mutations_are_detected_in_place():
+    domains = DomainList(INPUTS["domains"])
+    inputs = {**INPUTS, "domains": domains}
+    graph = CostGraph()
+    assert graph.update(inputs) == quote(inputs)
+
+    mutations = [
+        lambda: domains.add("sekolah.sch.id"),
+        lambda: domains.set_action(0, "Registrasi"),
+        lambda: domains.set_action_by_extension(None, "Renewal"),
+        lambda: domains.remove([1]),
+    ]
+    for mutate in mutations:
+        mutate()
+        breakdown = graph.update(inputs)
+        assert breakdown == quote({**INPUTS, "domains": domains.as_dicts()})
+        assert graph.recomputed()[:2] == ["domain_cost_items", "domain_price"]
+        assert "monthly_base_price" not in graph.recomputed()
+
+    graph.update(inputs)
+    assert graph.recomputed() == []
+
+
+def test_plain_list_edited_in_place_is_detected():
+    domains = [{"name": "datalab.co.id", "action": "Renewal"}]
+    inputs = {**INPUTS, "domains": domains}
+    graph = CostGraph()
+    graph.update(inputs)
+    domains[0]["action"] = "Registrasi"
+    assert graph.update(inputs) == quote(inputs)
+    assert "domain_price" in graph.recomputed()
+
+
+def test_trace_rows_cover_every_node():
+    graph = CostGraph()
+    graph.update(INPUTS)
+    graph.update({**INPUTS, "include_security_scan": False})
+    rows = graph.trace_rows()
+    assert [row["Node"] for row in rows] == ALL_NODES
+    assert {row["Node"] for row in rows if row["Dihitung ulang"]} == {"security_scan_price", "total_price"}
+
+
+def test_nodes_must_follow_their_dependencies():
+    nodes = (CostNode("total_price", ("tax_fee",), abs), *COST_NODES)
+    with pytest.raises(ValueError, match="reads \\['tax_fee'\\] before they are defined"):
+        CostGraph(nodes=nodes)
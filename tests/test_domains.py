@@ -0,0 +1,152 @@
+import itertools
+
+from pricing import (
+    DEFAULT_DOMAIN_PRICE_YEARLY,
+    DOMAIN_PRICES_YEARLY,
+    DOMAIN_SUFFIX_INDEX,
+    DomainList,
+    UNKNOWN_DOMAIN_EXTENSION,
+    get_domain_extension,
+    get_domain_period_price,
+    normalized_domains,
+    parse_domain_import,
+)
+
+
+def endswith_extension(domain_name: str) -> str:
+    """The original lookup: longest extension the name ends with."""
+    normalized = domain_name.strip().lower()
+    for extension in sorted(DOMAIN_PRICES_YEARLY, key=len, reverse=True):
+        if normalized.endswith(extension):
+            return extension
+    return UNKNOWN_DOMAIN_EXTENSION
+
+
+def sample_names():
+    labels = ["", "a", "id", "co", "my", "com", "xco", "sg", "web", "contoh", "DataLab"]
+    for count in (1, 2, 3, 4):
+        for parts in itertools.product(labels, repeat=count):
+            yield ".".join(parts)
+    for extension in DOMAIN_PRICES_YEARLY:
+        yield extension
+        yield extension.lstrip(".")
+        yield f"  Contoh{extension.upper()} "
+
+
+def test_suffix_index_matches_endswith():
+    for name in sample_names():
+        assert DOMAIN_SUFFIX_INDEX.extension(name) == endswith_extension(name), name
+        assert get_domain_extension(name) == endswith_extension(name), name
+
+
+def test_suffix_index_prices():
+    assert DOMAIN_SUFFIX_INDEX.classify(["datalab.co.id", "contoh.xyz", "tanpa-ekstensi"], "Renewal") == [
+        (".co.id", 300_000),
+        (".xyz", 292_000),
+        (UNKNOWN_DOMAIN_EXTENSION, DEFAULT_DOMAIN_PRICE_YEARLY),
+    ]
+    assert DOMAIN_SUFFIX_INDEX.price(".ac.id", "Renewal") == 100_000
+    assert DOMAIN_SUFFIX_INDEX.price(".ac.id", "Lainnya") == DEFAULT_DOMAIN_PRICE_YEARLY
+
+
+def test_domain_import_rejects_bad_lines_with_their_line_number():
+    text = "\n".join([
+        "name,action",
+        "datalab.co.id,Renewal",
+        "",
+        "# komentar",
+        "contoh.com;transfer",
+        "kampus.ac.id\tRenewal\tlebih",
+        "localhost",
+        "toko.xyz,Sewa",
+        "DATALAB.co.id",
+        "lama.my.id",
+        "baru.site Register",
+    ])
+    entries, rejected = parse_domain_import(text, existing_names=["Lama.my.id"])
+    assert [(entry["name"], entry["extension"], entry["action"], entry["price_yearly"]) for entry in entries] == [
+        ("datalab.co.id", ".co.id", "Renewal", 300_000),
+        ("contoh.com", ".com", "Transfer", 185_000),
+        ("baru.site", ".site", "Register", 721_000),
+    ]
+    assert [(row["line"], row["reason"]) for row in rejected] == [
+        (6, "Kolom terlalu banyak"),
+        (7, "Nama domain tidak valid"),
+        (8, "Jenis domain tidak dikenal: Sewa"),
+        (9, "Duplikat"),
+        (10, "Duplikat"),
+    ]
+    assert rejected[0]["text"] == "kampus.ac.id\tRenewal\tlebih"
+
+
+def test_domain_import_default_action_and_list_input():
+    entries, rejected = parse_domain_import(["  'kutip.id'  ", "nama.web.id"], default_action="Transfer")
+    assert rejected == []
+    assert [(entry["name"], entry["action"]) for entry in entries] == [("kutip.id", "Transfer"), ("nama.web.id", "Transfer")]
+
+
+def test_domain_import_header_only_on_first_line():
+    entries, rejected = parse_domain_import("contoh.com\ndomain,Register")
+    assert [entry["name"] for entry in entries] == ["contoh.com"]
+    assert rejected == [{"line": 2, "text": "domain,Register", "reason": "Nama domain tidak valid"}]
+
+
+def reference_total(domains, duration_months: int) -> int:
+    return sum(get_domain_period_price(domain, duration_months) for domain in normalized_domains(list(domains.as_dicts())))
+
+
+def test_domain_list_add_rejects_duplicates():
+    domains = DomainList(["datalab.co.id"])
+    assert domains.version == 0
+    assert domains.add({"name": "contoh.com", "action": "Renewal"})
+    assert not domains.add(" DATALAB.co.id ")
+    assert not domains.add({"name": "Contoh.COM"})
+    assert domains.version == 1
+    assert [(entry.name, entry.action, entry.price_yearly) for entry in domains] == [
+        ("datalab.co.id", "Register", 270_000),
+        ("contoh.com", "Renewal", 185_000),
+    ]
+    assert domains.names == {"datalab.co.id", "contoh.com"}
+
+
+def test_domain_list_remove_and_actions_keep_totals():
+    domains = DomainList(["a.co.id", "b.co.id", "c.com", {"name": "d.my.id", "action": "Transfer"}, "e"])
+    for duration in (1, 7, 12, 30):
+        assert domains.period_total(duration) == reference_total(domains, duration)
+
+    assert domains.set_action(0, "Renewal")
+    assert not domains.set_action(0, "Renewal")
+    assert not domains.set_action(99, "Renewal")
+    assert domains.set_action_by_extension(".co.id", "Transfer") == 2
+    assert domains.remove([2, 4, 99]) == 2
+    assert domains.remove([99]) == 0
+    assert [entry.name for entry in domains] == ["a.co.id", "b.co.id", "d.my.id"]
+    assert domains.names == {"a.co.id", "b.co.id", "d.my.id"}
+    assert domains.extensions() == [".co.id", ".my.id"]
+    assert domains.version == 3
+    for duration in (1, 7, 12, 30):
+        assert domains.period_total(duration) == reference_total(domains, duration)
+    assert domains.add("c.com")  # removed names can come back
+
+
+def test_domain_list_views_follow_mutations():
+    domains = DomainList(["a.co.id", "b.com"])
+    items = domains.cost_items(6)
+    fingerprint = domains.fingerprint()
+    assert domains.cost_items(6) is items
+    assert [item["period_price"] for item in items] == [135_000, 80_000]
+    assert DomainList(["a.co.id", "b.com"]).fingerprint() == fingerprint
+
+    domains.set_action(1, "Renewal")
+    assert domains.fingerprint() != fingerprint
+    assert [item["period_price"] for item in domains.cost_items(6)] == [135_000, 92_500]
+    assert domains.as_dicts()[1] == {"name": "b.com", "extension": ".com", "action": "Renewal", "price_yearly": 185_000}
+
+
+def test_extend_normalized_skips_renormalizing():
+    entries, _ = parse_domain_import("a.co.id\nb.com,Transfer")
+    domains = DomainList()
+    assert domains.extend_normalized(entries) == 2
+    assert domains.extend_normalized([]) == 0
+    assert domains.version == 1
+    assert domains.as_dicts() == entries
@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+
+from catalog import get_cloud_vps_coefficients
+from fleet import DEFAULT_FLEET_ROLES, quote_fleet, role_columns, scale_roles
+from pricing import get_concurrent_users, get_load_from_specs, price_breakdown, quote
+
+VARIANT = "AMD eXtreme — Moderate website/API (AMD)"
+OTHER_VARIANT = "Intel eXtreme — Moderate website/API (Intel)"
+INPUTS = {
+    "variant": VARIANT,
+    "cpu": 4,
+    "ram": 8,
+    "storage": 100,
+    "object_storage_gb": 50,
+    "duration_months": 12,
+    "domains": [{"name": "datalab.co.id", "action": "Renewal"}],
+}
+
+
+def test_one_fixed_node_prices_like_quote():
+    roles = [{"name": "App", "variant": VARIANT, "cpu": 4, "ram": 8, "storage": 100, "count": 1}]
+    fleet = quote_fleet(roles, INPUTS, concurrent=500)
+    expected = quote(INPUTS)
+    assert {key: fleet[key] for key in expected} == expected
+    assert fleet["node_count"] == 1
+    assert fleet["roles"][0]["base_price"] == expected["base_price"]
+
+
+def test_roles_scale_with_their_load_share():
+    roles = [{**role, "variant": VARIANT} for role in DEFAULT_FLEET_ROLES]
+    concurrent = 1000
+    fleet = quote_fleet(roles, INPUTS, concurrent)
+    coefficients = get_cloud_vps_coefficients()
+
+    monthly = 0
+    for role, row in zip(roles, fleet["roles"]):
+        capacity = get_concurrent_users(*get_load_from_specs(role["cpu"], role["ram"]))
+        assigned = -(-concurrent * role["load_share"] // 100)
+        nodes = max(role["count"], -(-assigned // capacity))
+        node_price = quote({**INPUTS, **role})["monthly_base_price"]
+        assert (row["node_capacity"], row["nodes"], row["node_monthly_price"]) == (capacity, nodes, node_price)
+        assert row["monthly_price"] == node_price * nodes
+        assert row["base_price"] == node_price * nodes * 12
+        monthly += node_price * nodes
+    assert fleet["roles"][0]["nodes"] > DEFAULT_FLEET_ROLES[0]["count"]
+    assert fleet["node_count"] == sum(row["nodes"] for row in fleet["roles"])
+    expected = price_breakdown(monthly, INPUTS)
+    assert {key: fleet[key] for key in expected} == expected
+    assert quote_fleet(roles, INPUTS, concurrent, coefficients) == fleet
+
+
+def test_zero_share_keeps_count_and_zero_count_scales_from_nothing():
+    scaled = scale_roles([3, 0, 0], [2, 2, 2], [4, 4, 4], [0, 0, 50], concurrent=10_000)
+    assert scaled["nodes"].tolist()[:2] == [3, 0]
+    assert scaled["per_node_concurrency"].tolist()[:2] == [0, 0]
+    assert scaled["nodes"][2] * scaled["node_capacity"][2] >= 5_000
+
+
+def test_mixed_variants_are_priced_per_role():
+    roles = [
+        {"name": "A", "variant": VARIANT, "cpu": 2, "ram": 4, "storage": 40},
+        {"name": "B", "variant": OTHER_VARIANT, "cpu": 2, "ram": 4, "storage": 40},
+    ]
+    rows = quote_fleet(roles, INPUTS)["roles"]
+    for role, row in zip(roles, rows):
+        assert row["node_monthly_price"] == quote({**INPUTS, **role})["monthly_base_price"]
+
+
+def test_blank_cells_take_the_defaults():
+    columns = role_columns([{"variant": VARIANT, "cpu": None, "ram": float("nan"), "storage": "", "count": 2.0}], get_cloud_vps_coefficients())
+    assert columns["name"] == ["Role 1"]
+    assert [columns[field].tolist() for field in ("count", "cpu", "ram", "storage", "load_share")] == [[2], [1], [1], [20], [0]]
+    assert columns["cpu"].dtype == np.int64
+
+
+@pytest.mark.parametrize(
+    "changes, message",
+    [
+        ({"cpu": 2.5}, "App: CPU harus berupa bilangan bulat."),
+        ({"ram": np.float64(4.5)}, "App: RAM \\(GB\\) harus berupa bilangan bulat."),
+        ({"storage": "40.5"}, "App: Storage \\(GB\\) harus berupa bilangan bulat."),
+        ({"count": 1.5}, "App: Node minimum harus berupa bilangan bulat."),
+        ({"count": float("inf")}, "App: Node minimum harus berupa bilangan bulat."),
+        ({"load_share": "banyak"}, "App: Beban \\(%\\) harus berupa bilangan bulat."),
+        ({"cpu": 64}, "App: CPU harus di antara 1 dan 32."),
+        ({"load_share": 101}, "App: Beban \\(%\\) harus di antara 0 dan 100."),
+        ({"count": -1}, "App: Node minimum harus di antara 0 dan 1000."),
+        ({"variant": None}, "App: pilih tipe CPU."),
+        ({"variant": "Tidak ada"}, "App: tipe CPU tidak dikenal: Tidak ada."),
+    ],
+)
+def test_invalid_roles_are_rejected(changes, message):
+    role = {"name": "App", "variant": VARIANT, "cpu": 2, "ram": 4, "storage": 40, "count": 1, "load_share": 100}
+    with pytest.raises(ValueError, match=f"^{message}$"):
+        quote_fleet([{**role, **changes}], INPUTS, concurrent=100)
+
+
+def test_integral_floats_and_strings_are_accepted():
+    role = {"name": "App", "variant": VARIANT, "cpu": 2.0, "ram": "4", "storage": np.float64(40), "count": 1}
+    row = quote_fleet([role], INPUTS)["roles"][0]
+    assert (row["cpu"], row["ram"], row["storage"]) == (2, 4, 40)
+
+
+def test_empty_fleet_is_rejected():
+    with pytest.raises(ValueError, match="minimal satu role"):
+        quote_fleet([], INPUTS)
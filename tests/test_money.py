@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from money import FLOOR, HALF_EVEN, apply_rate, divide, prorate, rate_bp, to_milli, with_rate
+
+
+@pytest.mark.parametrize(
+    "numerator, denominator, expected",
+    [
+        (5, 2, 2),  # 2.5 -> 2
+        (7, 2, 4),  # 3.5 -> 4
+        (2_737_500, 1_000, 2_738),  # tie on an odd result steps up to even
+        (2_738_500, 1_000, 2_738),  # tie on an even result stays
+        (2_738_501, 1_000, 2_739),
+        (10, 3, 3),
+        (0, 7, 0),
+    ],
+)
+def test_divide_half_even_matches_round(numerator, denominator, expected):
+    assert divide(numerator, denominator, HALF_EVEN) == expected == round(numerator / denominator)
+
+
+def test_divide_floor_drops_remainder():
+    assert divide(2_739, 1_000, FLOOR) == 2
+    assert divide(1_999, 1_000, FLOOR) == 1
+
+
+def test_divide_arrays_match_scalars():
+    numerators = np.arange(0, 20_001, dtype=np.int64)
+    for denominator in (2, 3, 10, 1_000, 12):
+        for rounding in (FLOOR, HALF_EVEN):
+            expected = [divide(int(n), denominator, rounding) for n in numerators]
+            assert divide(numerators, denominator, rounding).tolist() == expected
+
+
+def test_divide_rejects_unknown_rounding():
+    with pytest.raises(ValueError):
+        divide(1, 2, "half_up")
+
+
+def test_rates():
+    assert rate_bp(0.11) == 1_100
+    assert apply_rate(1_000_001, 1_100) == 110_000  # PPN floors like int(x * 0.11)
+    assert apply_rate(1_000_050, 1_100, HALF_EVEN) == 110_006
+    assert with_rate(1_000_001, 1_100) == 1_110_001
+    assert apply_rate(np.array([1_000_001, 99]), 400).tolist() == [40_000, 3]
+    with pytest.raises(ValueError):
+        rate_bp(0.00015)
+
+
+def test_prorate():
+    assert prorate(210_000, 18, 12) == 315_000
+    assert prorate(25_000, 1, 12) == 2_083  # 2083.33
+    assert prorate(30, 1, 12) == 2  # 2.5 -> 2
+    assert prorate(np.array([30, 42]), 1, 12).tolist() == [2, 4]  # 2.5 -> 2, 3.5 -> 4
+
+
+def test_to_milli():
+    assert to_milli(25.685) == 25_685
+    assert to_milli("51.37") == 51_370
+    with pytest.raises(ValueError):
+        to_milli(0.0005)
@@ -0,0 +1,65 @@
+import json
+
+import pytest
+
+import catalog
+from catalog import get_cloud_vps_coefficients, get_server_vps_plans
+from optimizer import CLOUD_VPS_KIND, SERVER_PLAN_KIND, cheapest_options, required_specs
+from price_table import CPU_RANGE, RAM_RANGE, STORAGE_RANGE, STORAGE_STEP, get_price_table
+
+
+def test_required_specs():
+    assert required_specs(None) == required_specs(0) == (1, 2, 20)
+    assert required_specs(100, ram_floor=12, storage_gb=95) == (4, 12, 100)
+    assert required_specs(500, storage_gb=0) == (8, 32, 20)
+
+
+@pytest.mark.parametrize(
+    "concurrent, ram_floor, storage_gb",
+    [(None, 1, 0), (30, 1, 80), (100, 12, 95), (300, 24, 500), (1000, 64, 1990)],
+)
+def test_one_candidate_per_variant_is_the_cheapest_on_the_grid(concurrent, ram_floor, storage_gb):
+    prices = get_price_table().prices
+    cpu, ram, storage = required_specs(concurrent, ram_floor, storage_gb)
+    options = cheapest_options(concurrent, ram_floor, storage_gb, top_n=None)
+    cloud = {option["name"]: option for option in options if option["kind"] == CLOUD_VPS_KIND}
+    assert list(cloud) and set(cloud) == set(get_cloud_vps_coefficients())
+    for variant_index, variant in enumerate(get_cloud_vps_coefficients()):
+        feasible = prices[
+            variant_index,
+            cpu - CPU_RANGE[0]:,
+            ram - RAM_RANGE[0]:,
+            (storage - STORAGE_RANGE[0]) // STORAGE_STEP:,
+        ]
+        assert cloud[variant]["monthly_base_price"] == int(feasible.min()) * 1000
+
+
+def test_cheapest_plan_per_group_and_order():
+    options = cheapest_options(100, storage_gb=50, top_n=None)
+    totals = [option["total_price"] for option in options]
+    assert totals == sorted(totals)
+    plans = [option for option in options if option["kind"] == SERVER_PLAN_KIND]
+    for option in plans:
+        group = option["name"].split(" — ")[0]
+        feasible = [
+            plan.monthly_price for plan in get_server_vps_plans().by_price
+            if plan.group == group and plan.cpu >= 4 and plan.ram >= 8 and plan.storage >= 50
+        ]
+        assert option["monthly_base_price"] == min(feasible)
+    assert len(cheapest_options(100, top_n=2)) == 2
+
+
+def test_inverted_tiers_are_rejected(tmp_path):
+    coefficients = json.loads(catalog.CLOUD_VPS_COEFF_PATH.read_text())
+    variant = next(iter(coefficients))
+    inverted = {**coefficients, variant: {**coefficients[variant], "cpuram2": coefficients[variant]["cpuram1"] - 1}}
+    with pytest.raises(ValueError, match="cpuram1"):
+        cheapest_options(100, coefficients=inverted)
+
+    path = tmp_path / "cloud_vps_coeff.json"
+    path.write_text(json.dumps(inverted))
+    try:
+        with pytest.raises(ValueError, match="must be positive and not above cpuram2"):
+            catalog.load(path, catalog._parse_cloud_vps_coefficients)
+    finally:
+        catalog._entries.pop(path, None)
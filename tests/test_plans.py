@@ -0,0 +1,74 @@
+import csv
+
+import pytest
+
+from catalog import SERVER_VPS_PLANS_PATH, get_server_vps_plans
+from plans import (
+    BASE,
+    FEE_STAGES,
+    GROUP_COLUMN,
+    TOTAL,
+    WITH_PPN,
+    WITH_PPN_MONITORING,
+    PlanCatalog,
+    plan_fee_stages,
+)
+
+
+@pytest.fixture(scope="module")
+def csv_rows():
+    with open(SERVER_VPS_PLANS_PATH, encoding="utf-8-sig", newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def test_catalog_matches_csv(csv_rows):
+    plans = get_server_vps_plans()
+    assert len(plans) == len(csv_rows)
+    assert plans.groups == tuple(sorted({row["Group"] for row in csv_rows}))
+    for row in csv_rows:
+        plan = plans.get(row["Group"], row["Plan"])
+        assert (plan.cpu, plan.ram, plan.storage, plan.monthly_price) == (
+            int(row["CPU"]), int(row["RAM (GB)"]), int(row["Storage (GB)"]), int(row["Price (IDR)"])
+        )
+    for group in plans.groups:
+        assert [plan.name for plan in plans.in_group(group)] == [row["Plan"] for row in csv_rows if row["Group"] == group]
+    prices = [plan.monthly_price for plan in plans.by_price]
+    assert prices == sorted(prices)
+
+
+def test_unknown_group_is_empty():
+    plans = PlanCatalog.from_csv(b"Group,Plan,CPU,RAM (GB),Storage (GB),Price (IDR)\nA,P1,1,1,20,100000\n")
+    assert plans.in_group("B") == ()
+    assert plans.billing.table("B", "Bulanan") == []
+    with pytest.raises(KeyError):
+        plans.get("A", "P2")
+
+
+@pytest.mark.parametrize("period, months, monitoring", [("Bulanan", 1, 10_000), ("Tahunan", 12, 120_000)])
+def test_billing_matrix_fee_stages(csv_rows, period, months, monitoring):
+    billing = get_server_vps_plans().billing
+    for row in csv_rows:
+        base = int(row["Price (IDR)"]) * months
+        fees = billing.fees(row["Group"], row["Plan"], period)
+        assert fees[BASE] == base
+        assert fees[WITH_PPN] == base * 111 // 100  # PPN 11%, floored
+        # Monitoring is added after PPN, so it is not taxed.
+        assert fees[WITH_PPN_MONITORING] == fees[WITH_PPN] + monitoring
+        assert fees[TOTAL] == fees[WITH_PPN_MONITORING]
+
+
+def test_plan_fee_stages_floor_ppn():
+    assert plan_fee_stages(112_345, "Bulanan") == (112_345, 124_702, 134_702)  # 124 702.95 floored
+    assert plan_fee_stages(112_345, "Tahunan") == (1_348_140, 1_496_435, 1_616_435)  # 1 496 435.4 floored
+
+
+def test_billing_tables_and_comparison(csv_rows):
+    plans = get_server_vps_plans()
+    billing = plans.billing
+    group = plans.groups[0]
+    table = billing.table(group, "Tahunan")
+    assert [row["Plan"] for row in table] == [plan.name for plan in plans.in_group(group)]
+    first = plans.in_group(group)[0]
+    assert tuple(table[0][stage] for stage in FEE_STAGES) == billing.fees(group, first.name, "Tahunan")
+    assert len(billing.comparison("Bulanan")) == len(csv_rows)
+    assert {row[GROUP_COLUMN] for row in billing.comparison("Bulanan", [group])} == {group}
@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+import price_table
+from catalog import CLOUD_VPS_COEFF_PATH, get_cloud_vps_coefficients
+from price_table import (
+    CPU_RANGE,
+    RAM_RANGE,
+    STORAGE_RANGE,
+    STORAGE_STEP,
+    PriceTable,
+    cloud_vps_price,
+    get_price_table,
+    grid_axes,
+)
+from pricing import calculate_cloud_vps
+
+
+@pytest.fixture(scope="module")
+def table(tmp_path_factory):
+    return PriceTable.open(cache_dir=tmp_path_factory.mktemp("price_table"))
+
+
+def test_table_matches_calculate_cloud_vps(table):
+    storages = range(STORAGE_RANGE[0], STORAGE_RANGE[1] + 1, STORAGE_STEP)
+    for variant_index, coef in enumerate(table.coefficients.values()):
+        for cpu in range(CPU_RANGE[0], CPU_RANGE[1] + 1):
+            for ram in range(RAM_RANGE[0], RAM_RANGE[1] + 1, 7):
+                for storage in storages:
+                    assert table.price(variant_index, cpu, ram, storage) == calculate_cloud_vps(cpu, ram, storage, coef)
+
+
+def test_prices_array_matches_lookup(table):
+    prices = table.prices
+    assert prices.shape == (len(table.variants), *(len(axis) for axis in grid_axes()))
+    assert int(prices[1, 3, 7, 11]) * 1000 == table.price(1, 4, 8, 130)
+
+
+def test_off_grid_falls_back_to_calculation(table):
+    coef = table.coefficients[table.variants[0]]
+    for cpu, ram, storage in [(2, 4, 25), (64, 4, 60), (2, 256, 60), (2, 4, 4000)]:
+        assert table.price(0, cpu, ram, storage) == calculate_cloud_vps(cpu, ram, storage, coef)
+
+
+def test_variant_index_out_of_range(table):
+    with pytest.raises(ValueError):
+        table.price(len(table.variants), 2, 4, 60)
+    with pytest.raises(ValueError):
+        table.price(-1, 2, 4, 60)
+    with pytest.raises(ValueError):
+        table.price("Tidak ada", 2, 4, 60)
+
+
+def test_configs_under_is_sorted_and_bounded(table):
+    configs = table.configs_under(500_000, variant=0)
+    prices = configs["monthly_price"]
+    assert len(prices) and (prices <= 500_000).all() and (np.diff(prices) >= 0).all()
+    coef = table.coefficients[table.variants[0]]
+    for cpu, ram, storage, price in list(zip(configs["cpu"], configs["ram"], configs["storage"], prices))[:50]:
+        assert calculate_cloud_vps(int(cpu), int(ram), int(storage), coef) == price
+
+
+def test_open_without_build(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        PriceTable.open(CLOUD_VPS_COEFF_PATH, tmp_path, build=False)
+
+
+def test_cloud_vps_price_matches_calculate_cloud_vps(price_table_cache, monkeypatch):
+    monkeypatch.setattr(price_table, "_table", None)
+    coefficients = get_cloud_vps_coefficients()
+    for coef in coefficients.values():
+        for cpu, ram, storage in [(1, 1, 20), (2, 4, 60), (8, 16, 80), (32, 128, 2000), (3, 5, 85), (2, 4, 2.5)]:
+            assert cloud_vps_price(cpu, ram, storage, coef) == calculate_cloud_vps(cpu, ram, storage, coef)
+    assert get_price_table() is not None
+    assert list(price_table_cache.glob("price_table-*.npy"))
+    custom = {key: value + 1 for key, value in next(iter(coefficients.values())).items()}
+    assert cloud_vps_price(2, 4, 60, custom) == calculate_cloud_vps(2, 4, 60, custom)
+
+
+def test_unbuildable_table_falls_back_to_calculation(tmp_path, monkeypatch, caplog):
+    def overflow(*args, **kwargs):
+        raise ValueError("Monthly prices no longer fit the uint16 price table.")
+
+    monkeypatch.setattr(price_table, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(price_table, "_table", None)
+    monkeypatch.setattr(price_table, "build_price_table", overflow)
+    coef = next(iter(get_cloud_vps_coefficients().values()))
+    assert get_price_table() is None
+    assert cloud_vps_price(2, 4, 60, coef) == calculate_cloud_vps(2, 4, 60, coef)
+    assert "Price table unavailable" in caplog.text
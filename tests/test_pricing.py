@@ -0,0 +1,102 @@
+import itertools
+
+import pytest
+
+from catalog import get_cloud_vps_coefficients
+from pricing import (
+    DEFAULT_DOMAIN_PRICE_YEARLY,
+    DOMAIN_PRICES_YEARLY,
+    calculate_cloud_vps,
+    get_concurrent_users,
+    get_specs_from_concurrency,
+    quote,
+    recommend_from_concurrency,
+)
+
+DOMAINS = [
+    {"name": "datalab.co.id", "action": "Renewal"},
+    {"name": "contoh.com"},
+    {"name": " Kampus.AC.ID ", "action": "Renewal"},
+    {"name": "tanpa-ekstensi", "action": "Transfer"},
+    "sekolah.sch.id",
+]
+
+
+def page_cloud_vps(cpu, ram, storage, coef):
+    """The estimator page's formula before the pricing engine was extracted."""
+    per_hour = (
+        (cpu * coef["cpuram1"] if cpu <= 2 else cpu * coef["cpuram2"])
+        + (ram * coef["cpuram1"] if ram <= 2 else ram * coef["cpuram2"])
+        + (storage * coef["storage1"] if storage < 81 else storage * coef["storage2"])
+    )
+    return int(1000 * round(per_hour * 730 / 1000))
+
+
+def page_domain(entry):
+    if isinstance(entry, dict):
+        name, action = entry.get("name", "").strip(), entry.get("action", "Register")
+    else:
+        name, action = str(entry).strip(), "Register"
+    normalized = name.lower()
+    extension = next(
+        (ext for ext in sorted(DOMAIN_PRICES_YEARLY, key=len, reverse=True) if normalized.endswith(ext)), None
+    )
+    if extension is None:
+        return DEFAULT_DOMAIN_PRICE_YEARLY
+    return DOMAIN_PRICES_YEARLY[extension].get(action, DEFAULT_DOMAIN_PRICE_YEARLY)
+
+
+def page_total(cpu, ram, storage, coef, object_storage_gb, duration_months, domains, buffer, scan):
+    """The estimator page's cost summary before the pricing engine was extracted."""
+    monthly_base_price = page_cloud_vps(cpu, ram, storage, coef)
+    base_price = monthly_base_price * duration_months
+    vps_buffer_price = int(round(monthly_base_price * (duration_months * 2 / 12))) if buffer else 0
+    object_storage_price = int(round(object_storage_gb * 507 * duration_months))
+    security_scan_price = (100_000 if scan else 0) * duration_months
+    domain_price = sum(int(round(page_domain(entry) * duration_months / 12)) for entry in domains)
+    pre_tax_subtotal = base_price + vps_buffer_price + object_storage_price + domain_price
+    monitoring_fee = int(pre_tax_subtotal * 0.04)
+    tax_fee = int((pre_tax_subtotal + monitoring_fee) * 0.11)
+    return {
+        "monthly_base_price": monthly_base_price,
+        "base_price": base_price,
+        "vps_buffer_price": vps_buffer_price,
+        "object_storage_price": object_storage_price,
+        "domain_price": domain_price,
+        "pre_tax_subtotal": pre_tax_subtotal,
+        "monitoring_fee": monitoring_fee,
+        "tax_fee": tax_fee,
+        "total_price": pre_tax_subtotal + monitoring_fee + tax_fee + security_scan_price,
+    }
+
+
+@pytest.mark.parametrize("variant", list(get_cloud_vps_coefficients()))
+def test_quote_matches_page_math(variant):
+    coef = get_cloud_vps_coefficients()[variant]
+    specs = [(1, 1, 20), (2, 2, 80), (2, 4, 81), (3, 8, 120), (8, 32, 500), (32, 128, 2000)]
+    for (cpu, ram, storage), duration, gb, domain_count, buffer, scan in itertools.product(
+        specs, (1, 3, 5, 12, 18, 36), (0, 100, 333), (0, 2, len(DOMAINS)), (True, False), (True, False)
+    ):
+        domains = DOMAINS[:domain_count]
+        result = quote({
+            "variant": variant, "cpu": cpu, "ram": ram, "storage": storage, "object_storage_gb": gb,
+            "duration_months": duration, "domains": domains,
+            "include_vps_buffer": buffer, "include_security_scan": scan,
+        })
+        expected = page_total(cpu, ram, storage, coef, gb, duration, domains, buffer, scan)
+        assert {key: result[key] for key in expected} == expected
+
+
+def test_calculate_cloud_vps_matches_page_formula():
+    for coef in get_cloud_vps_coefficients().values():
+        for cpu, ram, storage in itertools.product((1, 2, 3, 16, 32), (1, 2, 3, 64, 128), range(20, 2001, 90)):
+            assert calculate_cloud_vps(cpu, ram, storage, coef) == page_cloud_vps(cpu, ram, storage, coef)
+
+
+def test_recommendation_thresholds():
+    assert get_concurrent_users(3600, 60) == 60
+    assert get_concurrent_users(1, 1) == 1
+    assert [get_specs_from_concurrency(n) for n in (20, 21, 60, 61, 150, 151, 400, 401)] == [
+        (1, 2), (2, 4), (2, 4), (4, 8), (4, 8), (8, 16), (8, 16), (8, 32),
+    ]
+    assert recommend_from_concurrency(401) == "8 vCPU / 32 GB RAM (atau lebih)"
@@ -0,0 +1,54 @@
+import pstats
+
+from profiling import NULL_PROFILER, RerunHistory, profiling_enabled
+
+
+def busy():
+    return sum(range(2000))
+
+
+def test_profiling_enabled(monkeypatch):
+    monkeypatch.delenv("IDCH_PROFILE", raising=False)
+    assert not profiling_enabled(None)
+    assert profiling_enabled("1") and profiling_enabled(" True ")
+    monkeypatch.setenv("IDCH_PROFILE", "yes")
+    assert profiling_enabled(None)
+
+
+def test_sections_are_charged_to_the_earlier_mark():
+    history = RerunHistory()
+    assert history.start(False) is NULL_PROFILER
+    profiler = history.start(True)
+    profiler.mark("A")
+    profiler.mark("B")
+    record = profiler.finish()
+    assert list(record["sections"]) == ["A", "B"]
+    assert record["total"] >= sum(record["sections"].values())
+    assert [row["Bagian"] for row in history.summary()] == ["A", "B", "Total"]
+
+
+def test_one_capture_at_a_time(tmp_path):
+    first, second = RerunHistory(), RerunHistory()
+    capturing = first.start(True, capture_cprofile=True)
+    skipped = second.start(True, capture_cprofile=True)
+    busy()
+    assert skipped.finish()["cprofile_skipped"]
+    assert not capturing.finish()["cprofile_skipped"]
+    assert not second.profiles and len(first.profiles) == 1
+
+    # The capture is free again once the first rerun finished.
+    third = second.start(True, capture_cprofile=True)
+    busy()
+    assert not third.finish()["cprofile_skipped"]
+    path = second.dump_stats(str(tmp_path / "rerun.pstats"))
+    assert any(name == "busy" for _, _, name in pstats.Stats(path).stats)
+
+
+def test_interrupted_rerun_frees_the_capture():
+    history, other = RerunHistory(), RerunHistory()
+    history.start(True, capture_cprofile=True).mark("Dihentikan")  # never finished
+    next_rerun = history.start(True, capture_cprofile=True)
+    assert not next_rerun.capture_skipped
+    assert other.start(True, capture_cprofile=True).finish()["cprofile_skipped"]
+    next_rerun.finish()
+    assert not other.start(True, capture_cprofile=True).finish()["cprofile_skipped"]
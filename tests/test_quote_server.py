@@ -0,0 +1,117 @@
+import asyncio
+import json
+
+import pytest
+
+from catalog import get_cloud_vps_coefficients
+from quote_server import HttpError, QuoteService, start_server
+
+VARIANT = next(iter(get_cloud_vps_coefficients()))
+QUOTE = {"variant": VARIANT, "cpu": 2, "ram": 4, "storage": 60}
+
+
+@pytest.fixture(scope="module")
+def service():
+    return QuoteService()
+
+
+def dispatch(service, method, target, payload=None):
+    body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+    return service.dispatch(method, target, body)
+
+
+def test_quote(service):
+    assert dispatch(service, "POST", "/quote", QUOTE)["error"] == ""
+
+
+def test_sweep(service):
+    result = dispatch(service, "POST", "/sweep", {"quote": QUOTE, "duration_months": [1, 12], "object_storage_gb": [0]})
+    assert result["duration_months"] == [1, 12]
+    assert [point["total_price"] for point in result["points"]] == [
+        dispatch(service, "POST", "/quote", {**QUOTE, "duration_months": months})["total_price"] for months in (1, 12)
+    ]
+
+
+def test_recommend(service):
+    result = dispatch(service, "GET", "/recommend?users_per_hour=3600&session_seconds=60")
+    assert (result["concurrent"], result["cpu"], result["ram"]) == (60, 2, 4)
+
+
+@pytest.mark.parametrize(
+    "method, target, payload, status",
+    [
+        ("POST", "/quote", {**QUOTE, "cpu": 0}, 400),
+        ("POST", "/quote", [QUOTE], 400),
+        ("POST", "/quote", {"variant": VARIANT}, 400),
+        ("POST", "/quote/batch", {"quotes": "bukan list"}, 400),
+        ("POST", "/sweep", {"quote": QUOTE, "duration_months": [1.5]}, 400),
+        ("POST", "/sweep", {"quote": {**QUOTE, "storage": 1}}, 400),
+        ("GET", "/recommend?users_per_hour=-1&session_seconds=60", None, 400),
+        ("GET", "/recommend?users_per_hour=100&session_seconds=0", None, 400),
+        ("GET", "/recommend?users_per_hour=abc&session_seconds=60", None, 400),
+        ("GET", "/quote", None, 405),
+        ("GET", "/tidak-ada", None, 404),
+    ],
+)
+def test_invalid_requests(service, method, target, payload, status):
+    with pytest.raises(HttpError) as excinfo:
+        dispatch(service, method, target, payload)
+    assert excinfo.value.status == status
+
+
+def test_invalid_json_is_400(service):
+    with pytest.raises(HttpError) as excinfo:
+        service.dispatch("POST", "/quote", b"{bukan json")
+    assert excinfo.value.status == 400
+
+
+def test_batch_reports_bad_items_per_row(service):
+    results = dispatch(service, "POST", "/quote/batch", [QUOTE, 42, {**QUOTE, "domains": [{"name": 1}]}])
+    assert results[0]["error"] == ""
+    assert results[1]["error"] == "TypeError: Quote harus berupa objek JSON, bukan int."
+    assert results[2]["error"].startswith("ValueError: Domain ke-1")
+
+
+async def exchange(service, requests: list[bytes]) -> list[tuple[int, dict]]:
+    server = await start_server("127.0.0.1", 0, service)
+    port = server.sockets[0].getsockname()[1]
+    responses = []
+    async with server:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        for request in requests:
+            writer.write(request)
+            await writer.drain()
+            status_line = await reader.readline()
+            headers = {}
+            while (line := await reader.readline()) != b"\r\n":
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            body = await reader.readexactly(int(headers["content-length"]))
+            responses.append((int(status_line.split()[1]), json.loads(body)))
+        writer.close()
+    return responses
+
+
+def request(method: str, target: str, payload=None) -> bytes:
+    body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+    head = f"{method} {target} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n\r\n"
+    return head.encode("ascii") + body
+
+
+def test_unexpected_error_is_500_and_keeps_connection(caplog):
+    service = QuoteService()
+
+    def broken(params, payload):
+        raise RuntimeError("rusak")
+
+    service.routes[("GET", "/health")] = broken
+    responses = asyncio.run(exchange(service, [
+        request("GET", "/health"),
+        request("POST", "/quote", {**QUOTE, "ram": 0}),
+        request("POST", "/quote", QUOTE),
+    ]))
+    assert responses[0] == (500, {"error": "Terjadi kesalahan internal pada server."})
+    assert responses[1][0] == 400
+    assert responses[1][1]["error"] == "ValueError: RAM (GB) harus di antara 1 dan 128."
+    assert responses[2][0] == 200
+    assert "rusak" in caplog.text
@@ -0,0 +1,74 @@
+import pytest
+
+import report
+from pricing import DomainList, quote
+from report import build_pdf_report, get_pdf_report, pdf_cache_key
+
+INPUTS = {"variant": "Intel eXtreme — Moderate website/API (Intel)", "cpu": 2, "ram": 4, "storage": 60}
+
+
+def pdf_data(exported_at_str="17-10-2026 10:00:00", **inputs) -> dict:
+    domains = DomainList(["datalab.co.id", {"name": "contoh.com", "action": "Renewal"}])
+    breakdown = quote({**INPUTS, "domains": domains, **inputs})
+    return {
+        "preset_label": "Custom (manual sliders)",
+        "cpu_type": INPUTS["variant"],
+        **{key: INPUTS[key] for key in ("cpu", "ram", "storage")},
+        **breakdown,
+        "domains": domains,
+        "exported_at_str": exported_at_str,
+    }
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    """Count real renders behind a fresh, empty PDF cache."""
+    calls = []
+
+    def counting_build(data):
+        calls.append(data["exported_at_str"])
+        return build_pdf_report(data)
+
+    monkeypatch.setattr(report, "_pdf_cache", report.OrderedDict())
+    monkeypatch.setattr(report, "build_pdf_report", counting_build)
+    return calls
+
+
+def test_cache_key_ignores_export_time_only():
+    key = pdf_cache_key(pdf_data())
+    assert pdf_cache_key(pdf_data("18-10-2026 09:30:00")) == key
+    assert pdf_cache_key(pdf_data(duration_months=6)) != key
+    assert pdf_cache_key(pdf_data(cpu=4)) != key
+
+
+def test_cache_key_follows_domain_edits():
+    data = pdf_data()
+    key = pdf_cache_key(data)
+    data["domains"].add("baru.my.id")
+    assert pdf_cache_key(data) != key
+
+
+def test_rerun_reuses_rendered_pdf(renders):
+    data = pdf_data()
+    first = get_pdf_report(data)
+    assert get_pdf_report(dict(data), pdf_cache_key(data)) is first
+    assert renders == ["17-10-2026 10:00:00"]
+
+
+def test_new_export_time_renders_again(renders):
+    key = pdf_cache_key(pdf_data())
+    first = get_pdf_report(pdf_data(), key)
+    second = get_pdf_report(pdf_data("17-10-2026 10:05:00"), key)
+    assert renders == ["17-10-2026 10:00:00", "17-10-2026 10:05:00"]
+    assert first != second
+    # Same inputs and timestamp render the same bytes.
+    assert build_pdf_report(pdf_data("17-10-2026 10:05:00")) == second
+
+
+def test_cache_is_bounded(renders, monkeypatch):
+    monkeypatch.setattr(report, "PDF_CACHE_SIZE", 2)
+    for minute in range(3):
+        get_pdf_report(pdf_data(f"17-10-2026 10:0{minute}:00"))
+    assert len(report._pdf_cache) == 2
+    get_pdf_report(pdf_data("17-10-2026 10:00:00"))  # evicted, rendered again
+    assert len(renders) == 4
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from pricing import DomainList, quote
+from sweep import SWEEP_PRICE_KEYS, sweep, sweep_rows
+
+INPUTS = {
+    "variant": "AMD eXtreme — Moderate website/API (AMD)",
+    "cpu": 4,
+    "ram": 8,
+    "storage": 100,
+    "object_storage_gb": 50,
+    "duration_months": 12,
+    "domains": [{"name": "datalab.co.id", "action": "Renewal"}, "contoh.com", "sekolah.sch.id"],
+}
+
+
+@pytest.mark.parametrize("domains", [INPUTS["domains"], DomainList(INPUTS["domains"])])
+def test_every_point_matches_quote(domains):
+    inputs = {**INPUTS, "domains": domains}
+    durations, storage = [1, 2, 5, 7, 12, 13, 36, 120], [0, 10, 333, 10_000]
+    result = sweep(inputs, duration_months=durations, object_storage_gb=storage)
+    for key in SWEEP_PRICE_KEYS:
+        assert result[key].shape == (len(durations), len(storage))
+    for i, duration in enumerate(durations):
+        for j, gb in enumerate(storage):
+            expected = quote({**inputs, "duration_months": duration, "object_storage_gb": gb})
+            assert {key: int(result[key][i, j]) for key in SWEEP_PRICE_KEYS} == {key: expected[key] for key in SWEEP_PRICE_KEYS}
+
+
+def test_unswept_axis_keeps_the_input_value():
+    result = sweep({**INPUTS, "include_vps_buffer": False}, duration_months=range(1, 4))
+    assert result["object_storage_gb"].tolist() == [50]
+    assert result["duration_months"].tolist() == [1, 2, 3]
+    assert (result["vps_buffer_price"] == 0).all()
+    assert result["monthly_base_price"] == quote(INPUTS)["monthly_base_price"]
+    rows = sweep_rows(result)
+    assert [(row["duration_months"], row["object_storage_gb"]) for row in rows] == [(1, 50), (2, 50), (3, 50)]
+    assert rows[2]["total_price"] == int(result["total_price"][2, 0])
+
+
+def test_integral_float_durations_are_accepted():
+    result = sweep(INPUTS, duration_months=np.array([6.0, 12.0]))
+    assert result["duration_months"].dtype == np.int64
+    assert result["duration_months"].tolist() == [6, 12]
+
+
+@pytest.mark.parametrize(
+    "axes, message",
+    [
+        ({"duration_months": [1.5, 2]}, "Durasi \\(bulan\\) harus berupa bilangan bulat."),
+        ({"duration_months": [0, 12]}, "Durasi \\(bulan\\) harus di antara 1 dan 120."),
+        ({"duration_months": [121]}, "Durasi \\(bulan\\) harus di antara 1 dan 120."),
+        ({"duration_months": []}, "Durasi \\(bulan\\) harus berupa daftar angka yang tidak kosong."),
+        ({"duration_months": ["12"]}, "Durasi \\(bulan\\) harus berupa daftar angka yang tidak kosong."),
+        ({"duration_months": [[1, 2]]}, "Durasi \\(bulan\\) harus berupa daftar angka yang tidak kosong."),
+        ({"object_storage_gb": [float("nan")]}, "Object storage \\(GB\\) harus berupa daftar angka yang tidak kosong."),
+        ({"object_storage_gb": [-10]}, "Object storage \\(GB\\) harus di antara 0 dan 10000."),
+    ],
+)
+def test_invalid_axes_are_rejected(axes, message):
+    with pytest.raises(ValueError, match=f"^{message}$"):
+        sweep(INPUTS, **axes)
+
+
+def test_fractional_storage_is_allowed():
+    result = sweep(INPUTS, object_storage_gb=[0.5, 12.5])
+    expected = [quote({**INPUTS, "object_storage_gb": gb})["total_price"] for gb in (0.5, 12.5)]
+    assert result["total_price"][0].tolist() == expected